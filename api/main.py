@@ -3,13 +3,140 @@
 import os, sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from fastapi import FastAPI
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse, Response
+from starlette.routing import Match
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
+
+from api.rag_service import retrieve_candidates, retrieve_solution, iter_candidates, warm_up
+from api.session_service import create_session, get_snapshot, stream_turn
+from api.projection import (
+    FastJSONResponse,
+    dumps,
+    project_hypothesis,
+    project_solution,
+    project_stream_event,
+)
+from rag.config import WARMUP_ENABLED, WARMUP_RETRY_SECONDS, WARMUP_RETRY_MAX_SECONDS
+from api.metrics import (
+    REQUESTS,
+    IN_FLIGHT,
+    REQUEST_LATENCY,
+    PHASE_LATENCY,
+    CONTENT_TYPE,
+    render_latest,
+)
+
+# -----------------------------
+# Warm-up (lifespan)
+# -----------------------------
+# 워밍업 결과 (완료 전에는 ready=False)
+_readiness: dict = {"ready": False, "warmup": None, "error": None}
+_warmup_stop = threading.Event()
+
+
+def _run_warmup():
+    # 실패하면 (인덱스 로드 전, 일시적인 I/O 오류 등) 간격을 늘려가며 성공할 때까지 재시도
+    delay = WARMUP_RETRY_SECONDS
+    attempt = 1
+    while not _warmup_stop.is_set():
+        try:
+            print(f"[RAG API] Warm-up 시작... (시도 {attempt})")
+            _readiness["warmup"] = warm_up()
+            _readiness["ready"] = True
+            _readiness["error"] = None
+            print(f"[RAG API] Warm-up 완료: {_readiness['warmup']}")
+            return
+        except Exception as e:
+            _readiness["error"] = str(e)
+            print(f"[RAG API] Warm-up 실패: {e} ({delay:.0f}초 후 재시도)")
+        _warmup_stop.wait(delay)
+        delay = min(delay * 2, WARMUP_RETRY_MAX_SECONDS)
+        attempt += 1
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if WARMUP_ENABLED:
+        # 워밍업 동안에도 /healthz는 응답해야 하므로 별도 스레드에서 실행
+        _warmup_stop.clear()
+        threading.Thread(target=_run_warmup, name="rag-warmup", daemon=True).start()
+    else:
+        _readiness["ready"] = True
+    yield
+    _warmup_stop.set()
+
+
+app = FastAPI(title="DSM RAG API", default_response_class=FastJSONResponse, lifespan=lifespan)
+
+
+# -----------------------------
+# Metrics
+# -----------------------------
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    # 등록된 경로만 라벨로 사용 (404 스캔 등으로 라벨 수가 늘어나지 않게)
+    # path parameter가 있는 경로는 템플릿(/sessions/{thread_id})으로 묶는다
+    endpoint = "unmatched"
+    for route in app.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            endpoint = getattr(route, "path", endpoint)
+            break
+    IN_FLIGHT.inc(endpoint=endpoint)
+    start = time.perf_counter()
+
+    def finish(status: int):
+        IN_FLIGHT.dec(endpoint=endpoint)
+        REQUESTS.inc(endpoint=endpoint, status=str(status))
+        REQUEST_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+
+    try:
+        response = await call_next(request)
+    except BaseException:
+        finish(500)
+        raise
+
+    # call_next는 본문 전송 전에 반환되므로, 본문(NDJSON / SSE 스트리밍 포함)의 마지막 chunk가 나간 뒤에 기록
+    body = response.body_iterator
+
+    async def observed_body():
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            finish(response.status_code)
+
+    response.body_iterator = observed_body()
+    return response
+
+
+@app.get("/metrics")
+def metrics():
+    return Response(content=render_latest(), media_type=CONTENT_TYPE)
 
-from api.rag_service import retrieve_candidates, retrieve_solution
 
-app = FastAPI(title="DSM RAG API")
+# -----------------------------
+# Health / Readiness
+# -----------------------------
+@app.get("/healthz")
+def healthz():
+    # 프로세스가 살아 있으면 항상 OK (liveness)
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+def readyz():
+    # 워밍업이 끝난 워커만 트래픽을 받도록 (readiness)
+    if _readiness["ready"]:
+        return {"status": "ready", "warmup": _readiness["warmup"]}
+    status = "error" if _readiness["error"] else "warming_up"
+    return FastJSONResponse({"status": status, "error": _readiness["error"]}, status_code=503)
 
 
 #  Hypothesis Generation
@@ -17,6 +144,8 @@ class HypothesisReq(BaseModel):
     intake_report: str
     top_k: Optional[int] = 12
     diag_top_n: Optional[int] = 3
+    fields: Optional[List[str]] = None  # 선택: 응답에 포함할 필드 (예: ["diagnosis_candidates"])
+    compact: Optional[bool] = False     # 선택: True면 후보 병명 + chunk 참조만 반환
 
 
 @app.post("/rag/hypothesis")
@@ -29,15 +158,94 @@ def rag_hypothesis(req: HypothesisReq):
     data["hypothesis_report"] = "Top DSM candidates: " + ", ".join(
         data["diagnosis_candidates"]
     )
-    return data
+    # dict를 그대로 반환하면 jsonable_encoder를 한 번 더 거치므로 Response로 직접 반환
+    with PHASE_LATENCY.time(phase="serialization"):
+        return FastJSONResponse(project_hypothesis(data, req.fields, bool(req.compact)))
+
+
+@app.post("/rag/hypothesis/stream")
+def rag_hypothesis_stream(req: HypothesisReq):
+    """
+    /rag/hypothesis의 NDJSON 스트리밍 버전
+    - 1줄: {"event": "candidates", "diagnosis_candidates": [...], ...}
+    - 후보별: {"event": "criteria", "diagnosis": ..., "rank": ..., "criteria": [...]} (조회 완료 순)
+    - 마지막: {"event": "done", "diagnosis_candidates": [...], "hypothesis_report": ...}
+    """
+    def ndjson():
+        for event in iter_candidates(
+            symptom_text=req.intake_report,
+            top_k=req.top_k or 12,
+            diag_top_n=req.diag_top_n or 3,
+        ):
+            if event["event"] == "done":
+                event["hypothesis_report"] = "Top DSM candidates: " + ", ".join(
+                    event["diagnosis_candidates"]
+                )
+            projected = project_stream_event(event, req.fields, bool(req.compact))
+            if projected is not None:
+                with PHASE_LATENCY.time(phase="serialization"):
+                    line = dumps(projected) + b"\n"
+                yield line
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
 
 # Solution & Summary 
 class SolutionReq(BaseModel):
     diagnosis: str               # 확정/선택된 진단명
     symptom_text: Optional[str] = None  # 선택: 사용자가 말한 증상 원문
+    fields: Optional[List[str]] = None  # 선택: 응답에 포함할 필드
+    compact: Optional[bool] = False     # 선택: True면 솔루션 본문 대신 chunk 참조만 반환
 
 
 @app.post("/rag/solution")
 def rag_solution(req: SolutionReq):
-    return retrieve_solution(req.diagnosis, req.symptom_text)
+    data = retrieve_solution(req.diagnosis, req.symptom_text)
+    with PHASE_LATENCY.time(phase="serialization"):
+        return FastJSONResponse(project_solution(data, req.fields, bool(req.compact)))
+
+
+# -----------------------------
+# Counseling Sessions (LangGraph)
+# -----------------------------
+class TurnReq(BaseModel):
+    message: str
+
+
+def _sse(event: dict) -> bytes:
+    # Server-Sent Events 한 건 (event 이름 = 이벤트 type)
+    return b"event: " + event["type"].encode() + b"\ndata: " + dumps(event) + b"\n\n"
+
+
+@app.post("/sessions", status_code=201)
+def session_create():
+    return {"thread_id": create_session()}
+
+
+@app.get("/sessions/{thread_id}")
+def session_snapshot(thread_id: str):
+    snapshot = get_snapshot(thread_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="session not found")
+    with PHASE_LATENCY.time(phase="serialization"):
+        return FastJSONResponse(snapshot)
+
+
+@app.post("/sessions/{thread_id}/turns")
+async def session_turn(thread_id: str, req: TurnReq):
+    """
+    사용자 입력 한 턴을 실행하고 이벤트를 SSE(text/event-stream)로 스트리밍
+    - event: token  / data: {"type": "token", "text": ...}
+    - event: update / data: {"type": "update", "node": ..., "values": {...}}
+    - event: error  / data: {"type": "error", "detail": ...}
+    - event: done   / data: {"type": "done", "next": [...]}
+    """
+    async def events():
+        async for event in stream_turn(thread_id, req.message):
+            yield _sse(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
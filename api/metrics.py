@@ -0,0 +1,258 @@
+# api/metrics.py
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+# -----------------------------
+# 경량 Prometheus 텍스트 포맷 메트릭
+# (prometheus_client 의존성 없이 /metrics 노출용)
+# -----------------------------
+
+_LabelKey = Tuple[str, ...]
+
+
+def _fmt_labels(names: Tuple[str, ...], values: _LabelKey, extra: str = "") -> str:
+    parts = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.doc = doc
+        self.labels = labels
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> _LabelKey:
+        return tuple(str(labels.get(n, "")) for n in self.labels)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, doc, labels=()):
+        super().__init__(name, doc, labels)
+        self._values: Dict[_LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self):
+        lines = super().render()
+        for key, v in sorted(self._values.items()):
+            lines.append(f"{self.name}{_fmt_labels(self.labels, key)} {v}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, doc, labels=()):
+        super().__init__(name, doc, labels)
+        self._values: Dict[_LabelKey, float] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self):
+        lines = super().render()
+        for key, v in sorted(self._values.items()):
+            lines.append(f"{self.name}{_fmt_labels(self.labels, key)} {v}")
+        return lines
+
+
+# 임베딩/검색 단계는 수 ms ~ 수 초 범위
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, doc, labels=(), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket별 count..., +Inf count, sum]
+        self._values: Dict[_LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            row[idx] += 1
+            row[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = super().render()
+        for key, row in sorted(self._values.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, key, le)} {cumulative}")
+            cumulative += row[len(self.buckets)]
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labels, key)} {row[-1]}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+
+# scrape 시점에 값을 채우는 콜백 (인덱스 크기 등)
+_COLLECTORS: List[Callable[[], None]] = []
+
+
+def register_collector(fn: Callable[[], None]) -> None:
+    """/metrics 요청 시마다 호출되어 Gauge 값을 갱신하는 콜백 등록"""
+    _COLLECTORS.append(fn)
+
+
+def render_latest() -> str:
+    """등록된 모든 메트릭을 Prometheus 텍스트 포맷으로 렌더링"""
+    for fn in _COLLECTORS:
+        try:
+            fn()
+        except Exception as e:
+            print(f"[Metrics] collector 오류: {e}")
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# -----------------------------
+# RAG 서비스 메트릭 정의
+# -----------------------------
+REQUESTS = Counter("rag_requests_total", "Requests by endpoint and status code.", ("endpoint", "status"))
+IN_FLIGHT = Gauge("rag_requests_in_flight", "Requests currently being processed.", ("endpoint",))
+REQUEST_LATENCY = Histogram("rag_request_latency_seconds", "End-to-end request latency.", ("endpoint",))
+
+# phase: embedding / vector_search / criteria_lookup / serialization
+PHASE_LATENCY = Histogram("rag_phase_latency_seconds", "Latency per retrieval phase.", ("phase",))
+
+KNN_DOCUMENTS = Counter("rag_knn_documents_scanned_total", "Documents returned by k-NN searches.", ("collection",))
+KNN_SEARCHES = Counter("rag_knn_searches_total", "k-NN searches executed.", ("collection",))
+
+CACHE_REQUESTS = Counter("rag_cache_requests_total", "Cache lookups by result (hit/miss).", ("cache", "result"))
+CACHE_HIT_RATIO = Gauge("rag_cache_hit_ratio", "Cache hit ratio since process start.", ("cache",))
+
+INDEX_SIZE = Gauge("rag_index_documents", "Documents stored per vector collection.", ("collection",))
+
+# LLM 응답 캐시(frontend.llm_cache): 적중 시 원래 생성에 걸렸던 시간 누적 (hit/miss는 CACHE_REQUESTS의 llm_response)
+LLM_CACHE_SAVED_SECONDS = Counter("llm_cache_saved_seconds_total", "Generation time saved by LLM response cache hits.")
+
+# LLM 게이트웨이(frontend.llm_gateway)
+# outcome: ok / retry / hedge / error / circuit_open
+LLM_REQUESTS = Counter("llm_gateway_requests_total", "LLM gateway calls by outcome.", ("outcome",))
+LLM_LATENCY = Histogram("llm_gateway_latency_seconds", "LLM call latency including retries and hedging.", ("kind",))
+LLM_CIRCUIT_OPEN = Gauge("llm_gateway_circuit_open", "1 while the LLM circuit breaker is open.")
+
+# -----------------------------
+# 상담 그래프 체크포인터 메모리 메트릭 (BoundedMemorySaver)
+# -----------------------------
+CHECKPOINT_SESSIONS = Gauge("graph_checkpoint_resident_sessions", "Sessions currently held in memory by the checkpointer.")
+CHECKPOINT_RESIDENT_BYTES = Gauge("graph_checkpoint_resident_bytes", "Approximate bytes held in memory by the checkpointer.")
+CHECKPOINT_EVICTIONS = Counter("graph_checkpoint_evictions_total", "Sessions evicted from memory by reason (ttl/budget).", ("reason",))
+CHECKPOINT_RELOADS = Counter("graph_checkpoint_reloads_total", "Evicted sessions reloaded from the spill store.")
+
+# -----------------------------
+# 노드 구조화 출력 파싱 결과 (graph.structured)
+# result: ok / repaired / failed / absent(INTERNAL_DATA 없음)
+# -----------------------------
+STRUCTURED_OUTPUTS = Counter("graph_structured_output_total", "Structured node outputs by parse result.", ("node", "result"))
+STRUCTURED_FAILURE_RATIO = Gauge("graph_structured_output_failure_ratio", "Share of INTERNAL_DATA sections that failed first-pass parsing.", ("node",))
+
+
+# -----------------------------
+# Intake 중 Hypothesis 후보 점진 검색 (graph.prefetch)
+# result: exact(추정 후보 = 최종 후보) / partial / miss
+# -----------------------------
+SPECULATIVE_HYPOTHESIS = Counter("graph_speculative_hypothesis_total", "Speculative hypothesis candidate sets compared with the final ones.", ("result",))
+SPECULATIVE_OVERLAP = Counter("graph_speculative_hypothesis_overlap_sum", "Sum of overlap fractions between speculative and final candidates.")
+SPECULATIVE_OVERLAP_RATIO = Gauge("graph_speculative_hypothesis_overlap_ratio", "Mean share of final hypothesis candidates predicted during intake.")
+
+
+# -----------------------------
+# Intake 도메인 감지 (graph.domain_detector)
+# domain: 감지된 도메인명 / none(기준 점수 미달)
+# -----------------------------
+DOMAIN_DETECTIONS = Counter("graph_intake_domain_detections_total", "Intake messages scored by the local domain detector, by detected domain.", ("domain",))
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def _update_cache_ratios() -> None:
+    caches = {key[0] for key in CACHE_REQUESTS._values}
+    for cache in caches:
+        hits = CACHE_REQUESTS.get(cache=cache, result="hit")
+        misses = CACHE_REQUESTS.get(cache=cache, result="miss")
+        total = hits + misses
+        CACHE_HIT_RATIO.set(hits / total if total else 0.0, cache=cache)
+
+
+register_collector(_update_cache_ratios)
+
+
+def _update_structured_ratios() -> None:
+    nodes = {key[0] for key in STRUCTURED_OUTPUTS._values}
+    for node in nodes:
+        ok = STRUCTURED_OUTPUTS.get(node=node, result="ok")
+        bad = STRUCTURED_OUTPUTS.get(node=node, result="repaired") + STRUCTURED_OUTPUTS.get(node=node, result="failed")
+        total = ok + bad
+        STRUCTURED_FAILURE_RATIO.set(bad / total if total else 0.0, node=node)
+
+
+register_collector(_update_structured_ratios)
+
+
+def _update_speculative_ratio() -> None:
+    total = sum(SPECULATIVE_HYPOTHESIS.get(result=r) for r in ("exact", "partial", "miss"))
+    SPECULATIVE_OVERLAP_RATIO.set(SPECULATIVE_OVERLAP.get() / total if total else 0.0)
+
+
+register_collector(_update_speculative_ratio)
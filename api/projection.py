@@ -0,0 +1,152 @@
+# api/projection.py
+
+from typing import Optional, List, Dict, Any
+
+from fastapi.responses import Response
+
+# -----------------------------
+# 빠른 JSON 직렬화 (orjson이 있으면 사용)
+# -----------------------------
+try:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        # ORJSONResponse와 같이 str이 아닌 key도 허용
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+except ImportError:  # orjson 미설치 환경에서는 표준 json으로 대체
+    import json
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """dumps()로 직렬화하는 JSON 응답 (API 기본 응답 클래스, NDJSON 스트림과 같은 직렬화)"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# chunk 참조(reference)로 남길 메타데이터 키
+# DSM: page / disorder / canonical_disorder / section
+# Treatment: source_pdf / chunk_id / disorder / section
+CHUNK_REF_KEYS = (
+    "page",
+    "disorder",
+    "canonical_disorder",
+    "section",
+    "source_pdf",
+    "chunk_id",
+)
+
+# compact 모드에서 기본으로 내려주는 필드
+COMPACT_HYPOTHESIS_FIELDS = ("diagnosis_candidates", "by_diagnosis", "raw_hits")
+COMPACT_SOLUTION_FIELDS = ("diagnosis", "treatment_category", "solutions")
+
+
+def chunk_ref(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    {"text": ..., "metadata": {...}} 형태의 chunk를 본문 없이 참조 정보만 남긴 dict로 변환
+    """
+    meta = item.get("metadata") or {}
+    return {k: meta[k] for k in CHUNK_REF_KEYS if k in meta}
+
+
+def _to_refs(value: Any) -> Any:
+    # chunk 리스트 / {진단명: chunk 리스트} 둘 다 처리
+    if isinstance(value, list):
+        return [chunk_ref(v) for v in value if isinstance(v, dict)]
+    if isinstance(value, dict):
+        return {k: _to_refs(v) for k, v in value.items()}
+    return value
+
+
+def project(
+    data: Dict[str, Any],
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
+    compact_fields: tuple = (),
+    chunk_fields: tuple = (),
+) -> Dict[str, Any]:
+    """
+    RAG 응답 dict에서 필요한 필드만 골라내는 projection
+
+    Args:
+        data: retrieve_candidates / retrieve_solution 결과
+        fields: 포함할 최상위 필드 목록 (None이면 전체, compact면 compact_fields)
+        compact: True면 chunk 본문(text) 대신 참조 정보(chunk_ref)만 반환
+        compact_fields: compact 모드의 기본 필드
+        chunk_fields: chunk 리스트를 담고 있는 필드 (compact 시 참조로 축약)
+
+    Returns:
+        projection이 적용된 새 dict (원본은 변경하지 않음)
+    """
+    if fields:
+        keys = [k for k in fields if k in data]
+    elif compact:
+        keys = [k for k in compact_fields if k in data]
+    else:
+        keys = list(data.keys())
+
+    out: Dict[str, Any] = {}
+    for k in keys:
+        value = data[k]
+        if compact and k in chunk_fields:
+            value = _to_refs(value)
+        out[k] = value
+    return out
+
+
+def project_hypothesis(data: Dict[str, Any], fields: Optional[List[str]] = None, compact: bool = False) -> Dict[str, Any]:
+    return project(
+        data,
+        fields=fields,
+        compact=compact,
+        compact_fields=COMPACT_HYPOTHESIS_FIELDS,
+        chunk_fields=("by_diagnosis", "raw_hits"),
+    )
+
+
+def project_solution(data: Dict[str, Any], fields: Optional[List[str]] = None, compact: bool = False) -> Dict[str, Any]:
+    return project(
+        data,
+        fields=fields,
+        compact=compact,
+        compact_fields=COMPACT_SOLUTION_FIELDS,
+        chunk_fields=("solutions",),
+    )
+
+
+def project_stream_event(event: Dict[str, Any], fields: Optional[List[str]] = None, compact: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    iter_candidates 이벤트 하나에 projection 적용 (NDJSON 스트리밍용)
+
+    - candidates 이벤트: fields가 있으면 해당 필드만 유지, compact면 raw_hits를 참조로 축약
+    - criteria 이벤트: fields에 by_diagnosis가 없으면 생략(None 반환), compact면 참조로 축약
+    - done 이벤트: 그대로 전달
+    """
+    kind = event.get("event")
+
+    if kind == "candidates":
+        if fields:
+            keys = ["event"] + [k for k in fields if k in event and k != "event"]
+        elif compact:
+            keys = ["event", "diagnosis_candidates", "raw_hits"]
+        else:
+            keys = list(event.keys())
+        out = {k: event[k] for k in keys if k in event}
+        if compact and "raw_hits" in out:
+            out["raw_hits"] = _to_refs(out["raw_hits"])
+        return out
+
+    if kind == "criteria":
+        if fields and "by_diagnosis" not in fields:
+            return None
+        if compact:
+            return {**event, "criteria": _to_refs(event.get("criteria", []))}
+        return event
+
+    return event
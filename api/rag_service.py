@@ -3,8 +3,12 @@
 import os, sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from collections import Counter
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Dict, Any, Iterator
 
 from langchain_community.vectorstores import Chroma
 from rag.embeddings import get_embeddings
@@ -12,10 +16,24 @@ from rag.config import (
     CHROMA_DIR,
     DSM_COLLECTION_NAME,
     TREATMENT_COLLECTION_NAME,
+    WARMUP_ROUNDS,
+    WARMUP_SYMPTOM_QUERIES,
+    WARMUP_DIAGNOSES,
 )
 
 # 🔥 추가: DSM → Treatment Category 매핑 함수
 from rag.disorder_classifier import classify_disorder
+from rag.taxonomy import metadata_matches_category
+
+from api import tracing
+from api.metrics import (
+    PHASE_LATENCY,
+    KNN_DOCUMENTS,
+    KNN_SEARCHES,
+    INDEX_SIZE,
+    record_cache,
+    register_collector,
+)
 
 
 # -----------------------------
@@ -36,16 +54,119 @@ _treatment_db = Chroma(
 )
 
 
+def _collect_index_sizes():
+    # /metrics scrape 시점에 컬렉션별 문서 수 갱신
+    INDEX_SIZE.set(_dsm_db._collection.count(), collection=DSM_COLLECTION_NAME)
+    INDEX_SIZE.set(_treatment_db._collection.count(), collection=TREATMENT_COLLECTION_NAME)
+
+
+register_collector(_collect_index_sizes)
+
+
+# -----------------------------
+# 임베딩 + k-NN 검색 (계측 포함)
+# -----------------------------
+# 쿼리 임베딩 캐시: "diagnostic criteria"처럼 반복되는 쿼리의 재임베딩을 피한다.
+_QUERY_CACHE_SIZE = 256
+_query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+_query_cache_lock = threading.Lock()
+# warm-up 중에는 캐시를 읽지도 채우지도 않음 (매 라운드 실제 임베딩 + 캐시 hit 지표 오염 방지)
+_bypass_query_cache: ContextVar[bool] = ContextVar("bypass_query_cache", default=False)
+
+
+def embed_query(text: str) -> List[float]:
+    if _bypass_query_cache.get():
+        with PHASE_LATENCY.time(phase="embedding"):
+            return _embeddings.embed_query(text)
+
+    with _query_cache_lock:
+        vec = _query_cache.get(text)
+        if vec is not None:
+            _query_cache.move_to_end(text)
+    record_cache("query_embedding", vec is not None)
+    if vec is not None:
+        return vec
+
+    with PHASE_LATENCY.time(phase="embedding"):
+        vec = _embeddings.embed_query(text)
+
+    with _query_cache_lock:
+        _query_cache[text] = vec
+        if len(_query_cache) > _QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+    return vec
+
+
+def embed_documents(texts: List[str]) -> List[List[float]]:
+    """문서 쪽 임베딩 (쿼리 캐시 미사용, 호출 측에서 결과를 보관하는 고정 목록용)"""
+    with PHASE_LATENCY.time(phase="embedding"):
+        return _embeddings.embed_documents(texts)
+
+
+def _search(db: Chroma, collection: str, query: str, k: int, filter: Optional[Dict[str, Any]] = None):
+    """
+    similarity_search를 임베딩 / 벡터 검색 단계로 나눠 실행하고 단계별 시간을 기록
+    """
+    started = time.perf_counter()
+    vec = embed_query(query)
+    with PHASE_LATENCY.time(phase="vector_search"):
+        docs = db.similarity_search_by_vector(vec, k=k, filter=filter)
+    KNN_SEARCHES.inc(collection=collection)
+    KNN_DOCUMENTS.inc(len(docs), collection=collection)
+    tracing.add(retrieval_calls=1, retrieval_ms=(time.perf_counter() - started) * 1000)
+    return docs
+
+
 # -----------------------------
 # DSM Hypothesis Search
 # -----------------------------
-def retrieve_candidates(symptom_text: str, top_k: int = 12, diag_top_n: int = 3) -> Dict[str, Any]:
+# 진단별 criteria 조회를 병렬로 돌리기 위한 스레드 풀 (스트리밍 응답에서 사용)
+_criteria_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="criteria")
+
 
-    hits = _dsm_db.similarity_search(symptom_text, k=top_k)
+def vote_candidates(symptom_text: str, top_k: int = 12, diag_top_n: int = 3):
+    """
+    증상 텍스트로 top_k chunk를 검색하고 disorder 메타데이터 투표로 상위 후보 병명을 고른다.
+
+    Returns:
+        (hits, top_diags)
+    """
+    hits = _search(_dsm_db, DSM_COLLECTION_NAME, symptom_text, k=top_k)
 
     diags = [h.metadata.get("disorder") for h in hits if h.metadata.get("disorder")]
     counts = Counter(diags)
     top_diags = [d for d, _ in counts.most_common(diag_top_n)]
+    return hits, top_diags
+
+
+def lookup_criteria(diag: str) -> List[Dict[str, Any]]:
+    """
+    병명 하나에 대해 가장 긴 criteria chunk를 찾아 반환 (없으면 빈 리스트)
+    """
+    with PHASE_LATENCY.time(phase="criteria_lookup"):
+        raw = _search(
+            _dsm_db,
+            DSM_COLLECTION_NAME,
+            "diagnostic criteria",
+            k=200,
+            filter={"disorder": diag},
+        )
+
+        criteria_docs = [r for r in raw if r.metadata.get("section") == "criteria"]
+
+        if not criteria_docs:
+            return []
+
+        longest = max(criteria_docs, key=lambda d: len(d.page_content or ""))
+    return [{
+        "text": longest.page_content,
+        "metadata": longest.metadata,
+    }]
+
+
+def retrieve_candidates(symptom_text: str, top_k: int = 12, diag_top_n: int = 3) -> Dict[str, Any]:
+
+    hits, top_diags = vote_candidates(symptom_text, top_k, diag_top_n)
 
     result: Dict[str, Any] = {
         "input_symptom": symptom_text,
@@ -55,24 +176,49 @@ def retrieve_candidates(symptom_text: str, top_k: int = 12, diag_top_n: int = 3)
     }
 
     for diag in top_diags:
-        raw = _dsm_db.similarity_search(
-            "diagnostic criteria",
-            k=200,
-            filter={"disorder": diag},
-        )
+        result["by_diagnosis"][diag] = lookup_criteria(diag)
 
-        criteria_docs = [r for r in raw if r.metadata.get("section") == "criteria"]
+    return result
 
-        if criteria_docs:
-            longest = max(criteria_docs, key=lambda d: len(d.page_content or ""))
-            result["by_diagnosis"][diag] = [{
-                "text": longest.page_content,
-                "metadata": longest.metadata,
-            }]
-        else:
-            result["by_diagnosis"][diag] = []
 
-    return result
+def iter_candidates(symptom_text: str, top_k: int = 12, diag_top_n: int = 3) -> Iterator[Dict[str, Any]]:
+    """
+    retrieve_candidates의 스트리밍 버전.
+    후보 투표 결과를 먼저 내보내고, 진단별 criteria는 조회가 끝나는 순서대로 내보낸다.
+
+    Yields:
+        {"event": "candidates", "input_symptom", "diagnosis_candidates", "raw_hits"}
+        {"event": "criteria", "diagnosis", "rank", "criteria"}  (후보 수만큼)
+        {"event": "done", "diagnosis_candidates"}
+    """
+    hits, top_diags = vote_candidates(symptom_text, top_k, diag_top_n)
+
+    yield {
+        "event": "candidates",
+        "input_symptom": symptom_text,
+        "diagnosis_candidates": top_diags,
+        "raw_hits": [{"text": h.page_content, "metadata": h.metadata} for h in hits],
+    }
+
+    futures = {_criteria_pool.submit(lookup_criteria, diag): (rank, diag) for rank, diag in enumerate(top_diags, 1)}
+    for fut in as_completed(futures):
+        rank, diag = futures[fut]
+        try:
+            criteria = fut.result()
+        except Exception as e:
+            print(f"[RAG Service] criteria 조회 오류 ({diag}): {e}")
+            criteria = []
+        yield {
+            "event": "criteria",
+            "diagnosis": diag,
+            "rank": rank,
+            "criteria": criteria,
+        }
+
+    yield {
+        "event": "done",
+        "diagnosis_candidates": top_diags,
+    }
 
 
 
@@ -80,9 +226,8 @@ def retrieve_candidates(symptom_text: str, top_k: int = 12, diag_top_n: int = 3)
 # 내부 매칭 함수
 # -----------------------------
 def _metadata_matches_disorder(meta_disorder: Optional[str], category: str) -> bool:
-    if not meta_disorder or not category:
-        return False
-    return category.lower() in meta_disorder.lower()
+    # 카테고리별 허용 metadata 값 집합에 대한 해시 lookup (rag/taxonomy.py)
+    return metadata_matches_category(meta_disorder, category)
 
 
 
@@ -109,7 +254,7 @@ def retrieve_solution(diagnosis: str, symptom_text: Optional[str] = None) -> Dic
         query = f"{treatment_category} treatment"
 
     # 🔥 3) Treatment DB에서 검색
-    hits = _treatment_db.similarity_search(query, k=15)
+    hits = _search(_treatment_db, TREATMENT_COLLECTION_NAME, query, k=15)
 
     matched = []
     others = []
@@ -135,3 +280,37 @@ def retrieve_solution(diagnosis: str, symptom_text: Optional[str] = None) -> Dic
         "query": query,
         "solutions": ordered[:5],
     }
+
+
+
+# -----------------------------
+# Warm-up (cold start 대비)
+# -----------------------------
+def warm_up(rounds: int = WARMUP_ROUNDS) -> Dict[str, Any]:
+    """
+    대표 증상/진단 쿼리로 전체 검색 경로를 미리 실행해
+    첫 추론 비용(모델 JIT, 메모리 할당, Chroma 인덱스 로드)을 요청 전에 치른다.
+    쿼리 임베딩 캐시는 거치지 않으므로 라운드마다 실제로 임베딩을 계산한다.
+
+    Returns:
+        {"rounds": 실행 횟수, "seconds": 라운드별 소요 시간 리스트, "dsm_documents": ..., "treatment_documents": ...}
+    """
+    timings = []
+    token = _bypass_query_cache.set(True)
+    try:
+        for _ in range(max(rounds, 1)):
+            start = time.perf_counter()
+            for query in WARMUP_SYMPTOM_QUERIES:
+                retrieve_candidates(query)
+            for diag in WARMUP_DIAGNOSES:
+                retrieve_solution(diag, WARMUP_SYMPTOM_QUERIES[0])
+            timings.append(round(time.perf_counter() - start, 3))
+    finally:
+        _bypass_query_cache.reset(token)
+
+    return {
+        "rounds": len(timings),
+        "seconds": timings,
+        "dsm_documents": _dsm_db._collection.count(),
+        "treatment_documents": _treatment_db._collection.count(),
+    }
@@ -0,0 +1,77 @@
+# api/session_service.py
+
+from typing import Any, AsyncIterator, Dict, Optional
+
+from langchain_core.messages import BaseMessage, HumanMessage
+
+from frontend.graph_client import get_graph_client
+
+# -----------------------------
+# 상담 그래프 세션 서비스
+# - 그래프(build_graph + 체크포인터)는 API 워커 프로세스 안에서 실행
+# - Streamlit은 HTTP(SSE)로 턴을 보내고 이벤트를 받는 thin client
+# -----------------------------
+
+
+def message_to_dict(msg: Any) -> Any:
+    """LangChain 메시지를 {"role", "content"} dict로 변환 (UI 메시지 형식과 동일)"""
+    if isinstance(msg, BaseMessage):
+        role = "user" if isinstance(msg, HumanMessage) else "assistant"
+        return {"role": role, "content": msg.content}
+    return msg
+
+
+def _jsonable(value: Any) -> Any:
+    # State 값 중 메시지 객체와 tuple만 JSON 직렬화 가능한 형태로 변환
+    if isinstance(value, BaseMessage):
+        return message_to_dict(value)
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+def create_session() -> str:
+    """새 상담 세션(thread_id) 생성"""
+    return get_graph_client().create_thread_id()
+
+
+def get_snapshot(thread_id: str) -> Optional[Dict[str, Any]]:
+    """
+    세션의 현재 State 스냅샷 (JSON 직렬화 가능한 dict)
+    체크포인트가 없는(존재하지 않거나 아직 턴이 없는) 세션이면 None
+    """
+    snapshot = get_graph_client().get_state_snapshot(thread_id)
+    if snapshot.get("created_at") is None:
+        return None
+    return {
+        "thread_id": thread_id,
+        "values": _jsonable(snapshot.get("values") or {}),
+        "next": list(snapshot.get("next") or ()),
+        "created_at": snapshot.get("created_at"),
+    }
+
+
+async def stream_turn(thread_id: str, message: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    사용자 입력 한 턴을 그래프에 전달하고 이벤트를 순서대로 yield
+
+    - {"type": "token", "text": ...}: 생성 중인 사용자 표시용 텍스트 조각
+    - {"type": "update", "node": ..., "values": {...}}: 노드 실행 완료 후 State 업데이트
+    - {"type": "error", "detail": ...}: 실행 중 오류
+    - {"type": "done", "next": [...]}: 턴 종료 (다음 실행될 노드)
+    """
+    client = get_graph_client()
+    try:
+        async for event in client.astream_graph(message, thread_id):
+            if event.get("type") == "update":
+                yield {**event, "values": _jsonable(event.get("values") or {})}
+            else:
+                yield event
+    except Exception as e:
+        print(f"[Session API] 그래프 실행 오류 (thread_id={thread_id}): {e}")
+        yield {"type": "error", "detail": str(e)}
+
+    snapshot = client.get_state_snapshot(thread_id)
+    yield {"type": "done", "next": list(snapshot.get("next") or ())}
@@ -0,0 +1,201 @@
+# api/tracing.py
+# 상담 그래프 턴 단위 추적 (span)
+#
+# - 노드 실행(node.<이름>)과 체크포인트 쓰기(checkpoint.put / checkpoint.put_writes)를 span으로 기록
+# - 노드 span 안에서 일어난 LLM 호출 / RAG 검색 시간은 add()로 해당 span에 누적된다.
+#     prompt_chars, prompt_tokens(추정), llm_calls, llm_ms, llm_wait_ms(rate limit 대기), retrieval_calls, retrieval_ms
+# - span은 로컬 JSONL 파일(GRAPH_TRACE_DIR/spans-YYYYMMDD.jsonl)에 한 줄씩 기록
+#   GRAPH_TRACE_FORMAT=otlp 이면 OpenTelemetry(OTLP/JSON) span 형식으로 기록
+# - 집계: python app/trace_report.py
+#
+# 현재 span은 contextvars로 전달되므로, 백그라운드 스레드 풀(선행 조회 등)의 작업은 노드 span에 포함되지 않는다.
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+GRAPH_TRACE = os.getenv("GRAPH_TRACE", "0") == "1"
+GRAPH_TRACE_DIR = os.getenv("GRAPH_TRACE_DIR", "./.cache/traces")
+GRAPH_TRACE_FORMAT = os.getenv("GRAPH_TRACE_FORMAT", "jsonl")  # jsonl / otlp
+
+SERVICE_NAME = "checkmymental-graph"
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start_ns", "_started", "duration_ms", "status")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = {k: v for k, v in attributes.items() if v is not None}
+        self.start_ns = time.time_ns()
+        self._started = time.perf_counter()
+        self.duration_ms = 0.0
+        self.status = "ok"
+
+    def add(self, **values: float):
+        """수치 속성 누적 (같은 span에서 여러 번 호출되는 LLM / 검색 시간 합산)"""
+        for key, value in values.items():
+            self.attributes[key] = self.attributes.get(key, 0) + value
+
+    def set(self, **values: Any):
+        self.attributes.update({k: v for k, v in values.items() if v is not None})
+
+    def end(self):
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_ns / 1e9,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            **{k: (round(v, 3) if isinstance(v, float) else v) for k, v in self.attributes.items()},
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        return {
+            "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.start_ns + int(self.duration_ms * 1e6)),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 1 if self.status == "ok" else 2},
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def from_otlp(record: Dict[str, Any]) -> Dict[str, Any]:
+    """OTLP/JSON span 한 줄 -> to_record()와 같은 평면 dict (집계 CLI용)"""
+    attributes = {}
+    for attr in record.get("attributes", ()):
+        value = attr.get("value", {})
+        if "intValue" in value:
+            attributes[attr["key"]] = int(value["intValue"])
+        elif "doubleValue" in value:
+            attributes[attr["key"]] = float(value["doubleValue"])
+        elif "boolValue" in value:
+            attributes[attr["key"]] = bool(value["boolValue"])
+        else:
+            attributes[attr["key"]] = value.get("stringValue")
+    start, end = int(record["startTimeUnixNano"]), int(record["endTimeUnixNano"])
+    return {
+        "trace_id": record.get("traceId"),
+        "span_id": record.get("spanId"),
+        "parent_id": record.get("parentSpanId") or None,
+        "name": record.get("name"),
+        "start": start / 1e9,
+        "duration_ms": (end - start) / 1e6,
+        "status": "ok" if record.get("status", {}).get("code", 1) != 2 else "error",
+        **attributes,
+    }
+
+
+class JsonlSink:
+    """span을 날짜별 JSONL 파일에 한 줄씩 추가"""
+
+    def __init__(self, directory: str = GRAPH_TRACE_DIR, fmt: str = GRAPH_TRACE_FORMAT):
+        self.directory = Path(directory)
+        self.fmt = fmt
+        self._lock = threading.Lock()
+
+    def path(self) -> Path:
+        return self.directory / f"spans-{time.strftime('%Y%m%d')}.jsonl"
+
+    def write(self, span: Span):
+        payload = span.to_otlp() if self.fmt == "otlp" else span.to_record()
+        line = json.dumps(payload, ensure_ascii=False, default=str)
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.path(), "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("graph_trace_span", default=None)
+_enabled = GRAPH_TRACE
+_sink: Optional[JsonlSink] = None
+
+
+def _get_sink() -> JsonlSink:
+    global _sink
+    if _sink is None:
+        _sink = JsonlSink()
+    return _sink
+
+
+def configure_tracing(enabled: Optional[bool] = None, directory: Optional[str] = None, fmt: Optional[str] = None, sink=None):
+    """추적 on/off 및 기록 위치 변경 (부하 테스트, 스크립트용) — sink: write(span)을 가진 객체"""
+    global _enabled, _sink
+    if enabled is not None:
+        _enabled = enabled
+    if sink is not None:
+        _sink = sink
+    elif directory is not None or fmt is not None:
+        _sink = JsonlSink(directory or GRAPH_TRACE_DIR, fmt or GRAPH_TRACE_FORMAT)
+
+
+def tracing_enabled() -> bool:
+    return _enabled
+
+
+def _trace_id(thread_id: Optional[str]) -> str:
+    # 같은 상담 세션(thread_id)의 span은 같은 trace로 묶음
+    if thread_id:
+        return hashlib.md5(str(thread_id).encode("utf-8")).hexdigest()
+    return uuid.uuid4().hex
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """span 기록 (추적이 꺼져 있으면 아무것도 하지 않고 None)"""
+    if not _enabled:
+        yield None
+        return
+    parent = _current.get()
+    trace_id = parent.trace_id if parent else _trace_id(attributes.get("thread_id"))
+    current = Span(name, trace_id, parent.span_id if parent else None, attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException:
+        current.status = "error"
+        raise
+    finally:
+        _current.reset(token)
+        current.end()
+        try:
+            _get_sink().write(current)
+        except OSError as e:
+            print(f"[tracing] span 기록 실패: {e}")
+
+
+def add(**values: float):
+    """현재 span에 수치 누적 (span 밖이거나 추적이 꺼져 있으면 무시)"""
+    current = _current.get()
+    if current is not None:
+        current.add(**values)
@@ -1,16 +1,14 @@
 """
 AI 상담 프로토타입 메인 애플리케이션
 """
-import streamlit as st
 from frontend.config import check_api_key
 from frontend.ui_components import (
     setup_page_config,
     render_sidebar,
     render_main_header,
-    render_chat_messages,
-    render_user_input,
+    render_conversation,
 )
-from frontend.chat_handler import init_chat_history, process_user_input, get_current_stage_info
+from frontend.chat_handler import init_chat_history
 
 # API 키 확인
 check_api_key()
@@ -27,18 +25,6 @@ render_main_header()
 # 채팅 히스토리 초기화 (가이드라인 메시지 포함)
 init_chat_history()
 
-# # 채팅 메시지 표시
-render_chat_messages(st.session_state.messages)
-
-# 사용자 입력 처리
-user_input = render_user_input()
-
-if user_input:
-    # 사용자 메시지 표시
-    with st.chat_message("user"):
-        st.markdown(user_input)
-    
-    # 입력 처리 후 즉시 최신 히스토리 렌더링을 위해 rerun
-    with st.spinner("답변을 생성하는 중..."):
-        process_user_input(user_input)
-    st.rerun()
+# 채팅 메시지 표시 + 사용자 입력 처리
+# (새 메시지와 입력창은 fragment로 분리되어, 턴마다 전체 히스토리를 다시 그리지 않음)
+render_conversation()
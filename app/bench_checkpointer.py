@@ -0,0 +1,96 @@
+# app/bench_checkpointer.py
+# 체크포인터 쓰기 지연시간 비교: MemorySaver vs SqliteCheckpointSaver (배치 / 매번 commit)
+#
+#   python app/bench_checkpointer.py --threads 20 --turns 30
+
+import argparse
+import os, sys
+import statistics
+import tempfile
+import time
+
+# 프로젝트 루트 경로 잡아주기
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.memory import MemorySaver
+from graph.checkpointer import SqliteCheckpointSaver
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def run(saver, threads: int, turns: int, message_chars: int):
+    """
+    thread_id별로 turns번 (put + put_writes)를 반복하며 건별 지연시간(ms) 측정
+    상담 한 턴처럼 메시지 히스토리가 턴마다 2개씩 늘어나는 checkpoint를 사용
+    """
+    put_ms, writes_ms = [], []
+    text = "가" * message_chars
+    start = time.perf_counter()
+    for t in range(threads):
+        config = {"configurable": {"thread_id": f"bench-{t}", "checkpoint_ns": ""}}
+        messages = []
+        for turn in range(1, turns + 1):
+            messages = messages + [HumanMessage(content=text), AIMessage(content=text)]
+            checkpoint = empty_checkpoint()
+            checkpoint["channel_values"] = {"messages": messages, "intake_summary_report": text}
+            checkpoint["channel_versions"] = {"messages": turn, "intake_summary_report": turn}
+
+            t0 = time.perf_counter()
+            config = saver.put(config, checkpoint, {"source": "loop", "step": turn, "writes": {}}, {"messages": turn})
+            put_ms.append((time.perf_counter() - t0) * 1000)
+
+            t0 = time.perf_counter()
+            saver.put_writes(config, [("messages", [AIMessage(content=text)])], task_id=f"task-{turn}")
+            writes_ms.append((time.perf_counter() - t0) * 1000)
+    if hasattr(saver, "flush"):
+        saver.flush()
+    total = time.perf_counter() - start
+
+    return {
+        "put_p50_ms": statistics.median(put_ms),
+        "put_p95_ms": _percentile(put_ms, 0.95),
+        "writes_p50_ms": statistics.median(writes_ms),
+        "writes_p95_ms": _percentile(writes_ms, 0.95),
+        "ops_per_sec": (len(put_ms) + len(writes_ms)) / total,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checkpointer write latency benchmark")
+    parser.add_argument("--threads", type=int, default=20, help="세션(thread_id) 수")
+    parser.add_argument("--turns", type=int, default=30, help="세션당 턴 수")
+    parser.add_argument("--message-chars", type=int, default=400, help="메시지 1개 길이")
+    parser.add_argument("--keep-last", type=int, default=20, help="SQLite 보관 checkpoint 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        savers = {
+            "memory": MemorySaver(),
+            "sqlite_batched": SqliteCheckpointSaver(os.path.join(tmp, "batched.db"), keep_last=args.keep_last),
+            "sqlite_per_write": SqliteCheckpointSaver(os.path.join(tmp, "per_write.db"), keep_last=args.keep_last, batch_size=1),
+        }
+
+        print(f"threads={args.threads} turns={args.turns} message_chars={args.message_chars} keep_last={args.keep_last}")
+        print(f"{'saver':<18}{'put p50':>10}{'put p95':>10}{'wr p50':>10}{'wr p95':>10}{'ops/s':>10}{'db KB':>10}")
+        for name, saver in savers.items():
+            result = run(saver, args.threads, args.turns, args.message_chars)
+            db_kb = ""
+            if isinstance(saver, SqliteCheckpointSaver):
+                saver.vacuum()
+                db_kb = f"{saver.stats()['db_bytes'] / 1024:.0f}"
+            print(
+                f"{name:<18}{result['put_p50_ms']:>10.3f}{result['put_p95_ms']:>10.3f}"
+                f"{result['writes_p50_ms']:>10.3f}{result['writes_p95_ms']:>10.3f}"
+                f"{result['ops_per_sec']:>10.0f}{db_kb:>10}"
+            )
+            if isinstance(saver, SqliteCheckpointSaver):
+                saver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+# app/bench_retrieval.py
+# DSM 검색 품질 / 지연 벤치마크: 라벨링된 증상 쿼리(rag/benchmark_queries.json)로
+# 임베딩 backend x 벡터 스토어 설정별 recall@k, MRR, 후보 투표 정확도, 쿼리 지연 / 처리량을 측정해 JSON으로 저장
+#
+#   python app/bench_retrieval.py
+#   python app/bench_retrieval.py \
+#       --config "name=minilm,model=sentence-transformers/all-MiniLM-L6-v2,dir=./rag/chroma_db,collection=dsm5tr" \
+#       --config "name=e5,model=intfloat/multilingual-e5-small,dir=./rag/chroma_db_e5,collection=dsm5tr" \
+#       --concurrency 8 --out .cache/bench/e5-vs-minilm.json
+#
+# - 순위는 검색된 chunk의 질환(canonical_disorder, 없으면 disorder를 rag.taxonomy로 정규화)을 처음 나온 순서대로 중복 제거한 것
+# - recall@k: 상위 k개 질환 안에 기대 질환이 하나라도 있는 쿼리 비율 / MRR: 첫 기대 질환 순위의 역수 평균
+# - 투표 정확도: api.rag_service.vote_candidates와 같은 방식(top_k chunk의 원본 disorder 메타데이터로 투표, 상위 diag_top_n개)의
+#   top-1 / top-n 적중률 (채점할 때만 뽑힌 이름을 canonical로 정규화해 기대 질환과 비교)
+# - 인덱스는 해당 임베딩 모델로 만든 것이어야 함 (RAG_EMBEDDING_MODEL=... python rag/build_dsm_db.py)
+
+import argparse
+import json
+import os, sys
+import statistics
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# 프로젝트 루트 경로 잡아주기
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from langchain_community.vectorstores import Chroma
+from rag.embeddings import EMBEDDING_MODEL, get_embeddings
+from rag.config import CHROMA_DIR, DSM_COLLECTION_NAME, RETRIEVAL_BENCHMARK_DIR, RETRIEVAL_BENCHMARK_FILE
+from rag.taxonomy import lookup
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def _latency(values):
+    return {
+        "mean": round(statistics.fmean(values), 2),
+        "p50": round(_percentile(values, 0.50), 2),
+        "p95": round(_percentile(values, 0.95), 2),
+        "max": round(max(values), 2),
+    }
+
+
+def parse_config(text: str):
+    """"name=...,model=...,dir=...,collection=..." -> dict (빠진 값은 기본 설정)"""
+    config = {"model": EMBEDDING_MODEL, "dir": CHROMA_DIR, "collection": DSM_COLLECTION_NAME}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        key, _, value = part.partition("=")
+        if key not in ("name", "model", "dir", "collection"):
+            raise argparse.ArgumentTypeError(f"알 수 없는 설정 키: {key}")
+        config[key] = value
+    config.setdefault("name", config["model"].rsplit("/", 1)[-1])
+    return config
+
+
+def canonical(metadata) -> str:
+    name = metadata.get("canonical_disorder")
+    if name:
+        return name
+    raw = metadata.get("disorder")
+    info = lookup(raw)
+    return info.name if info else (raw or "Unknown")
+
+
+def rank_disorders(docs):
+    """chunk 순서대로 질환명 중복 제거"""
+    return list(dict.fromkeys(canonical(d.metadata) for d in docs if d.metadata.get("disorder") or d.metadata.get("canonical_disorder")))
+
+
+def vote(docs, vote_k: int, diag_top_n: int):
+    # vote_candidates와 동일하게 원본 disorder로 투표 (표기가 다른 같은 질환은 표가 나뉜다)
+    counts = Counter(d.metadata["disorder"] for d in docs[:vote_k] if d.metadata.get("disorder"))
+    return [canonical({"disorder": name}) for name, _ in counts.most_common(diag_top_n)]
+
+
+def run_query(embeddings, db, item, search_k: int, vote_k: int, diag_top_n: int):
+    started = time.perf_counter()
+    vec = embeddings.embed_query(item["query"])
+    embedded = time.perf_counter()
+    docs = db.similarity_search_by_vector(vec, k=search_k)
+    finished = time.perf_counter()
+
+    expected = set(item["expected"])
+    ranking = rank_disorders(docs)
+    first = next((i for i, name in enumerate(ranking, 1) if name in expected), None)
+    voted = vote(docs, vote_k, diag_top_n)
+    return {
+        "id": item["id"],
+        "lang": item.get("lang", ""),
+        "expected": item["expected"],
+        "ranking": ranking[:10],
+        "first_rank": first,
+        "voted": voted,
+        "vote_top1": bool(voted) and voted[0] in expected,
+        "vote_topn": any(name in expected for name in voted),
+        "embed_ms": (embedded - started) * 1000,
+        "search_ms": (finished - embedded) * 1000,
+        "total_ms": (finished - started) * 1000,
+    }
+
+
+def quality(results, ks):
+    n = len(results)
+    return {
+        "queries": n,
+        **{f"recall@{k}": round(sum(1 for r in results if r["first_rank"] and r["first_rank"] <= k) / n, 4) for k in ks},
+        "mrr": round(sum(1 / r["first_rank"] for r in results if r["first_rank"]) / n, 4),
+        "vote_top1_accuracy": round(sum(r["vote_top1"] for r in results) / n, 4),
+        "vote_topn_accuracy": round(sum(r["vote_topn"] for r in results) / n, 4),
+    }
+
+
+def bench_config(config, queries, args):
+    print(f"[bench] {config['name']}: model={config['model']} dir={config['dir']} collection={config['collection']}")
+    load_started = time.perf_counter()
+    embeddings = get_embeddings(config["model"])
+    db = Chroma(embedding_function=embeddings, persist_directory=config["dir"], collection_name=config["collection"])
+    index_size = db._collection.count()
+    if not index_size:
+        print(f"  ! 빈 인덱스: {config['dir']} / {config['collection']}")
+        return {**config, "index_size": 0, "error": "empty index"}
+    # 모델 로드 / 첫 호출 비용은 측정에서 제외
+    embeddings.embed_query("warm up")
+    load_s = time.perf_counter() - load_started
+
+    search_k = max(max(args.k), args.vote_k)
+    results = []
+    for _ in range(args.repeat):
+        results = [run_query(embeddings, db, item, search_k, args.vote_k, args.diag_top_n) for item in queries]
+        # 반복 측정 시 지연은 마지막 회차 기준 (품질은 결정적이므로 동일)
+
+    sequential_s = sum(r["total_ms"] for r in results) / 1000
+    concurrent = None
+    if args.concurrency > 1:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(lambda item: run_query(embeddings, db, item, search_k, args.vote_k, args.diag_top_n), queries))
+        elapsed = time.perf_counter() - started
+        concurrent = {"workers": args.concurrency, "queries_per_s": round(len(queries) / elapsed, 2)}
+
+    by_lang = defaultdict(list)
+    for r in results:
+        by_lang[r["lang"]].append(r)
+
+    return {
+        **config,
+        "index_size": index_size,
+        "load_s": round(load_s, 2),
+        "quality": quality(results, args.k),
+        "quality_by_lang": {lang: quality(items, args.k) for lang, items in sorted(by_lang.items())},
+        "latency_ms": {key: _latency([r[key] for r in results]) for key in ("embed_ms", "search_ms", "total_ms")},
+        "throughput": {"sequential_queries_per_s": round(len(results) / sequential_s, 2) if sequential_s else None, "concurrent": concurrent},
+        "results": [{k: (round(v, 2) if isinstance(v, float) else v) for k, v in r.items()} for r in results],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DSM retrieval quality and latency benchmark")
+    parser.add_argument("--queries", default=RETRIEVAL_BENCHMARK_FILE, help="라벨링된 쿼리 파일")
+    parser.add_argument("--config", action="append", type=parse_config, help="name=..,model=..,dir=..,collection=.. (여러 번 지정 가능)")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10], help="recall@k의 k 목록")
+    parser.add_argument("--vote-k", type=int, default=12, help="후보 투표에 쓰는 chunk 수 (vote_candidates의 top_k)")
+    parser.add_argument("--diag-top-n", type=int, default=3, help="투표로 고르는 후보 수")
+    parser.add_argument("--repeat", type=int, default=1, help="지연 측정 반복 횟수")
+    parser.add_argument("--concurrency", type=int, default=1, help="동시 처리량 측정용 스레드 수 (1이면 생략)")
+    parser.add_argument("--lang", help="해당 언어 쿼리만 사용 (en / ko)")
+    parser.add_argument("--out", help="결과 JSON 경로 (기본: RETRIEVAL_BENCHMARK_DIR/retrieval-<시각>.json)")
+    args = parser.parse_args()
+    for name in ("repeat", "vote_k", "diag_top_n", "concurrency"):
+        if getattr(args, name) < 1:
+            parser.error(f"--{name.replace('_', '-')}는 1 이상이어야 합니다")
+    if min(args.k) < 1:
+        parser.error("--k는 1 이상이어야 합니다")
+
+    with open(args.queries, "r", encoding="utf-8") as f:
+        queries = json.load(f)["queries"]
+    if args.lang:
+        queries = [q for q in queries if q.get("lang") == args.lang]
+    if not queries:
+        parser.error(f"측정할 쿼리가 없습니다: {args.queries}" + (f" (--lang {args.lang})" if args.lang else ""))
+    configs = args.config or [parse_config("")]
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "queries_file": args.queries,
+        "params": {"k": args.k, "vote_k": args.vote_k, "diag_top_n": args.diag_top_n, "repeat": args.repeat, "lang": args.lang},
+        "configs": [bench_config(config, queries, args) for config in configs],
+    }
+
+    out = args.out or os.path.join(RETRIEVAL_BENCHMARK_DIR, f"retrieval-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    recall_cols = [f"recall@{k}" for k in args.k]
+    print(f"{'config':<20}" + "".join(f"{c:>11}" for c in recall_cols) + f"{'MRR':>8}{'vote@1':>8}{'vote@n':>8}{'p50 ms':>9}{'p95 ms':>9}{'q/s':>8}")
+    for row in report["configs"]:
+        if "quality" not in row:
+            print(f"{row['name']:<20}  ({row.get('error')})")
+            continue
+        q, lat = row["quality"], row["latency_ms"]["total_ms"]
+        print(
+            f"{row['name']:<20}" + "".join(f"{q[c]:>11.3f}" for c in recall_cols)
+            + f"{q['mrr']:>8.3f}{q['vote_top1_accuracy']:>8.3f}{q['vote_topn_accuracy']:>8.3f}"
+            + f"{lat['p50']:>9.1f}{lat['p95']:>9.1f}{row['throughput']['sequential_queries_per_s'] or 0:>8.1f}"
+        )
+    print(f"[bench] ✅ 저장: {out}")
+
+
+if __name__ == "__main__":
+    main()
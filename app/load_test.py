@@ -0,0 +1,364 @@
+# app/load_test.py
+# 동시 가상 세션 부하 테스트: 스크립트된 환자 페르소나 N명을 GraphClient로 동시에 진행
+# Gemini 대신 결정적인 로컬 응답기(FakeGemini)를 LLM 게이트웨이 backend로 사용하므로 API 할당량을 쓰지 않는다.
+# (RAG 검색 / 임베딩은 로컬 Chroma 인덱스를 그대로 사용)
+#
+#   python app/load_test.py --sessions 20 --latency-ms 800 --latency-dist lognormal
+#   python app/load_test.py --sessions 50 --checkpoint-db memory --json
+#
+# 출력: 초당 턴 수, 턴 지연 p50/p95/p99, 노드(단계)별 p50/p95/p99, RSS 증가량, 체크포인터 크기
+
+import argparse
+import asyncio
+import json
+import math
+import os, sys
+import re
+import resource
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+# 프로젝트 루트 경로 잡아주기
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# 로컬 backend를 쓰므로 API 키 불필요 (gemini_api import 전에 설정)
+os.environ.setdefault("LLM_BACKEND", "stub")
+
+INTERNAL_DATA_MARKER = "---INTERNAL_DATA---"
+
+# -----------------------------
+# 페르소나 (증상 발화 + 척도 응답 번호)
+# -----------------------------
+PERSONAS = [
+    {
+        "name": "depression",
+        "intake": [
+            "요즘 아무것도 하기 싫고 하루 종일 우울해요.",
+            "두 달쯤 됐어요. 잠도 잘 못 자고 입맛도 없어요.",
+            "회사 일에 집중이 안 돼서 실수가 많아졌어요. 가족들도 걱정해요.",
+            "예전에 이런 적은 없었고, 요즘은 제가 쓸모없는 사람 같아요.",
+        ],
+        "validation_answer": "4",
+        "severity_answer": "3",
+    },
+    {
+        "name": "anxiety",
+        "intake": [
+            "별일 아닌데도 계속 걱정이 되고 불안해요.",
+            "반년 넘게 이래요. 가슴이 두근거리고 근육이 늘 긴장돼 있어요.",
+            "잠들기 어렵고 쉽게 피곤해져서 일에 지장이 있어요.",
+            "특별한 계기는 없었고 점점 심해지는 것 같아요.",
+        ],
+        "validation_answer": "5",
+        "severity_answer": "2",
+    },
+    {
+        "name": "adhd",
+        "intake": [
+            "어릴 때부터 집중을 잘 못하고 물건을 자주 잃어버려요.",
+            "회의 중에도 딴생각을 하고 마감을 자주 놓쳐요.",
+            "가만히 앉아 있기 힘들고 다른 사람 말을 끊을 때가 많아요.",
+            "학교 다닐 때도 선생님께 자주 지적받았어요.",
+        ],
+        "validation_answer": "4",
+        "severity_answer": "4",
+    },
+    {
+        "name": "insomnia",
+        "intake": [
+            "밤에 잠이 안 와서 새벽까지 깨어 있어요.",
+            "석 달째 일주일에 네다섯 번은 그래요.",
+            "낮에 너무 피곤해서 운전할 때도 위험할 때가 있어요.",
+            "커피는 줄였는데도 나아지지 않아요.",
+        ],
+        "validation_answer": "3",
+        "severity_answer": "2",
+    },
+]
+
+
+# -----------------------------
+# 로컬 Gemini 대역 (결정적 응답기)
+# -----------------------------
+_USER_LINE = re.compile(r"^\s*사용자: (.*)$", re.MULTILINE)
+_DIGIT_ANSWER = re.compile(r"^\s*[1-5]\b")
+_CRITERIA_DISORDER = re.compile(r'"\[([^\]]+)\] ')
+
+
+class FakeGemini:
+    """
+    프롬프트만 보고 단계별 응답을 만드는 상태 없는 응답기 (같은 프롬프트 -> 항상 같은 응답)
+    - Intake: 이전 대화의 사용자 발화가 intake_turns - 1개 이상이면 summary_string 출력
+    - Validation(LLM 질문 경로): 숫자 응답이 validation_turns개 모이면 probabilities 출력
+    - Severity(LLM 평가 경로): 숫자 응답이 severity_turns개 모이면 result_string 출력
+    - 질문 전달 / 대화 요약 / Solution: 일반 텍스트
+    INTERNAL_DATA는 graph.structured 스키마를 따르는 JSON 객체 하나로 출력
+    """
+
+    def __init__(self, intake_turns: int = 3, validation_turns: int = 3, severity_turns: int = 3):
+        self.intake_turns = intake_turns
+        self.validation_turns = validation_turns
+        self.severity_turns = severity_turns
+        self.calls = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _count(self, kind: str):
+        with self._lock:
+            self.calls[kind] += 1
+
+    @staticmethod
+    def _with_data(message: str, data: dict) -> str:
+        return f"{message}\n{INTERNAL_DATA_MARKER}\n{json.dumps(data, ensure_ascii=False)}"
+
+    @staticmethod
+    def _current_input(prompt: str) -> str:
+        index = prompt.rfind("사용자 질문:")
+        return prompt[index + len("사용자 질문:"):].strip() if index >= 0 else ""
+
+    def _answers(self, prompt: str):
+        # 이전 대화 + 현재 입력 중 숫자로 시작하는 사용자 응답 수
+        lines = _USER_LINE.findall(prompt) + [self._current_input(prompt)]
+        return sum(1 for line in lines if _DIGIT_ANSWER.match(line))
+
+    def __call__(self, prompt: str, generation_config=None) -> str:
+        if (generation_config or {}).get("response_mime_type") == "application/json":
+            self._count("json")
+            return "{}"
+        if "## Previous Summary" in prompt:
+            self._count("summary")
+            lines = _USER_LINE.findall(prompt.split("## New Messages", 1)[-1])
+            return "\n".join(f"- {line[:80]}" for line in lines) or "- (요약할 내용 없음)"
+        if "## 이번에 전달할 질문" in prompt:
+            self._count("relay")
+            question = prompt.split("## 이번에 전달할 질문", 1)[1].split("\n## ", 1)[0]
+            return f"말씀해 주셔서 고마워요.{question}"
+        if '"domain_detected"' in prompt:
+            return self._intake(prompt)
+        if '"probabilities"' in prompt:
+            return self._validation(prompt)
+        if '"result_string"' in prompt:
+            return self._severity(prompt)
+        self._count("solution")
+        return "지금까지의 이야기를 바탕으로 도움이 될 만한 방법을 정리해 드릴게요.\n1. 규칙적인 생활 리듬 유지\n2. 전문가 상담 예약"
+
+    def _intake(self, prompt: str) -> str:
+        self._count("intake")
+        previous = _USER_LINE.findall(prompt)
+        data = {"domain_detected": None, "domain_completed": "심화 질문 모드**: 예" in prompt, "summary_string": None}
+        if len(previous) >= self.intake_turns - 1:
+            symptoms = " ".join(previous + [self._current_input(prompt)])
+            data["summary_string"] = f"주호소 및 증상: {symptoms}"
+            return self._with_data("충분히 이야기해 주셔서 감사해요. 지금까지 내용을 정리해 볼게요.", data)
+        return self._with_data("그랬군요. 조금 더 자세히 말씀해 주실 수 있을까요? 언제부터 그러셨나요?", data)
+
+    def _validation(self, prompt: str) -> str:
+        self._count("validation")
+        disorders = list(dict.fromkeys(_CRITERIA_DISORDER.findall(prompt)))
+        if disorders and self._answers(prompt) >= self.validation_turns:
+            probabilities = [{"disorder": d, "probability": 0.8 if i == 0 else 0.3} for i, d in enumerate(disorders)]
+            return self._with_data("답변 감사합니다. 결과를 정리했어요.", {"validated": disorders[0], "probabilities": probabilities})
+        return "다음 질문입니다. 최근 2주 동안 이런 경험이 얼마나 자주 있었나요?\n1. 전혀 그렇지 않다\n2. 거의 그렇지 않다\n3. 가끔 그렇다\n4. 자주 그렇다\n5. 매우 자주/항상 그렇다"
+
+    def _severity(self, prompt: str) -> str:
+        self._count("severity")
+        if self._answers(prompt) >= self.severity_turns:
+            match = re.search(r"## 평가 대상 질환: (.+)", prompt)
+            diagnosis = match.group(1).strip() if match else None
+            data = {"result_string": f"평가 대상: {diagnosis}\n심각도: 중등도", "diagnosis": diagnosis, "level": "중등도", "score": None}
+            return self._with_data("평가가 끝났어요. 결과를 바탕으로 도움이 될 방법을 안내해 드릴게요.", data)
+        return "지난 2주 동안 이 증상이 일상에 얼마나 영향을 주었나요? 1~4 중에서 골라 주세요."
+
+
+# -----------------------------
+# 지연 분포 / 측정 도구
+# -----------------------------
+def latency_sampler(dist: str, mean_ms: float, spread: float):
+    """random.Random -> 지연(초) 함수 (fixed / uniform / lognormal / exponential, 평균 mean_ms)"""
+    mean = mean_ms / 1000
+    if dist == "fixed" or mean <= 0:
+        return lambda rnd: mean
+    if dist == "uniform":
+        return lambda rnd: rnd.uniform(mean * (1 - spread), mean * (1 + spread))
+    if dist == "exponential":
+        return lambda rnd: rnd.expovariate(1 / mean)
+    if dist == "lognormal":
+        # 평균이 mean이 되도록 mu 보정 (spread = sigma)
+        mu = math.log(mean) - spread ** 2 / 2
+        return lambda rnd: rnd.lognormvariate(mu, spread)
+    raise ValueError(f"알 수 없는 지연 분포: {dist}")
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0.0
+
+
+def _quantiles(values):
+    return {"p50": round(_percentile(values, 0.50), 1), "p95": round(_percentile(values, 0.95), 1), "p99": round(_percentile(values, 0.99), 1)}
+
+
+def _rss_mb() -> float:
+    """현재 RSS(MB) — /proc이 없으면 최대 RSS로 대체"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+class SpanCollector:
+    """api.tracing sink: 노드 / 체크포인트 span을 메모리에 모음"""
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def write(self, span):
+        with self._lock:
+            self.spans.append(span.to_record())
+
+
+# -----------------------------
+# 세션 실행
+# -----------------------------
+def _next_input(persona, state, intake_index: int) -> str:
+    if not state or not state.get("intake_summary_report") or state.get("is_re_intake"):
+        lines = persona["intake"]
+        return lines[intake_index % len(lines)]
+    if state.get("severity_diagnosis"):
+        return persona["severity_answer"]
+    return persona["validation_answer"]
+
+
+async def run_session(client, persona, index: int, max_turns: int, think_time: float, turn_ms, errors):
+    thread_id = f"load-{persona['name']}-{index}"
+    state, intake_index = None, 0
+    for _ in range(max_turns):
+        text = _next_input(persona, state, intake_index)
+        if not state or not state.get("intake_summary_report"):
+            intake_index += 1
+        started = time.perf_counter()
+        try:
+            state = await client.ainvoke_graph(text, thread_id)
+        except Exception as e:
+            errors.append(f"{thread_id}: {type(e).__name__}: {e}")
+            return False
+        turn_ms.append((time.perf_counter() - started) * 1000)
+        if state.get("solution_content"):
+            return True
+        if think_time:
+            await asyncio.sleep(think_time)
+    return False
+
+
+async def run(args):
+    from api import tracing
+    from frontend.graph_client import GraphClient
+    from frontend.llm_gateway import StubBackend, configure_gateway
+
+    responder = FakeGemini(args.intake_turns, args.validation_turns, args.severity_turns)
+    configure_gateway(
+        StubBackend(
+            responder,
+            fail_rate=args.fail_rate,
+            seed=args.seed,
+            latency_sampler=latency_sampler(args.latency_dist, args.latency_ms, args.latency_spread),
+        ),
+        rpm=args.rpm,
+        tpm=args.tpm,
+    )
+    collector = SpanCollector()
+    tracing.configure_tracing(enabled=True, sink=collector)
+
+    rss_start = _rss_mb()
+    client = GraphClient()
+    turn_ms, errors = [], []
+
+    # 모델 / 인덱스 로드를 측정에서 제외하기 위한 예열 세션 1개
+    await run_session(client, PERSONAS[0], -1, args.max_turns, 0, [], errors)
+    collector.spans.clear()
+    rss_warm = _rss_mb()
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        run_session(client, PERSONAS[i % len(PERSONAS)], i, args.max_turns, args.think_time, turn_ms, errors)
+        for i in range(args.sessions)
+    ))
+    elapsed = time.perf_counter() - started
+
+    by_span = defaultdict(list)
+    for span in collector.spans:
+        by_span[span["name"]].append(span["duration_ms"])
+    checkpointer = client._checkpointer
+    if hasattr(checkpointer, "flush"):
+        checkpointer.flush()
+    stats = checkpointer.stats() if hasattr(checkpointer, "stats") else {}
+    if hasattr(checkpointer, "close"):
+        checkpointer.close()
+    return {
+        "sessions": args.sessions,
+        "completed": sum(results),
+        "errors": errors[:20],
+        "turns": len(turn_ms),
+        "elapsed_s": round(elapsed, 2),
+        "turns_per_s": round(len(turn_ms) / elapsed, 2) if elapsed else 0.0,
+        "turn_ms": _quantiles(turn_ms),
+        "spans": {name: {"count": len(v), **_quantiles(v)} for name, v in sorted(by_span.items())},
+        "llm_calls": dict(responder.calls),
+        "rss_mb": {"start": round(rss_start, 1), "warm": round(rss_warm, 1), "end": round(_rss_mb(), 1)},
+        "rss_growth_mb": round(_rss_mb() - rss_warm, 1),
+        "checkpointer": {"type": type(checkpointer).__name__, **stats},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent synthetic-session load test with a local fake Gemini")
+    parser.add_argument("--sessions", type=int, default=10, help="동시 세션 수")
+    parser.add_argument("--max-turns", type=int, default=40, help="세션당 최대 턴 수")
+    parser.add_argument("--think-time", type=float, default=0.0, help="턴 사이 대기(초)")
+    parser.add_argument("--latency-ms", type=float, default=500, help="LLM 응답 평균 지연(ms)")
+    parser.add_argument("--latency-dist", choices=("fixed", "uniform", "lognormal", "exponential"), default="lognormal")
+    parser.add_argument("--latency-spread", type=float, default=0.5, help="uniform: ±비율 / lognormal: sigma")
+    parser.add_argument("--rpm", type=float, default=1e6, help="게이트웨이 분당 요청 한도 (기본: 사실상 무제한)")
+    parser.add_argument("--tpm", type=float, default=1e9, help="게이트웨이 분당 토큰 한도")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="LLM 일시 오류 주입 확률")
+    parser.add_argument("--intake-turns", type=int, default=3)
+    parser.add_argument("--validation-turns", type=int, default=3)
+    parser.add_argument("--severity-turns", type=int, default=3)
+    parser.add_argument("--checkpoint-db", default=None, help="memory 또는 SQLite 경로 (기본: 임시 파일)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # GraphClient가 생성하는 체크포인터 위치 (graph.checkpointer import 전에 설정)
+        os.environ["GRAPH_CHECKPOINT_DB"] = args.checkpoint_db or os.path.join(tmp, "checkpoints.db")
+        report = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    print(f"sessions={report['sessions']} completed={report['completed']} turns={report['turns']} "
+          f"elapsed={report['elapsed_s']}s turns/s={report['turns_per_s']}")
+    t = report["turn_ms"]
+    print(f"turn latency ms: p50={t['p50']} p95={t['p95']} p99={t['p99']}")
+    print(f"{'span':<26}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name, row in report["spans"].items():
+        print(f"{name:<26}{row['count']:>7}{row['p50']:>10.1f}{row['p95']:>10.1f}{row['p99']:>10.1f}")
+    rss = report["rss_mb"]
+    print(f"RSS MB: start={rss['start']} warm={rss['warm']} end={rss['end']} (growth {report['rss_growth_mb']})")
+    print(f"checkpointer: {report['checkpointer']}")
+    print(f"fake LLM calls: {report['llm_calls']}")
+    for error in report["errors"]:
+        print(f"  ! {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -33,8 +33,8 @@ def main():
     # 3) 1차 검색: 증상과 비슷한 chunk 몇 개 뽑기
     hits = db.similarity_search(user_symptom, k=12)
 
-    # 4) 검색된 chunk들에서 diagnosis 메타데이터만 모아서 투표
-    diags = [h.metadata.get("diagnosis", "Unknown") for h in hits]
+    # 4) 검색된 chunk들에서 disorder 메타데이터만 모아서 투표 (rag/build_dsm_db.py가 쓰는 키)
+    diags = [h.metadata.get("disorder", "Unknown") for h in hits]
     counts = Counter(diags)
 
     # Unknown은 우선순위에서 빼고 싶으니까 제거
@@ -60,7 +60,7 @@ def main():
         raw_hits = db.similarity_search(
             f"diagnostic criteria for {diag}",
             k=10,
-            filter={"diagnosis": diag}
+            filter={"disorder": diag}
         )
 
         # 기준처럼 보이는 순서로 정렬
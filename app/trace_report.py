@@ -0,0 +1,102 @@
+# app/trace_report.py
+# 그래프 추적 span(JSONL) 집계: span 이름(node.<노드> / checkpoint.*)별 p50 / p95
+#
+#   GRAPH_TRACE=1 uvicorn api.main:app ...          # span 기록 (기본 ./.cache/traces/spans-YYYYMMDD.jsonl)
+#   python app/trace_report.py                      # 기본 디렉터리의 모든 파일 집계
+#   python app/trace_report.py .cache/traces/spans-20261019.jsonl --json
+#
+# other_ms = duration_ms - llm_ms - llm_wait_ms - retrieval_ms  (프롬프트 구성, 구조화 파싱, 요약 판단 등 노드 자체 처리 시간)
+
+import argparse
+import glob
+import json
+import os, sys
+from collections import defaultdict
+
+# 프로젝트 루트 경로 잡아주기
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from api.tracing import GRAPH_TRACE_DIR, from_otlp
+
+LABELS = {"duration_ms": "total", "llm_ms": "llm", "retrieval_ms": "rag", "other_ms": "other", "prompt_tokens": "tokens"}
+METRICS = ("duration_ms", "llm_ms", "llm_wait_ms", "retrieval_ms", "other_ms", "prompt_tokens", "prompt_chars")
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def load_spans(paths):
+    """JSONL 파일들 -> 평면 span dict 리스트 (OTLP 형식 줄은 변환, 깨진 줄은 건너뜀)"""
+    spans = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                spans.append(from_otlp(record) if "traceId" in record else record)
+    return spans
+
+
+def summarize(spans):
+    """span 이름별 건수 / 오류 수 / 지표별 p50·p95"""
+    groups = defaultdict(list)
+    for span in spans:
+        groups[span.get("name", "?")].append(span)
+
+    summary = {}
+    for name, items in sorted(groups.items()):
+        values = defaultdict(list)
+        for span in items:
+            for key in ("duration_ms", "llm_ms", "llm_wait_ms", "retrieval_ms", "prompt_tokens", "prompt_chars"):
+                values[key].append(float(span.get(key, 0) or 0))
+            if span.get("kind") == "node":
+                other = span.get("duration_ms", 0) - span.get("llm_ms", 0) - span.get("llm_wait_ms", 0) - span.get("retrieval_ms", 0)
+                values["other_ms"].append(max(0.0, float(other)))
+        summary[name] = {
+            "count": len(items),
+            "errors": sum(1 for s in items if s.get("status") == "error"),
+            **{
+                key: {"p50": round(_percentile(values[key], 0.50), 2), "p95": round(_percentile(values[key], 0.95), 2)}
+                for key in METRICS
+                if values[key] and any(values[key])
+            },
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate graph tracing spans (p50/p95 per node)")
+    parser.add_argument("files", nargs="*", help="span JSONL 파일 (기본: GRAPH_TRACE_DIR/*.jsonl)")
+    parser.add_argument("--json", action="store_true", help="집계 결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    paths = args.files or sorted(glob.glob(os.path.join(GRAPH_TRACE_DIR, "*.jsonl")))
+    if not paths:
+        print(f"span 파일이 없습니다: {GRAPH_TRACE_DIR}")
+        return
+    summary = summarize(load_spans(paths))
+
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return
+
+    columns = tuple(LABELS)
+    header = f"{'span':<26}{'count':>7}{'err':>5}" + "".join(f"{LABELS[c] + ' p50':>14}{'p95':>9}" for c in columns)
+    print(header)
+    for name, row in summary.items():
+        cells = "".join(
+            f"{row[c]['p50']:>14.1f}{row[c]['p95']:>9.1f}" if c in row else f"{'-':>14}{'-':>9}"
+            for c in columns
+        )
+        print(f"{name:<26}{row['count']:>7}{row['errors']:>5}{cells}")
+
+
+if __name__ == "__main__":
+    main()
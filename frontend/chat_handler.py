@@ -1,7 +1,9 @@
+from typing import Any, Dict, Iterator, Optional
+
 import streamlit as st
 from langchain_core.messages import HumanMessage, AIMessage
 
-from .graph_client import get_graph_client
+from .session_client import get_counseling_client
 
 def init_chat_history():
     """
@@ -19,8 +21,9 @@ def init_chat_history():
         })
     
     # 2. Graph Client 초기화 및 세션 ID 설정
+    # (COUNSELING_API_URL이 설정되어 있으면 상담 세션 API를 호출하는 thin client)
     if "graph_client" not in st.session_state:
-        st.session_state.graph_client = get_graph_client()
+        st.session_state.graph_client = get_counseling_client()
     
     if "thread_id" not in st.session_state:
         st.session_state.thread_id = st.session_state.graph_client.create_thread_id()
@@ -54,6 +57,56 @@ def process_user_input(user_input: str):
     except Exception as e:
         print(f"[ChatHandler] Error executing graph: {e}")
         st.error("상담 처리 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
+    finally:
+        _invalidate_state_snapshot()
+
+def process_user_input_stream(user_input: str) -> Iterator[Dict[str, Any]]:
+    """
+    사용자 입력을 처리하고 Graph를 스트리밍 실행 (process_user_input의 스트리밍 버전)
+    
+    Args:
+        user_input: 사용자 입력 텍스트
+    
+    Yields:
+        - {"type": "token", "text": ...}: 생성 중인 응답 텍스트 조각 (INTERNAL_DATA 제외)
+        - {"type": "message", "content": ...}: 노드가 확정한 AI 메시지 (UI 히스토리에 추가됨)
+    """
+    if not user_input:
+        return
+
+    # 1. 사용자 메시지 UI 추가
+    st.session_state.messages.append({"role": "user", "content": user_input})
+
+    # 2. Graph 스트리밍 실행
+    graph_client = st.session_state.graph_client
+    thread_id = st.session_state.thread_id
+
+    try:
+        for event in graph_client.stream_graph(user_input, thread_id):
+            if event.get("type") == "token":
+                yield event
+                continue
+
+            if event.get("type") != "update":
+                continue
+
+            # 3. 노드 단위 결과 동기화 (State -> UI)
+            values = event.get("values", {})
+            for msg in values.get("messages", []) or []:
+                if isinstance(msg, AIMessage):
+                    st.session_state.messages.append({
+                        "role": "assistant",
+                        "content": msg.content
+                    })
+                    yield {"type": "message", "content": msg.content}
+            if values.get("intake_summary_report"):
+                st.session_state.debug_intake_summary = values["intake_summary_report"]
+
+    except Exception as e:
+        print(f"[ChatHandler] Error streaming graph: {e}")
+        st.error("상담 처리 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
+    finally:
+        _invalidate_state_snapshot()
 
 def _sync_state_to_ui(state: dict):
     """
@@ -89,16 +142,39 @@ def _sync_state_to_ui(state: dict):
     if "diagnosis_result" in state: # state.py 필드명 확인 필요 (Validation 결과 등)
         st.session_state.debug_diagnosis = state.get("diagnosis_result")
 
+def get_state_snapshot_cached() -> Optional[Dict[str, Any]]:
+    """
+    현재 세션의 Graph State 스냅샷 조회 (캐시)
+    - 체크포인트 조회(graph.get_state)는 Graph가 실행될 때만 결과가 바뀌므로,
+      실행 후 _invalidate_state_snapshot()이 호출되기 전까지는 캐시된 스냅샷을 재사용한다.
+    - 사이드바 / 입력창 / 디버그 패널이 한 번의 rerun에서 여러 번 호출해도 조회는 한 번뿐.
+    """
+    if "graph_client" not in st.session_state or "thread_id" not in st.session_state:
+        return None
+
+    key = (st.session_state.thread_id, st.session_state.get("graph_state_version", 0))
+    cached = st.session_state.get("_state_snapshot_cache")
+    if cached and cached[0] == key:
+        return cached[1]
+
+    snapshot = st.session_state.graph_client.get_state_snapshot(st.session_state.thread_id)
+    st.session_state._state_snapshot_cache = (key, snapshot)
+    return snapshot
+
+
+def _invalidate_state_snapshot():
+    # Graph 실행 후 호출: 다음 조회 시 체크포인트에서 다시 읽도록
+    st.session_state.graph_state_version = st.session_state.get("graph_state_version", 0) + 1
+
+
 def get_current_stage_info():
     """
     현재 진행 중인 상담 단계 정보를 반환
     (Graph의 현재 노드 정보를 기반으로 추론)
     """
-    if "graph_client" not in st.session_state or "thread_id" not in st.session_state:
+    snapshot = get_state_snapshot_cached()
+    if snapshot is None:
         return None
-        
-    client = st.session_state.graph_client
-    snapshot = client.get_state_snapshot(st.session_state.thread_id)
     
     # 현재 대기 중인 다음 노드 확인 (next는 튜플)
     next_nodes = snapshot.get("next", [])
@@ -10,6 +10,9 @@ load_dotenv()
 
 # Gemini API 키가 설정되어 있는지 확인하고, 없으면 에러 메시지 표시
 def check_api_key():
+    # 상담 세션 API를 사용하는 경우 Gemini 호출은 API 서버에서 수행
+    if os.getenv("COUNSELING_API_URL"):
+        return True
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         st.error("⚠️ GEMINI_API_KEY가 설정되지 않았습니다. .env 파일을 확인해주세요.")
@@ -1,10 +1,14 @@
 import os  # 운영체제 다루는 기본 모듈 , .env파일 불러올때 사용함
 import json
+import time
+from typing import AsyncIterator, Iterator, Optional
 import google.generativeai as genai  # 제미나이 모델을 python에서 쓸 수 있게 해주는 공식 SDK
 from dotenv import (
     load_dotenv,
 )  # 파일 안에 적힌 환경 변수들을 프로그램 실행 시 자동으로 불러오는 역할
 from .context_handler import get_context
+from .llm_cache import cacheable, get_response_cache
+from .llm_gateway import LLM_BACKEND, LLM_DEFAULT_MODEL, get_gateway
 
 # 환경 변수 로드
 load_dotenv()
@@ -12,9 +16,10 @@ load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 # GEMINI_API_KEY가 환경 변수에 설정되어 있는지 확인
+# (LLM_BACKEND=stub이면 네트워크를 쓰지 않으므로 키 없이도 동작)
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
-else:
+elif LLM_BACKEND != "stub":
     raise ValueError(
         "GEMINI_API_KEY가 환경 변수에 설정되지 않았습니다. .env 파일을 확인해주세요."
     )
@@ -33,56 +38,324 @@ else:
 #     Gemini의 응답 텍스트
 #========================================================================================================
 
-def ask_gemini(
-    user_input: str, context: str = None, conversation_history: list = None, context_file: str = None
+def _build_prompt(
+    user_input: str, context: str = None, conversation_history: list = None, context_file: str = None,
+    conversation_summary: str = None,
 ) -> str:
-    try:
-        # 모델 초기화
-        model = genai.GenerativeModel("gemini-2.0-flash")
-
-        # 프롬프트 구성
-        prompt = user_input
-
-        # 컨텍스트 처리: context 파라미터가 없으면 파일에서 로드
-        if context is None and context_file is not None:
-            context = get_context(context_file)
-        elif context is None:
-            # 기본 context 파일 사용
-            context = get_context()
-
-        # 컨텍스트가 있으면 추가
-        if context:
-            prompt = f"""
+    # 프롬프트 구성
+    prompt = user_input
+
+    # 컨텍스트 처리: context 파라미터가 없으면 파일에서 로드
+    if context is None and context_file is not None:
+        context = get_context(context_file)
+    elif context is None:
+        # 기본 context 파일 사용
+        context = get_context()
+
+    # 컨텍스트가 있으면 추가
+    if context:
+        prompt = f"""
             다음 정보를 참고하여 사용자의 질문에 답변해주세요.
             {context}
             사용자 질문: {user_input}
             """
 
-        # 대화 히스토리가 있으면 포함
-        if conversation_history:
-            # 히스토리를 프롬프트에 포함
-            history_text = "\n".join(
-                [
-                    f"{'사용자' if msg['role'] == 'user' else '상담사'}: {msg['content']}"
-                    for msg in conversation_history[-5:]  # 최근 5개만 포함
-                ]
-            )
-            prompt = f"""
+    # 대화 히스토리가 있으면 포함 (컨텍스트 = 단계별 시스템 지시사항은 유지)
+    if conversation_history:
+        # 히스토리를 프롬프트에 포함
+        history_text = "\n".join(
+            [
+                f"{'사용자' if msg['role'] == 'user' else '상담사'}: {msg['content']}"
+                # 개수는 호출 측(graph.memory.recent_history)에서 결정: 최근 창 + 아직 요약되지 않은 메시지
+                for msg in conversation_history
+            ]
+        )
+        context_block = f"""
+            다음 정보를 참고하여 사용자의 질문에 답변해주세요.
+            {context}
+""" if context else ""
+        prompt = f"""{context_block}
             이전 대화:      
             {history_text}
 
             현재 사용자 질문: {user_input}
             """
 
-        # API 호출
-        response = model.generate_content(prompt)
+    # 히스토리보다 이전의 대화는 롤링 요약(graph.memory)으로 전달
+    if conversation_summary:
+        prompt = f"""
+            이전 상담 내용 요약:
+            {conversation_summary}
+            {prompt}"""
+
+    return prompt
+
+
+#========================================================================================================
+# LLM 응답 캐시 (frontend.llm_cache)
+# cache=True(단계가 허용)인 요청만, 모델 + 생성 설정 + 프롬프트가 완전히 같을 때 재사용
+#========================================================================================================
+
+GEMINI_MODEL = LLM_DEFAULT_MODEL
+
+
+def _cache_key(prompt: str, generation_config: dict = None, cache: bool = False) -> Optional[str]:
+    response_cache = get_response_cache()
+    if response_cache is None or not cacheable(generation_config, cache):
+        return None
+    return response_cache.key(GEMINI_MODEL, generation_config, prompt)
+
+
+def _cache_get(key: Optional[str]) -> Optional[str]:
+    return get_response_cache().get(key) if key else None
+
+
+def _cache_put(key: Optional[str], text: str, started: float):
+    # 오류 응답은 저장하지 않음
+    if key and text and not text.startswith("오류가 발생했습니다"):
+        get_response_cache().put(key, text, time.perf_counter() - started)
+
+
+def ask_gemini(
+    user_input: str, context: str = None, conversation_history: list = None, context_file: str = None,
+    conversation_summary: str = None, cache: bool = False,
+) -> str:
+    try:
+        prompt = _build_prompt(user_input, context, conversation_history, context_file, conversation_summary)
+
+        key = _cache_key(prompt, cache=cache)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+        # API 호출 (게이트웨이: rate limit / 재시도 / hedge / circuit breaker)
+        started = time.perf_counter()
+        text = get_gateway().generate(prompt, GEMINI_MODEL)
+        _cache_put(key, text, started)
 
-        return response.text
+        return text
 
     except Exception as e:
         return f"오류가 발생했습니다: {str(e)}"
 
 
+async def ask_gemini_async(
+    user_input: str, context: str = None, conversation_history: list = None, context_file: str = None,
+    conversation_summary: str = None, cache: bool = False,
+) -> str:
+    # ask_gemini의 async 버전
+    try:
+        prompt = _build_prompt(user_input, context, conversation_history, context_file, conversation_summary)
+
+        key = _cache_key(prompt, cache=cache)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        text = await get_gateway().agenerate(prompt, GEMINI_MODEL)
+        _cache_put(key, text, started)
+
+        return text
+
+    except Exception as e:
+        return f"오류가 발생했습니다: {str(e)}"
+
+
+#========================================================================================================
+# ask_gemini_json()함수 정의 / JSON 모드 호출
+# response_schema(OpenAPI subset dict)를 지정하여 스키마를 따르는 JSON 문자열만 반환받습니다.
+# (graph.structured의 INTERNAL_DATA 복구 요청에 사용, 실패 시 "" 반환)
+#========================================================================================================
+
+def _json_config(response_schema: dict) -> dict:
+    return {
+        "response_mime_type": "application/json",
+        "response_schema": response_schema,
+        "temperature": 0,
+    }
+
+
+def ask_gemini_json(prompt: str, response_schema: dict) -> str:
+    try:
+        config = _json_config(response_schema)
+        # 복구 프롬프트에는 대화 내용이 들어가므로 응답 캐시를 쓰지 않음
+        return get_gateway().generate(prompt, GEMINI_MODEL, generation_config=config)
+    except Exception as e:
+        print(f"[Gemini API] JSON 모드 호출 오류: {e}")
+        return ""
+
+
+async def ask_gemini_json_async(prompt: str, response_schema: dict) -> str:
+    try:
+        config = _json_config(response_schema)
+        return await get_gateway().agenerate(prompt, GEMINI_MODEL, generation_config=config)
+    except Exception as e:
+        print(f"[Gemini API] JSON 모드 호출 오류: {e}")
+        return ""
+
+
+#========================================================================================================
+# ask_gemini_stream()함수 정의 / ask_gemini의 스트리밍 버전
+# 응답 전체를 기다리지 않고, 생성되는 텍스트 조각(chunk)을 순서대로 yield 합니다.
+# (인자는 ask_gemini와 동일)
+#========================================================================================================
+
+def ask_gemini_stream(
+    user_input: str, context: str = None, conversation_history: list = None, context_file: str = None,
+    conversation_summary: str = None, cache: bool = False,
+) -> Iterator[str]:
+    try:
+        prompt = _build_prompt(user_input, context, conversation_history, context_file, conversation_summary)
+
+        key = _cache_key(prompt, cache=cache)
+        cached = _cache_get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        started = time.perf_counter()
+        parts = []
+        for text in get_gateway().stream(prompt, GEMINI_MODEL):
+            parts.append(text)
+            yield text
+        _cache_put(key, "".join(parts), started)
+
+    except Exception as e:
+        yield f"오류가 발생했습니다: {str(e)}"
+
+
+#========================================================================================================
+# ask_gemini_stream_async()함수 정의 / ask_gemini_stream의 async 버전
+# 게이트웨이의 async 경로(generate_content_async)를 사용하므로 응답을 기다리는 동안 이벤트 루프(다른 세션 요청)를 막지 않습니다.
+# (인자는 ask_gemini와 동일)
+#========================================================================================================
+
+async def ask_gemini_stream_async(
+    user_input: str, context: str = None, conversation_history: list = None, context_file: str = None,
+    conversation_summary: str = None, cache: bool = False,
+) -> AsyncIterator[str]:
+    try:
+        prompt = _build_prompt(user_input, context, conversation_history, context_file, conversation_summary)
+
+        key = _cache_key(prompt, cache=cache)
+        cached = _cache_get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        started = time.perf_counter()
+        parts = []
+        async for text in get_gateway().astream(prompt, GEMINI_MODEL):
+            parts.append(text)
+            yield text
+        _cache_put(key, "".join(parts), started)
+
+    except Exception as e:
+        yield f"오류가 발생했습니다: {str(e)}"
+
+
+INTERNAL_DATA_MARKER = "---INTERNAL_DATA---"
+
+
+class VisibleTextFilter:
+    """
+    스트리밍 응답에서 사용자에게 보여줄 부분만 통과시키는 필터
+    - `---INTERNAL_DATA---` 구분선이 나오면 그 뒤는 모두 버린다.
+    - 구분선이 chunk 경계에 걸쳐 들어올 수 있으므로, 구분선 길이만큼의 꼬리는 다음 chunk까지 보류한다.
+    """
+
+    def __init__(self, marker: str = INTERNAL_DATA_MARKER):
+        self.marker = marker
+        self._pending = ""
+        self._done = False
+
+    def feed(self, chunk: str) -> str:
+        """chunk를 받아 지금 바로 보여줘도 되는 텍스트를 반환"""
+        if self._done:
+            return ""
+        buf = self._pending + chunk
+        idx = buf.find(self.marker)
+        if idx >= 0:
+            self._done = True
+            self._pending = ""
+            return buf[:idx].rstrip()
+        # 구분선의 앞부분일 수 있는 꼬리만 남기고 내보냄
+        keep = len(self.marker) - 1
+        for i in range(min(keep, len(buf)), 0, -1):
+            if self.marker.startswith(buf[-i:]):
+                self._pending = buf[-i:]
+                return buf[:-i]
+        self._pending = ""
+        return buf
+
+    def flush(self) -> str:
+        """스트림 종료 시 보류 중이던 꼬리 반환"""
+        if self._done:
+            return ""
+        out, self._pending = self._pending, ""
+        return out
+
+
+def _get_stream_writer():
+    # LangGraph custom stream writer (그래프 밖에서 호출되거나 구버전이면 None)
+    try:
+        from langgraph.config import get_stream_writer
+        return get_stream_writer()
+    except Exception:
+        return None
+
+
+def ask_gemini_streaming(
+    user_input: str, context: str = None, conversation_history: list = None, context_file: str = None,
+    conversation_summary: str = None, cache: bool = False,
+) -> str:
+    """
+    그래프 노드용: ask_gemini와 같이 전체 응답 텍스트를 반환하되,
+    생성 도중의 사용자 표시용 텍스트를 LangGraph custom stream으로 내보낸다.
+    (stream_mode에 "custom"이 없으면 writer는 아무 것도 하지 않음)
+    """
+    writer = _get_stream_writer()
+    visible = VisibleTextFilter()
+    parts = []
+
+    for chunk in ask_gemini_stream(user_input, context, conversation_history, context_file, conversation_summary, cache):
+        parts.append(chunk)
+        text = visible.feed(chunk)
+        if text and writer:
+            writer({"type": "token", "text": text})
+
+    tail = visible.flush()
+    if tail and writer:
+        writer({"type": "token", "text": tail})
+
+    return "".join(parts)
+
+
+async def ask_gemini_streaming_async(
+    user_input: str, context: str = None, conversation_history: list = None, context_file: str = None,
+    conversation_summary: str = None, cache: bool = False,
+) -> str:
+    """
+    ask_gemini_streaming의 async 버전 (그래프를 ainvoke/astream으로 실행할 때 사용)
+    """
+    writer = _get_stream_writer()
+    visible = VisibleTextFilter()
+    parts = []
+
+    async for chunk in ask_gemini_stream_async(user_input, context, conversation_history, context_file, conversation_summary, cache):
+        parts.append(chunk)
+        text = visible.feed(chunk)
+        if text and writer:
+            writer({"type": "token", "text": text})
+
+    tail = visible.flush()
+    if tail and writer:
+        writer({"type": "token", "text": tail})
+
+    return "".join(parts)
+
+
 #========================================================================================================
 # ask_gemini_with_stage()함수 정의 / 단계별 프롬프트와 컨텍스트를 사용하여 Gemini API 호출
 # 단계별 상담 프로세스에서 사용하는 함수
@@ -229,9 +502,6 @@ def ask_gemini_with_stage(
         previous_stage_data: 이전 단계의 출력 데이터 (다음 단계 입력으로 활용)
     """
     try:
-        # 모델 초기화
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        
         # Context를 문자열로 변환 (여러 파일이 통합된 경우)
         context_str = ""
         if context_data:
@@ -337,13 +607,13 @@ Assistant:"""
         print(f"[Gemini API] 프롬프트 길이: {len(full_prompt)} 문자")
         print(f"[Gemini API] API 호출 시작...")
         
-        # API 호출
-        response = model.generate_content(full_prompt)
+        # API 호출 (게이트웨이 경유)
+        text = get_gateway().generate(full_prompt, GEMINI_MODEL)
         
-        print(f"[Gemini API] 응답 수신 완료, 길이: {len(response.text)} 문자")
-        print(f"[Gemini API] 응답 미리보기: {response.text[:200]}...")
+        print(f"[Gemini API] 응답 수신 완료, 길이: {len(text)} 문자")
+        print(f"[Gemini API] 응답 미리보기: {text[:200]}...")
         
-        return response.text
+        return text
 
     except Exception as e:
         print(f"[Gemini API] 오류 발생: {type(e).__name__}: {str(e)}")
@@ -1,11 +1,12 @@
 import uuid
-from typing import Optional, Any, Dict, Generator
-from langgraph.checkpoint.memory import MemorySaver
+from typing import Optional, Any, Dict, Generator, AsyncGenerator
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph.state import CompiledStateGraph
 from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import HumanMessage
 
 from graph.graph_builder import build_graph
+from graph.checkpointer import create_checkpointer
 from graph.state import CounselingState
 
 class GraphClient:
@@ -20,7 +21,7 @@ class GraphClient:
     """
     _instance = None
     _graph: Optional[CompiledStateGraph] = None
-    _checkpointer: Optional[MemorySaver] = None
+    _checkpointer: Optional[BaseCheckpointSaver] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -30,14 +31,14 @@ class GraphClient:
 
     def _initialize(self):
         """그래프 및 체크포인터 초기화"""
-        # In-memory checkpointer (세션 간 상태 저장)
-        # 실제 프로덕션에서는 Redis, Postgres 등을 사용할 수 있음
-        self._checkpointer = MemorySaver()
+        # 세션 간 상태 저장용 체크포인터
+        # 기본은 SQLite 파일(WAL, 배치 쓰기, 최신 N개 보관) / GRAPH_CHECKPOINT_DB=memory면 MemorySaver
+        self._checkpointer = create_checkpointer()
         
         # 체크포인터를 주입하여 그래프 빌드 (컴파일)
         self._graph = build_graph(checkpointer=self._checkpointer)
         
-        print("[GraphClient] Graph initialized with MemorySaver")
+        print(f"[GraphClient] Graph initialized with {type(self._checkpointer).__name__}")
 
     @property
     def graph(self) -> CompiledStateGraph:
@@ -93,7 +94,9 @@ class GraphClient:
             thread_id: 세션 ID
             
         Yields:
-            Dict: 그래프 실행 중 발생하는 이벤트/청크 (노드 업데이트 등)
+            Dict: 그래프 실행 중 발생하는 이벤트
+                - {"type": "token", "text": ...}: LLM이 생성 중인 사용자 표시용 텍스트 조각
+                - {"type": "update", "node": ..., "values": ...}: 노드 실행 완료 후 State 업데이트
         """
         config = self.get_config(thread_id)
         
@@ -102,8 +105,41 @@ class GraphClient:
             "messages": [HumanMessage(content=user_input)]
         }
         
-        # 그래프 스트리밍 실행 (모든 업데이트 수신)
-        return self.graph.stream(initial_state, config=config, stream_mode="updates")
+        # custom: 노드에서 get_stream_writer로 내보낸 토큰 / updates: 노드별 State 업데이트
+        for mode, chunk in self.graph.stream(initial_state, config=config, stream_mode=["custom", "updates"]):
+            if mode == "custom":
+                yield chunk
+            elif mode == "updates":
+                for node, values in (chunk or {}).items():
+                    yield {"type": "update", "node": node, "values": values or {}}
+
+    async def ainvoke_graph(self, user_input: str, thread_id: str) -> CounselingState:
+        """
+        invoke_graph의 async 버전
+        노드의 async 구현(Gemini generate_content_async 등)을 사용하므로
+        한 이벤트 루프에서 여러 세션을 동시에 처리할 수 있음
+        """
+        config = self.get_config(thread_id)
+        initial_state = {
+            "messages": [HumanMessage(content=user_input)]
+        }
+        return await self.graph.ainvoke(initial_state, config=config)
+
+    async def astream_graph(self, user_input: str, thread_id: str) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        stream_graph의 async 버전 (이벤트 형식은 stream_graph와 동일)
+        """
+        config = self.get_config(thread_id)
+        initial_state = {
+            "messages": [HumanMessage(content=user_input)]
+        }
+
+        async for mode, chunk in self.graph.astream(initial_state, config=config, stream_mode=["custom", "updates"]):
+            if mode == "custom":
+                yield chunk
+            elif mode == "updates":
+                for node, values in (chunk or {}).items():
+                    yield {"type": "update", "node": node, "values": values or {}}
 
     def get_state_snapshot(self, thread_id: str) -> Dict[str, Any]:
         """
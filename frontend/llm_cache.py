@@ -0,0 +1,139 @@
+# LLM 응답 캐시 모듈
+# 모델 + 생성 설정 + 전체 프롬프트가 완전히 같은 요청의 응답을 로컬 디스크(SQLite)에 저장해 재사용한다.
+# 호출하는 단계가 명시적으로 허용한(cache=True) 요청만 캐시한다.
+# 캐시는 디스크에 남고 세션 / 사용자 간에 공유되므로, 사용자 발화로 만든 프롬프트는 허용하지 않는다.
+# (temperature=0이라도 JSON 복구 요청처럼 대화 내용이 들어간 프롬프트는 캐시하지 않음)
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from api.metrics import LLM_CACHE_SAVED_SECONDS, record_cache
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "1") != "0"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "./.cache/llm_responses.db")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))        # 초
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "64"))
+
+CACHE_NAME = "llm_response"  # api.metrics 캐시 라벨
+
+
+def cacheable(generation_config: Optional[Dict[str, Any]], opt_in: bool = False) -> bool:
+    """단계가 캐시를 허용한 경우만 True (사용자 입력이 들어가지 않는 고정 프롬프트)"""
+    return opt_in
+
+
+class ResponseCache:
+    """
+    디스크 기반 LLM 응답 캐시
+    - key: sha256(model, generation config, prompt)
+    - ttl초가 지난 항목은 조회 시 무시/삭제
+    - 전체 크기가 max_bytes를 넘으면 마지막 사용 시각이 오래된 항목부터 삭제 (90%까지)
+    - 적중 시 원래 생성에 걸렸던 시간을 LLM_CACHE_SAVED_SECONDS에 누적
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl: float = LLM_CACHE_TTL, max_bytes: int = int(LLM_CACHE_MAX_MB * 1024 * 1024)):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, "
+                "latency REAL NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+            self._conn.commit()
+            self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def key(model: str, generation_config: Optional[Dict[str, Any]], prompt: str) -> str:
+        payload = json.dumps(
+            {"model": model, "config": generation_config or {}, "prompt": prompt},
+            ensure_ascii=False, sort_keys=True, default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, size, latency, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl and now - row[3] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._bytes -= row[1]
+                row = None
+            if row is not None:
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+        record_cache(CACHE_NAME, row is not None)
+        if row is None:
+            return None
+        LLM_CACHE_SAVED_SECONDS.inc(row[2])
+        return row[0]
+
+    def put(self, key: str, response: str, latency: float):
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, latency, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, response, size, latency, now, now),
+            )
+            self._bytes += size - (old[0] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict_locked(int(self.max_bytes * 0.9))
+            self._conn.commit()
+
+    def _evict_locked(self, target: int):
+        # 만료 항목 먼저, 그래도 크면 오래 사용하지 않은 순서로 삭제
+        if self.ttl:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if self._bytes <= target:
+            return
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            victims.append((key,))
+            freed += size
+            if self._bytes - freed <= target:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._bytes -= freed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"entries": entries, "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """전역 캐시 인스턴스 (LLM_CACHE=0이면 None)"""
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
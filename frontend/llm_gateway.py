@@ -0,0 +1,713 @@
+# LLM 게이트웨이 모듈
+# 모든 Gemini 호출이 거쳐 가는 단일 진입점.
+# - 모델 클라이언트 재사용 (모델명별 GenerativeModel 1개)
+# - 토큰 버킷으로 분당 요청 수(RPM) / 토큰 수(TPM) 제한
+# - 일시적 오류(429/5xx/timeout)는 jitter가 있는 지수 백오프로 재시도
+# - 최근 지연시간의 p95를 넘기면 같은 요청을 한 번 더 보내고(hedge) 먼저 끝난 응답 사용
+#   (비스트리밍은 전체 응답 시간, 스트리밍은 첫 chunk까지의 시간 기준)
+# - 연속 실패 시 circuit breaker가 열려 일정 시간 동안 즉시 실패
+# - backend는 교체 가능 (LLM_BACKEND=stub 이면 네트워크 없이 동작하는 로컬 stub)
+
+import asyncio
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FuturesTimeout, wait
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional
+
+from api import tracing
+from api.metrics import LLM_CIRCUIT_OPEN, LLM_LATENCY, LLM_REQUESTS
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")          # gemini / stub
+LLM_DEFAULT_MODEL = os.getenv("LLM_MODEL", "gemini-2.0-flash")
+LLM_RPM = float(os.getenv("LLM_RPM", "1000"))
+LLM_TPM = float(os.getenv("LLM_TPM", "1000000"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))         # 요청 1건 timeout (초)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_HEDGE = os.getenv("LLM_HEDGE", "1") != "0"
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "1.0"))  # p95가 이보다 작아도 이 시간은 기다림
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_RESET = float(os.getenv("LLM_BREAKER_RESET", "30"))
+
+
+class LLMGatewayError(RuntimeError):
+    """게이트웨이에서 발생하는 오류의 기본 클래스"""
+
+
+class CircuitOpenError(LLMGatewayError):
+    """circuit breaker가 열려 있어 요청을 보내지 않음"""
+
+
+# 재시도할 일시적 오류 (google.api_core.exceptions 클래스명 / HTTP 코드 기준)
+_TRANSIENT_NAMES = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "Aborted", "Unknown",
+}
+_TRANSIENT_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, (TimeoutError, ConnectionError, asyncio.TimeoutError, FuturesTimeout)):
+        return True
+    if type(exc).__name__ in _TRANSIENT_NAMES:
+        return True
+    code = getattr(exc, "code", None)
+    return isinstance(code, int) and code in _TRANSIENT_CODES
+
+
+def estimate_tokens(prompt: str) -> int:
+    # 정확한 토큰 수 대신 문자 수 기반 근사치 (한국어/영어 혼합 기준 약 3자당 1토큰)
+    return max(1, len(prompt) // 3)
+
+
+# -----------------------------
+# 토큰 버킷 / circuit breaker
+# -----------------------------
+class TokenBucket:
+    """
+    분당 per_minute 단위를 허용하는 토큰 버킷 (예약 방식)
+    reserve()는 필요한 만큼 미리 차감하고 기다려야 할 시간을 반환한다. (잔량이 음수면 대기열)
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = max(1.0, per_minute)
+        self.rate = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def peek(self, amount: float = 1.0) -> float:
+        """reserve()와 같은 대기 시간을 계산하되 차감하지 않음"""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            tokens = min(self.capacity, self._tokens + (time.monotonic() - self._updated) * self.rate)
+            return 0.0 if tokens >= amount else (amount - tokens) / self.rate
+
+
+class CircuitBreaker:
+    """연속 failure_threshold번 실패하면 reset_timeout초 동안 open, 이후 한 건만 시험(half-open)"""
+
+    def __init__(self, failure_threshold: int = LLM_BREAKER_THRESHOLD, reset_timeout: float = LLM_BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = "half_open"
+                return True
+            if self.state == "half_open":
+                # 시험 요청이 끝날 때까지 다른 요청은 막음
+                return False
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+        LLM_CIRCUIT_OPEN.set(0)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                LLM_CIRCUIT_OPEN.set(1)
+
+    def release(self):
+        """
+        성공/실패로 판단할 수 없이 끝난 요청 (비일시적 오류, 중간에 닫힌 스트림, 취소)
+        시험(half-open) 요청이었다면 슬롯을 돌려줘서 다음 요청이 바로 다시 시험하게 함
+        """
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+                self._opened_at = time.monotonic() - self.reset_timeout
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+class GeminiBackend:
+    """google-generativeai 호출 (모델명별 GenerativeModel을 한 번만 만들어 재사용)"""
+
+    def __init__(self):
+        import google.generativeai as genai
+        self._genai = genai
+        self._models: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _model(self, name: str):
+        model = self._models.get(name)
+        if model is None:
+            with self._lock:
+                model = self._models.get(name)
+                if model is None:
+                    model = self._models[name] = self._genai.GenerativeModel(name)
+        return model
+
+    def _config(self, generation_config: Optional[dict]):
+        return self._genai.GenerationConfig(**generation_config) if generation_config else None
+
+    def generate(self, model: str, prompt: str, generation_config: Optional[dict], timeout: float) -> str:
+        response = self._model(model).generate_content(
+            prompt, generation_config=self._config(generation_config), request_options={"timeout": timeout}
+        )
+        return response.text
+
+    async def agenerate(self, model: str, prompt: str, generation_config: Optional[dict], timeout: float) -> str:
+        response = await self._model(model).generate_content_async(
+            prompt, generation_config=self._config(generation_config), request_options={"timeout": timeout}
+        )
+        return response.text
+
+    def stream(self, model: str, prompt: str, generation_config: Optional[dict], timeout: float) -> Iterator[str]:
+        for chunk in self._model(model).generate_content(
+            prompt, generation_config=self._config(generation_config), stream=True, request_options={"timeout": timeout}
+        ):
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+
+    async def astream(self, model: str, prompt: str, generation_config: Optional[dict], timeout: float) -> AsyncIterator[str]:
+        response = await self._model(model).generate_content_async(
+            prompt, generation_config=self._config(generation_config), stream=True, request_options={"timeout": timeout}
+        )
+        async for chunk in response:
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+
+
+def _default_stub_responder(prompt: str, generation_config: Optional[dict]) -> str:
+    if (generation_config or {}).get("response_mime_type") == "application/json":
+        return "{}"
+    last_line = next((line.strip() for line in reversed(prompt.splitlines()) if line.strip()), "")
+    return f"[stub] {last_line[:200]}"
+
+
+class StubBackend:
+    """
+    네트워크 없이 동작하는 로컬 backend (테스트 / 부하 테스트용)
+    - responder(prompt, generation_config) -> 응답 텍스트
+    - latency초 지연 (jitter: ±latency_jitter 비율), fail_rate 확률로 일시적 오류(ConnectionError) 발생
+    - latency_sampler(random.Random) -> 초 를 주면 latency / latency_jitter 대신 해당 분포에서 지연을 뽑음
+    - 스트리밍은 응답을 chunk_size 글자씩 나눠서 반환
+    """
+
+    def __init__(
+        self,
+        responder: Callable[[str, Optional[dict]], str] = _default_stub_responder,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        fail_rate: float = 0.0,
+        chunk_size: int = 16,
+        seed: Optional[int] = None,
+        latency_sampler: Optional[Callable[[random.Random], float]] = None,
+    ):
+        self.responder = responder
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.latency_sampler = latency_sampler
+        self.fail_rate = fail_rate
+        self.chunk_size = chunk_size
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _plan(self) -> float:
+        with self._lock:
+            self.calls += 1
+            if self.fail_rate and self._random.random() < self.fail_rate:
+                raise ConnectionError("stub backend: injected transient failure")
+            if self.latency_sampler is not None:
+                return max(0.0, self.latency_sampler(self._random))
+            jitter = self._random.uniform(-self.latency_jitter, self.latency_jitter) if self.latency_jitter else 0.0
+        return max(0.0, self.latency * (1 + jitter))
+
+    def _chunks(self, text: str):
+        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)] or [""]
+
+    def generate(self, model, prompt, generation_config, timeout) -> str:
+        time.sleep(self._plan())
+        return self.responder(prompt, generation_config)
+
+    async def agenerate(self, model, prompt, generation_config, timeout) -> str:
+        await asyncio.sleep(self._plan())
+        return self.responder(prompt, generation_config)
+
+    def stream(self, model, prompt, generation_config, timeout) -> Iterator[str]:
+        delay = self._plan()
+        chunks = self._chunks(self.responder(prompt, generation_config))
+        for chunk in chunks:
+            time.sleep(delay / len(chunks))
+            yield chunk
+
+    async def astream(self, model, prompt, generation_config, timeout) -> AsyncIterator[str]:
+        delay = self._plan()
+        chunks = self._chunks(self.responder(prompt, generation_config))
+        for chunk in chunks:
+            await asyncio.sleep(delay / len(chunks))
+            yield chunk
+
+
+# -----------------------------
+# Gateway
+# -----------------------------
+# hedge 요청용 스레드 풀 (sync 호출)
+_HEDGE_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-hedge")
+
+
+class LLMGateway:
+    """
+    backend 앞단의 공통 정책 (rate limit / retry / hedge / circuit breaker / metrics)
+    실패 시 마지막 오류를 그대로 raise (CircuitOpenError 포함)
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        default_model: str = LLM_DEFAULT_MODEL,
+        rpm: float = LLM_RPM,
+        tpm: float = LLM_TPM,
+        timeout: float = LLM_TIMEOUT,
+        max_retries: int = LLM_MAX_RETRIES,
+        hedge: bool = LLM_HEDGE,
+        hedge_min_delay: float = LLM_HEDGE_MIN_DELAY,
+        breaker: Optional[CircuitBreaker] = None,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 8.0,
+    ):
+        self.backend = backend if backend is not None else (StubBackend() if LLM_BACKEND == "stub" else GeminiBackend())
+        self.default_model = default_model
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        # hedge 기준 p95 계산용 최근 지연시간 (비스트리밍: 전체 응답, 스트리밍: 첫 chunk까지)
+        self._latencies: Dict[str, deque] = {"generate": deque(maxlen=200), "stream": deque(maxlen=200)}
+        self._hedge_lock = threading.Lock()
+
+    # ---- 공통 정책 ----
+    def _wait_time(self, tokens: int) -> float:
+        return max(self.requests.reserve(1), self.tokens.reserve(tokens))
+
+    def _reserve_hedge(self, tokens: int) -> bool:
+        # hedge는 한도가 남아 있을 때만 보냄: 기다려야 하면 차감하지 않고 False
+        with self._hedge_lock:
+            if self.requests.peek(1) > 0 or self.tokens.peek(tokens) > 0:
+                return False
+            self._wait_time(tokens)
+            return True
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: [0, min(cap, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def _admit(self):
+        if not self.breaker.allow():
+            LLM_REQUESTS.inc(outcome="circuit_open")
+            raise CircuitOpenError("LLM circuit breaker is open")
+
+    def _failed(self, exc: BaseException, attempt: int, retryable: bool = True) -> Optional[float]:
+        # 재시도하면 대기 시간, 아니면 None
+        # 허용된 요청은 모두 breaker에 결과를 남김 (안 그러면 half-open 시험이 끝나지 않아 계속 막힘)
+        if not is_transient(exc):
+            self.breaker.release()
+            LLM_REQUESTS.inc(outcome="error")
+            return None
+        self.breaker.record_failure()
+        if not retryable or attempt >= self.max_retries:
+            LLM_REQUESTS.inc(outcome="error")
+            return None
+        LLM_REQUESTS.inc(outcome="retry")
+        return self._backoff(attempt)
+
+    def _succeeded(self, elapsed: float, kind: str, record_latency: bool = True):
+        self.breaker.record_success()
+        if record_latency:
+            self._latencies[kind].append(elapsed)
+        LLM_LATENCY.observe(elapsed, kind=kind)
+
+    def _first_chunk(self, elapsed: float):
+        self._latencies["stream"].append(elapsed)
+        LLM_LATENCY.observe(elapsed, kind="stream_first_chunk")
+        LLM_REQUESTS.inc(outcome="ok")
+
+    @staticmethod
+    def _trace(prompt: str, tokens: int, elapsed: float, wait: float):
+        # 현재 노드 span에 프롬프트 크기와 LLM 지연 누적 (api.tracing)
+        tracing.add(llm_calls=1, prompt_chars=len(prompt), prompt_tokens=tokens, llm_ms=elapsed * 1000, llm_wait_ms=wait * 1000)
+
+    def hedge_delay(self, kind: str = "generate") -> Optional[float]:
+        """hedge 요청을 보낼 시점 (kind별 최근 p95, 표본이 20개 미만이면 None = hedge 안 함)"""
+        latencies = self._latencies[kind]
+        if not self.hedge or len(latencies) < 20:
+            return None
+        ordered = sorted(latencies)
+        return max(self.hedge_min_delay, ordered[int(len(ordered) * 0.95) - 1])
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "breaker": self.breaker.state,
+            "hedge_delay": self.hedge_delay(),
+            "stream_hedge_delay": self.hedge_delay("stream"),
+            "samples": {kind: len(latencies) for kind, latencies in self._latencies.items()},
+        }
+
+    # ---- 비스트리밍 ----
+    def _hedged(self, call: Callable[[], str], tokens: int) -> str:
+        delay = self.hedge_delay()
+        if delay is None:
+            return call()
+        first = _HEDGE_POOL.submit(call)
+        try:
+            return first.result(timeout=delay)
+        except FuturesTimeout:
+            pass
+        # 느린 요청: 한도 안에서 같은 요청을 한 번 더 보내고 먼저 성공한 응답 사용
+        if not self._reserve_hedge(tokens):
+            return first.result()
+        LLM_REQUESTS.inc(outcome="hedge")
+        second = _HEDGE_POOL.submit(call)
+        done, pending = wait([first, second], return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+        for future in pending:
+            return future.result()
+        return first.result()
+
+    def generate(self, prompt: str, model: Optional[str] = None, generation_config: Optional[dict] = None) -> str:
+        model = model or self.default_model
+        tokens = estimate_tokens(prompt)
+        attempt = 0
+        while True:
+            self._admit()
+            wait = self._wait_time(tokens)
+            time.sleep(wait)
+            started = time.perf_counter()
+            try:
+                text = self._hedged(lambda: self.backend.generate(model, prompt, generation_config, self.timeout), tokens)
+            except Exception as e:
+                delay = self._failed(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # 취소 / 인터럽트: 결과 없이 끝난 요청
+                self.breaker.release()
+                raise
+            elapsed = time.perf_counter() - started
+            self._succeeded(elapsed, "generate")
+            self._trace(prompt, tokens, elapsed, wait)
+            return text
+
+    async def _ahedged(self, call: Callable[[], "asyncio.Future"], tokens: int) -> str:
+        delay = self.hedge_delay()
+        if delay is None:
+            return await call()
+        first = asyncio.ensure_future(call())
+        done, _ = await asyncio.wait([first], timeout=delay)
+        if done or not self._reserve_hedge(tokens):
+            return await first
+        LLM_REQUESTS.inc(outcome="hedge")
+        second = asyncio.ensure_future(call())
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    return task.result()
+                error = task.exception()
+        raise error
+
+    async def agenerate(self, prompt: str, model: Optional[str] = None, generation_config: Optional[dict] = None) -> str:
+        model = model or self.default_model
+        tokens = estimate_tokens(prompt)
+        attempt = 0
+        while True:
+            self._admit()
+            wait = self._wait_time(tokens)
+            await asyncio.sleep(wait)
+            started = time.perf_counter()
+            try:
+                text = await self._ahedged(lambda: self.backend.agenerate(model, prompt, generation_config, self.timeout), tokens)
+            except Exception as e:
+                delay = self._failed(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # 취소 / 인터럽트: 결과 없이 끝난 요청
+                self.breaker.release()
+                raise
+            elapsed = time.perf_counter() - started
+            self._succeeded(elapsed, "generate")
+            self._trace(prompt, tokens, elapsed, wait)
+            return text
+
+    # ---- 스트리밍 (첫 chunk 전에 실패한 경우만 재시도) ----
+    # 첫 chunk가 최근 p95 안에 오지 않으면 같은 요청을 한 번 더 보내고, 먼저 첫 chunk를 보낸 스트림만 끝까지 사용
+    def _hedged_stream(self, open_stream: Callable[[], Iterator[str]], tokens: int) -> Iterator[str]:
+        delay = self.hedge_delay("stream")
+        if delay is None:
+            yield from open_stream()
+            return
+
+        events: "queue.Queue" = queue.Queue()
+        stops = []
+
+        def pump(index: int, stop: threading.Event):
+            stream = None
+            try:
+                stream = open_stream()
+                for chunk in stream:
+                    if stop.is_set():
+                        break
+                    events.put((index, "chunk", chunk))
+                else:
+                    events.put((index, "end", None))
+            except Exception as e:
+                events.put((index, "error", e))
+            finally:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+
+        def start():
+            stop = threading.Event()
+            stops.append(stop)
+            threading.Thread(target=pump, args=(len(stops) - 1, stop), name="llm-hedge-stream", daemon=True).start()
+
+        start()
+        deadline = time.monotonic() + delay
+        hedge_pending = True
+        failed = 0
+        winner = None
+        try:
+            while winner is None:
+                try:
+                    timeout = max(0.0, deadline - time.monotonic()) if hedge_pending else None
+                    index, kind, value = events.get(timeout=timeout)
+                except queue.Empty:
+                    hedge_pending = False
+                    if self._reserve_hedge(tokens):
+                        LLM_REQUESTS.inc(outcome="hedge")
+                        start()
+                    continue
+                if kind == "error":
+                    failed += 1
+                    # 살아 있는 스트림이 없으면 (hedge를 보내기 전 실패 포함) 마지막 오류로 재시도 판단
+                    if failed == len(stops):
+                        raise value
+                    continue
+                winner = index
+                for i, stop in enumerate(stops):
+                    if i != winner:
+                        stop.set()
+                if kind == "end":
+                    return
+                yield value
+
+            while True:
+                index, kind, value = events.get()
+                if index != winner:
+                    continue
+                if kind == "chunk":
+                    yield value
+                elif kind == "end":
+                    return
+                else:
+                    raise value
+        finally:
+            for stop in stops:
+                stop.set()
+
+    async def _ahedged_stream(self, open_stream: Callable[[], AsyncIterator[str]], tokens: int) -> AsyncIterator[str]:
+        delay = self.hedge_delay("stream")
+        if delay is None:
+            async for chunk in open_stream():
+                yield chunk
+            return
+
+        events: "asyncio.Queue" = asyncio.Queue()
+        tasks = []
+
+        async def pump(index: int):
+            stream = None
+            try:
+                stream = open_stream()
+                async for chunk in stream:
+                    await events.put((index, "chunk", chunk))
+                await events.put((index, "end", None))
+            except Exception as e:
+                await events.put((index, "error", e))
+            finally:
+                if stream is not None:
+                    await stream.aclose()
+
+        def start():
+            tasks.append(asyncio.ensure_future(pump(len(tasks))))
+
+        start()
+        deadline = time.monotonic() + delay
+        hedge_pending = True
+        failed = 0
+        winner = None
+        try:
+            while winner is None:
+                try:
+                    if hedge_pending:
+                        index, kind, value = await asyncio.wait_for(events.get(), max(0.0, deadline - time.monotonic()))
+                    else:
+                        index, kind, value = await events.get()
+                except asyncio.TimeoutError:
+                    hedge_pending = False
+                    if self._reserve_hedge(tokens):
+                        LLM_REQUESTS.inc(outcome="hedge")
+                        start()
+                    continue
+                if kind == "error":
+                    failed += 1
+                    if failed == len(tasks):
+                        raise value
+                    continue
+                winner = index
+                for i, task in enumerate(tasks):
+                    if i != winner:
+                        task.cancel()
+                if kind == "end":
+                    return
+                yield value
+
+            while True:
+                index, kind, value = await events.get()
+                if index != winner:
+                    continue
+                if kind == "chunk":
+                    yield value
+                elif kind == "end":
+                    return
+                else:
+                    raise value
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stream(self, prompt: str, model: Optional[str] = None, generation_config: Optional[dict] = None) -> Iterator[str]:
+        model = model or self.default_model
+        tokens = estimate_tokens(prompt)
+        attempt = 0
+        while True:
+            self._admit()
+            wait = self._wait_time(tokens)
+            time.sleep(wait)
+            started = time.perf_counter()
+            yielded = False
+            try:
+                for chunk in self._hedged_stream(lambda: self.backend.stream(model, prompt, generation_config, self.timeout), tokens):
+                    if not yielded:
+                        self._first_chunk(time.perf_counter() - started)
+                    yielded = True
+                    yield chunk
+            except Exception as e:
+                delay = self._failed(e, attempt, retryable=not yielded)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # 소비자가 스트림을 중간에 닫음(GeneratorExit) / 취소: 결과 없이 끝난 요청
+                self.breaker.release()
+                raise
+            elapsed = time.perf_counter() - started
+            self._succeeded(elapsed, "stream", record_latency=False)
+            self._trace(prompt, tokens, elapsed, wait)
+            return
+
+    async def astream(self, prompt: str, model: Optional[str] = None, generation_config: Optional[dict] = None) -> AsyncIterator[str]:
+        model = model or self.default_model
+        tokens = estimate_tokens(prompt)
+        attempt = 0
+        while True:
+            self._admit()
+            wait = self._wait_time(tokens)
+            await asyncio.sleep(wait)
+            started = time.perf_counter()
+            yielded = False
+            try:
+                async for chunk in self._ahedged_stream(lambda: self.backend.astream(model, prompt, generation_config, self.timeout), tokens):
+                    if not yielded:
+                        self._first_chunk(time.perf_counter() - started)
+                    yielded = True
+                    yield chunk
+            except Exception as e:
+                delay = self._failed(e, attempt, retryable=not yielded)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # 소비자가 스트림을 중간에 닫음(GeneratorExit) / 취소: 결과 없이 끝난 요청
+                self.breaker.release()
+                raise
+            elapsed = time.perf_counter() - started
+            self._succeeded(elapsed, "stream", record_latency=False)
+            self._trace(prompt, tokens, elapsed, wait)
+            return
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """전역 게이트웨이 (최초 호출 시 LLM_BACKEND 설정에 따라 생성)"""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway()
+    return _gateway
+
+
+def configure_gateway(backend=None, **kwargs) -> LLMGateway:
+    """전역 게이트웨이 교체 (테스트 / 부하 테스트에서 StubBackend 주입용)"""
+    global _gateway
+    with _gateway_lock:
+        _gateway = LLMGateway(backend=backend, **kwargs)
+    return _gateway
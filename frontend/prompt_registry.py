@@ -0,0 +1,211 @@
+# 프롬프트 / Context 레지스트리 모듈
+# prompts/*.md, contexts/**/*.json 파일을 한 번만 읽고 파싱해서 메모리에 보관한다.
+# 파일이 바뀌면 mtime을 보고 해당 파일만 다시 읽는다.
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+from .context_handler import CONTEXT_DIR
+
+PROMPT_DIR = Path(__file__).parent.parent / "prompts"
+
+# 단계별 프롬프트 파일과 context 파일 (key: 노드에서 사용할 이름)
+STAGE_FILES = {
+    "intake": ("stage1_intake.md", {
+        "mandatory_fields": "stage_specific/context_stage1_intake.json",
+        "domains_info": "stage_specific/context_stage1_domains.json",
+        "re_intake_guide": "stage_specific/context_stage1_re_intake.json",
+    }),
+    "validation": ("stage3_validation.md", {
+        "validation": "stage_specific/context_stage3_validation.json",
+    }),
+    "severity": ("stage4_severity.md", {
+        "severity": "stage_specific/context_stage4_severity.json",
+    }),
+    "solution": ("stage5_solution.md", {
+        "solution": "stage_specific/context_stage5_solution.json",
+    }),
+}
+
+
+def _freeze(value: Any) -> Any:
+    # 파싱된 JSON을 수정 불가능한 형태로 변환 (dict -> MappingProxyType, list -> tuple)
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    # json.dumps용으로 다시 일반 dict/list로 변환
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+class _Entry(NamedTuple):
+    text: str           # 파일 원문 (strip 적용)
+    data: Any           # 파싱된 JSON (freeze 적용, .md거나 파싱 실패 시 None)
+    mtime: float        # 로드 당시 파일 mtime
+    checked_at: float   # 마지막 mtime 확인 시각
+
+
+class StageResources(NamedTuple):
+    prompt: Optional[str]          # 단계 프롬프트 (파일이 없으면 None)
+    contexts: Mapping[str, str]    # context key -> 파일 원문 (없으면 "")
+
+
+class PromptRegistry:
+    """
+    프롬프트 / Context 파일 레지스트리
+    - 최초 생성 시 모든 프롬프트와 context 파일을 미리 로드
+    - 조회 시 check_interval 초마다 한 번씩만 mtime을 확인하고, 바뀐 파일만 다시 읽음
+    - 로드/재로드/hit/miss 통계 제공 (stats())
+    """
+
+    def __init__(self, prompt_dir: Path = PROMPT_DIR, context_dir: Path = CONTEXT_DIR, check_interval: float = 1.0):
+        self.prompt_dir = Path(prompt_dir)
+        self.context_dir = Path(context_dir)
+        self.check_interval = check_interval
+        self._entries: Dict[Path, _Entry] = {}
+        self._composed: Dict[Tuple, str] = {}
+        self._lock = threading.Lock()
+        self._stats = {"loads": 0, "reloads": 0, "hits": 0, "misses": 0}
+        self.preload()
+
+    # -----------------------------
+    # 로드 / 재로드
+    # -----------------------------
+    def preload(self):
+        """프롬프트(*.md)와 context(*.json) 파일 전체를 미리 로드"""
+        if self.prompt_dir.exists():
+            for path in self.prompt_dir.glob("*.md"):
+                self._get(path)
+        if self.context_dir.exists():
+            for path in self.context_dir.rglob("*.json"):
+                self._get(path)
+
+    def _load(self, path: Path, mtime: float, now: float) -> _Entry:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read().strip()
+        data = None
+        if path.suffix == ".json":
+            try:
+                data = _freeze(json.loads(text))
+            except json.JSONDecodeError as e:
+                print(f"[Prompt Registry] JSON 파싱 오류 ({path.name}): {e}")
+        return _Entry(text, data, mtime, now)
+
+    def _get(self, path: Path) -> Optional[_Entry]:
+        now = time.monotonic()
+        entry = self._entries.get(path)
+        if entry is not None and now - entry.checked_at < self.check_interval:
+            self._stats["hits"] += 1
+            return entry
+
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            self._stats["misses"] += 1
+            if entry is not None:
+                # 파일이 삭제된 경우 캐시에서도 제거
+                with self._lock:
+                    self._entries.pop(path, None)
+            return None
+
+        if entry is not None and entry.mtime == mtime:
+            self._stats["hits"] += 1
+            entry = entry._replace(checked_at=now)
+            self._entries[path] = entry
+            return entry
+
+        with self._lock:
+            try:
+                new_entry = self._load(path, mtime, now)
+            except Exception as e:
+                print(f"[Prompt Registry] 파일 읽기 오류 ({path.name}): {e}")
+                self._stats["misses"] += 1
+                return None
+            self._entries[path] = new_entry
+            self._stats["reloads" if entry is not None else "loads"] += 1
+            if entry is not None:
+                print(f"[Prompt Registry] 변경 감지, 다시 로드: {path.name}")
+        return new_entry
+
+    # -----------------------------
+    # 조회 API
+    # -----------------------------
+    def prompt(self, name: str) -> Optional[str]:
+        """프롬프트 원문 (예: "stage1_intake" 또는 "stage1_intake.md"), 없으면 None"""
+        filename = name if name.endswith(".md") else f"{name}.md"
+        entry = self._get(self.prompt_dir / filename)
+        return entry.text if entry else None
+
+    def context_text(self, filename: str) -> str:
+        """context 파일 원문 (load_context_from_file과 동일하게 strip 적용), 없으면 \"\" """
+        entry = self._get(self.context_dir / filename)
+        return entry.text if entry else ""
+
+    def context_json(self, filename: str) -> Any:
+        """파싱된 context JSON (수정 불가), 없거나 JSON이 아니면 None"""
+        entry = self._get(self.context_dir / filename)
+        return entry.data if entry else None
+
+    def stage(self, stage: str) -> StageResources:
+        """단계 이름("intake", "validation", "severity", "solution")으로 프롬프트와 context 원문 조회"""
+        prompt_file, contexts = STAGE_FILES[stage]
+        return StageResources(
+            prompt=self.prompt(prompt_file),
+            contexts=MappingProxyType({k: self.context_text(v) for k, v in contexts.items()}),
+        )
+
+    def compose_json(self, parts: Mapping[str, str], indent: int = 2) -> str:
+        """
+        {key: context 파일명} 을 하나의 JSON 문자열로 합쳐서 반환 (결과 캐시)
+        JSON 파싱에 실패한 파일은 원문 문자열을 그대로 값으로 사용한다.
+        파일 mtime이 바뀌면 캐시 key가 달라지므로 자동으로 다시 직렬화된다.
+        """
+        entries = []
+        for key, filename in parts.items():
+            entry = self._get(self.context_dir / filename)
+            if entry and entry.text:
+                entries.append((key, entry))
+
+        cache_key = (indent,) + tuple((key, parts[key], entry.mtime) for key, entry in entries)
+        cached = self._composed.get(cache_key)
+        if cached is not None:
+            return cached
+
+        payload = {key: (_thaw(entry.data) if entry.data is not None else entry.text) for key, entry in entries}
+        composed = json.dumps(payload, ensure_ascii=False, indent=indent)
+        with self._lock:
+            if len(self._composed) > 64:
+                self._composed.clear()
+            self._composed[cache_key] = composed
+        return composed
+
+    def stats(self) -> Dict[str, Any]:
+        """로드/재로드/hit/miss 횟수와 현재 보관 중인 파일 수"""
+        return {**self._stats, "entries": len(self._entries), "composed": len(self._composed)}
+
+
+_registry: Optional[PromptRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """전역 레지스트리 인스턴스 (최초 호출 시 생성 + 전체 preload)"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PromptRegistry()
+    return _registry
@@ -2,7 +2,11 @@
 import json
 import re
 import httpx
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional
+
+
+# Hypothesis API에서 기본으로 요청하는 필드 (Stage 3 프롬프트 구성에 필요한 것만)
+HYPOTHESIS_DEFAULT_FIELDS = ("diagnosis_candidates", "by_diagnosis", "hypothesis_report")
 
 
 def parse_summary_string(internal_data: str) -> str:
@@ -27,7 +31,13 @@ def parse_summary_string(internal_data: str) -> str:
     return internal_data.strip()
 
 
-def create_rag_hypothesis_request(summary_string: str, top_k: int = 12, diag_top_n: int = 3) -> Dict:
+def create_rag_hypothesis_request(
+    summary_string: str,
+    top_k: int = 12,
+    diag_top_n: int = 3,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
+) -> Dict:
     """
     Summary String을 RAG Hypothesis API 요청 형식으로 변환
     
@@ -35,14 +45,22 @@ def create_rag_hypothesis_request(summary_string: str, top_k: int = 12, diag_top
         summary_string: Summary String의 실제 내용
         top_k: 검색할 문단 수 (기본값: 12)
         diag_top_n: 상위 질환 수 (기본값: 3)
+        fields: 응답에 포함할 필드 (기본값: Stage 3에 필요한 필드만)
+        compact: True면 후보 병명과 chunk 참조만 요청
     
     Returns:
         RAG Hypothesis API 요청용 JSON 딕셔너리
     """
+    if fields is None and not compact:
+        # raw_hits / input_symptom은 이후 단계에서 쓰지 않으므로 기본으로 제외
+        fields = list(HYPOTHESIS_DEFAULT_FIELDS)
+
     return {
         "intake_report": summary_string,
         "top_k": top_k,
-        "diag_top_n": diag_top_n
+        "diag_top_n": diag_top_n,
+        "fields": fields,
+        "compact": compact,
     }
 
 
@@ -67,8 +85,8 @@ def call_rag_hypothesis_api(request_data: Dict, api_url: str = "http://localhost
             result = response.json()
             
             print(f"[RAG Handler] Hypothesis API 호출 성공")
-            # print(f"[RAG Handler] 검색된 질환 후보: {result.get('diagnosis_candidates', [])}")
-            print(f"[RAG Handler] return 값 확인 : {result}")
+            print(f"[RAG Handler] 검색된 질환 후보: {result.get('diagnosis_candidates', [])}")
+            print(f"[RAG Handler] 응답 필드: {list(result.keys())}, 크기: {len(response.content)} bytes")
             
             return result
             
@@ -83,6 +101,38 @@ def call_rag_hypothesis_api(request_data: Dict, api_url: str = "http://localhost
         return None
 
 
+def stream_rag_hypothesis_api(request_data: Dict, api_url: str = "http://localhost:8000/rag/hypothesis/stream") -> Iterator[Dict]:
+    """
+    RAG Hypothesis 스트리밍 API(NDJSON)를 호출하여 이벤트를 한 줄씩 전달
+    - 첫 이벤트("candidates")로 후보 병명을 먼저 받고,
+      이후 "criteria" 이벤트로 진단별 기준을 조회가 끝나는 순서대로 받는다.
+    
+    Args:
+        request_data: RAG API 요청 데이터 (create_rag_hypothesis_request 결과)
+        api_url: 스트리밍 엔드포인트 URL
+    
+    Yields:
+        이벤트 딕셔너리 (실패 시 아무것도 yield하지 않고 종료)
+    """
+    try:
+        print(f"[RAG Handler] Hypothesis 스트리밍 API 호출 시작: {api_url}")
+        with httpx.Client(timeout=30.0) as client:
+            with client.stream("POST", api_url, json=request_data) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    print(f"[RAG Handler] 스트리밍 이벤트 수신: {event.get('event')}")
+                    yield event
+    except httpx.RequestError as e:
+        print(f"[RAG Handler 오류] Hypothesis 스트리밍 요청 실패: {e}")
+    except httpx.HTTPStatusError as e:
+        print(f"[RAG Handler 오류] Hypothesis 스트리밍 응답 오류: {e.response.status_code}")
+    except Exception as e:
+        print(f"[RAG Handler 오류] 예상치 못한 오류: {e}")
+
+
 def process_stage2_rag_hypothesis(internal_data: str, top_k: int = 12, diag_top_n: int = 3) -> Optional[Dict]:
     """
     Stage 2에서 Summary String을 파싱하고 RAG Hypothesis API를 호출하는 전체 프로세스
@@ -142,8 +192,7 @@ def call_rag_solution_api(diagnosis: str, api_url: str = "http://localhost:8000/
             
             print(f"[RAG Handler] 솔루션 API 호출 성공")
             print(f"[RAG Handler] 응답: diagnosis={result.get('diagnosis')}, evidence 개수={len(result.get('evidence', []))}")
-            print(f"[RAG Handler] return 값 확인 : {result}")
-
+            print(f"[RAG Handler] 응답 크기: {len(response.content)} bytes")
 
             return result
             
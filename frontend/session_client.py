@@ -0,0 +1,120 @@
+import json
+import os
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+from langchain_core.messages import AIMessage, HumanMessage
+
+# 상담 세션 API 주소 (설정되어 있으면 Streamlit은 그래프를 직접 실행하지 않고 API를 호출)
+# 예: COUNSELING_API_URL=http://localhost:8000
+COUNSELING_API_URL = os.getenv("COUNSELING_API_URL", "").rstrip("/")
+
+
+def _to_message(data: Any) -> Any:
+    # API가 {"role", "content"} dict로 보낸 메시지를 LangChain 메시지로 복원
+    if isinstance(data, dict) and "role" in data and "content" in data:
+        if data["role"] == "user":
+            return HumanMessage(content=data["content"])
+        return AIMessage(content=data["content"])
+    return data
+
+
+def _restore_values(values: Dict[str, Any]) -> Dict[str, Any]:
+    if "messages" in values:
+        values = {**values, "messages": [_to_message(m) for m in values["messages"] or []]}
+    return values
+
+
+def iter_sse(lines: Iterator[str]) -> Iterator[Dict[str, Any]]:
+    """
+    text/event-stream 라인을 파싱하여 data(JSON) 이벤트를 순서대로 반환
+    (빈 줄이 이벤트 구분자, data가 여러 줄이면 이어붙임)
+    """
+    data_lines = []
+    for line in lines:
+        if not line:
+            if data_lines:
+                yield json.loads("\n".join(data_lines))
+                data_lines = []
+            continue
+        if line.startswith("data:"):
+            data_lines.append(line[5:].lstrip())
+    if data_lines:
+        yield json.loads("\n".join(data_lines))
+
+
+class RemoteGraphClient:
+    """
+    상담 세션 API(/sessions)를 호출하는 GraphClient 대체 클래스
+    - GraphClient와 같은 메서드/이벤트 형식을 제공하므로 chat_handler는 그대로 사용 가능
+    - 그래프와 체크포인터는 API 워커에서 실행되므로 UI와 추론을 따로 확장할 수 있음
+    """
+
+    def __init__(self, base_url: str = COUNSELING_API_URL, timeout: float = 120.0):
+        self.base_url = base_url.rstrip("/")
+        # 연결 재사용 (매 턴마다 TCP/TLS 연결을 새로 맺지 않도록)
+        self._client = httpx.Client(base_url=self.base_url, timeout=timeout)
+
+    def create_thread_id(self) -> str:
+        response = self._client.post("/sessions")
+        response.raise_for_status()
+        return response.json()["thread_id"]
+
+    def stream_graph(self, user_input: str, thread_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        GraphClient.stream_graph와 동일한 이벤트를 yield
+        - {"type": "token", "text": ...}
+        - {"type": "update", "node": ..., "values": ...} (messages는 AIMessage/HumanMessage로 복원)
+        """
+        with self._client.stream(
+            "POST", f"/sessions/{thread_id}/turns", json={"message": user_input}
+        ) as response:
+            response.raise_for_status()
+            for event in iter_sse(response.iter_lines()):
+                kind = event.get("type")
+                if kind == "update":
+                    yield {**event, "values": _restore_values(event.get("values") or {})}
+                elif kind == "token":
+                    yield event
+                elif kind == "error":
+                    raise RuntimeError(event.get("detail") or "session turn failed")
+
+    def invoke_graph(self, user_input: str, thread_id: str) -> Dict[str, Any]:
+        """스트리밍 턴을 끝까지 소비한 뒤 최종 State 반환"""
+        for _ in self.stream_graph(user_input, thread_id):
+            pass
+        return self.get_state_snapshot(thread_id).get("values", {})
+
+    def get_state_snapshot(self, thread_id: str) -> Dict[str, Any]:
+        response = self._client.get(f"/sessions/{thread_id}")
+        if response.status_code == 404:
+            # 아직 턴을 실행하지 않은 세션
+            return {"values": {}, "next": (), "config": None, "metadata": None, "created_at": None}
+        response.raise_for_status()
+        data = response.json()
+        return {
+            "values": _restore_values(data.get("values") or {}),
+            "next": tuple(data.get("next") or ()),
+            "config": {"configurable": {"thread_id": thread_id}},
+            "metadata": None,
+            "created_at": data.get("created_at"),
+        }
+
+
+_remote_client: Optional[RemoteGraphClient] = None
+
+
+def get_counseling_client():
+    """
+    COUNSELING_API_URL이 설정되어 있으면 RemoteGraphClient,
+    아니면 프로세스 내에서 그래프를 실행하는 GraphClient를 반환
+    """
+    global _remote_client
+    if COUNSELING_API_URL:
+        if _remote_client is None:
+            _remote_client = RemoteGraphClient(COUNSELING_API_URL)
+        return _remote_client
+
+    # 그래프(및 Gemini SDK) import는 로컬 실행 모드에서만
+    from .graph_client import get_graph_client
+    return get_graph_client()
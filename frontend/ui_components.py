@@ -1,10 +1,12 @@
 # UI 컴포넌트 모듈
 import streamlit as st
-import time
 import json
 
-from .chat_handler import get_current_stage_info
-from .graph_client import get_graph_client
+from .chat_handler import get_current_stage_info, get_state_snapshot_cached, process_user_input_stream
+
+# Streamlit fragment (1.37+: st.fragment, 1.33~: st.experimental_fragment)
+# 지원하지 않는 버전에서는 일반 함수로 동작 (전체 rerun)
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda f: f)
 
 def setup_page_config():
     # 페이지 설정
@@ -73,9 +75,8 @@ def render_sidebar():
         if "thread_id" in st.session_state:
             st.markdown(f"**Session ID:** `{st.session_state.thread_id}`")
             
-            client = get_graph_client()
             try:
-                snapshot = client.get_state_snapshot(st.session_state.thread_id)
+                snapshot = get_state_snapshot_cached() or {}
                 state_values = snapshot.get("values", {})
                 
                 st.markdown("### Current State Data")
@@ -123,28 +124,54 @@ def render_main_header():
 
 
 def render_chat_messages(messages):
-    # 이미 렌더링된 메시지 수 추적
-    if "rendered_message_count" not in st.session_state:
-        st.session_state.rendered_message_count = 0
-    
     # 채팅 메시지들을 화면에 표시
-    for idx, message in enumerate(messages):
+    # (새 응답은 render_streaming_response에서 실시간으로 표시되므로 여기서는 바로 표시)
+    for message in messages:
         # 가이드라인 메시지 (HTML 포함) 등 특수 메시지 처리
         is_html = message.get("is_html", False) # TODO: Graph 전환 시 필드 확인 필요
 
         with st.chat_message(message["role"]):
-             # 새로 추가된 Assistant 메시지만 타이핑 효과 적용
-             # 이미 표시된 메시지는 바로 표시
-            if message["role"] == "assistant" and idx >= st.session_state.rendered_message_count:
-                _render_typing_effect(message["content"])
+            if is_html:
+                st.markdown(message["content"], unsafe_allow_html=True)
             else:
-                if is_html:
-                    st.markdown(message["content"], unsafe_allow_html=True)
-                else:
-                    st.markdown(message["content"])
-    
-    # 렌더링된 메시지 수 업데이트
-    st.session_state.rendered_message_count = len(messages)
+                st.markdown(message["content"])
+
+
+def render_conversation():
+    """
+    대화 영역 렌더링 (전체 rerun 시점)
+    - 지금까지의 히스토리는 여기서 한 번 그리고,
+    - 이후 새 메시지 / 입력창 / 스트리밍 응답은 fragment(_render_conversation_tail)에서만 다시 그린다.
+    """
+    messages = st.session_state.messages
+    st.session_state.history_rendered_count = len(messages)
+    render_chat_messages(messages)
+    _render_conversation_tail()
+
+
+@_fragment
+def _render_conversation_tail():
+    # 마지막 전체 rerun 이후에 추가된 메시지만 표시
+    messages = st.session_state.messages
+    render_chat_messages(messages[st.session_state.get("history_rendered_count", 0):])
+
+    user_input = render_user_input()
+    if not user_input:
+        return
+
+    stage_before = (get_current_stage_info() or {}).get("stage")
+
+    # 사용자 메시지 표시
+    with st.chat_message("user"):
+        st.markdown(user_input)
+
+    # Graph 스트리밍 실행: 토큰이 생성되는 대로 표시
+    render_streaming_response(process_user_input_stream(user_input))
+
+    # 상담 단계가 바뀐 경우에만 사이드바 단계 표시 갱신을 위해 전체 rerun
+    stage_after = (get_current_stage_info() or {}).get("stage")
+    if stage_after != stage_before:
+        st.rerun()
 
 
 def render_user_input():
@@ -164,24 +191,30 @@ def render_user_input():
     return st.chat_input(placeholder, disabled=disabled)
 
 
-def _render_typing_effect(text, speed=0.02):
+def render_streaming_response(events):
     """
-    타이핑 효과로 텍스트를 표시
+    Graph 스트리밍 이벤트를 받아 응답을 실시간으로 표시
     
     Args:
-        text: 표시할 텍스트
-        speed: 각 문자 사이의 딜레이 (초)
+        events: process_user_input_stream()이 yield하는 이벤트 iterator
+            - token: 생성 중인 텍스트를 현재 말풍선에 이어 붙임
+            - message: 노드가 확정한 메시지로 현재 말풍선을 교체하고, 다음 응답은 새 말풍선에 표시
     """
-    # Streamlit의 write_stream을 사용 (1.28.0+)
-    # 버전이 낮으면 fallback으로 일반 표시
-    try:
-        # 텍스트를 문자 단위로 나눠서 스트림으로 전달
-        def text_generator():
-            for char in text:
-                yield char
-                time.sleep(speed)
-        
-        st.write_stream(text_generator())
-    except AttributeError:
-        # write_stream이 없는 경우 일반 표시
-        st.markdown(text)
+    placeholder = None
+    text = ""
+
+    for event in events:
+        if placeholder is None:
+            placeholder = st.chat_message("assistant").empty()
+
+        if event["type"] == "token":
+            text += event["text"]
+            placeholder.markdown(text + "▌")
+        elif event["type"] == "message":
+            placeholder.markdown(event["content"])
+            placeholder = None
+            text = ""
+
+    # 확정 메시지 없이 스트림이 끝난 경우 커서만 제거
+    if placeholder is not None and text:
+        placeholder.markdown(text)
@@ -0,0 +1,661 @@
+import asyncio
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+from langgraph.checkpoint.memory import MemorySaver
+
+from api import tracing
+from api.metrics import CHECKPOINT_SESSIONS, CHECKPOINT_RESIDENT_BYTES, CHECKPOINT_EVICTIONS, CHECKPOINT_RELOADS
+
+try:  # langgraph-checkpoint 2.0.2x 이상: configurable 값을 metadata에 병합
+    from langgraph.checkpoint.base import get_checkpoint_metadata
+except ImportError:
+    def get_checkpoint_metadata(config: RunnableConfig, metadata: CheckpointMetadata) -> CheckpointMetadata:
+        return metadata
+
+# -----------------------------
+# 체크포인터 설정
+# -----------------------------
+# "memory"면 MemorySaver(프로세스 메모리), 그 외에는 SQLite 파일 경로
+CHECKPOINT_DB = os.getenv("GRAPH_CHECKPOINT_DB", "./graph/checkpoints.db")
+# thread_id(+namespace)별로 보관할 최신 checkpoint 개수 (0이면 전부 보관)
+CHECKPOINT_KEEP_LAST = int(os.getenv("GRAPH_CHECKPOINT_KEEP_LAST", "20"))
+# 이 개수만큼 쓰기가 쌓이거나 FLUSH_INTERVAL초가 지나면 한 트랜잭션으로 commit
+CHECKPOINT_BATCH_SIZE = int(os.getenv("GRAPH_CHECKPOINT_BATCH_SIZE", "32"))
+CHECKPOINT_FLUSH_INTERVAL = float(os.getenv("GRAPH_CHECKPOINT_FLUSH_INTERVAL", "0.5"))
+# WAL truncate + incremental vacuum 주기 (초)
+CHECKPOINT_VACUUM_INTERVAL = float(os.getenv("GRAPH_CHECKPOINT_VACUUM_INTERVAL", "300"))
+
+# GRAPH_CHECKPOINT_DB=memory일 때: 유휴 세션 TTL(초), 메모리 상한(MB), 퇴출 세션 보관용 SQLite 경로(빈 값이면 버림)
+SESSION_TTL = float(os.getenv("GRAPH_SESSION_TTL", "3600"))
+SESSION_MEMORY_BUDGET_MB = float(os.getenv("GRAPH_SESSION_MEMORY_BUDGET_MB", "256"))
+SESSION_SPILL_DB = os.getenv("GRAPH_SESSION_SPILL_DB", "")
+
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS checkpoints (
+        thread_id TEXT NOT NULL,
+        checkpoint_ns TEXT NOT NULL DEFAULT '',
+        checkpoint_id TEXT NOT NULL,
+        parent_checkpoint_id TEXT,
+        type TEXT,
+        checkpoint BLOB,
+        metadata_type TEXT,
+        metadata BLOB,
+        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS writes (
+        thread_id TEXT NOT NULL,
+        checkpoint_ns TEXT NOT NULL DEFAULT '',
+        checkpoint_id TEXT NOT NULL,
+        task_id TEXT NOT NULL,
+        idx INTEGER NOT NULL,
+        channel TEXT NOT NULL,
+        type TEXT,
+        value BLOB,
+        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+    )
+    """,
+)
+
+_UPSERT_CHECKPOINT = (
+    "INSERT OR REPLACE INTO checkpoints "
+    "(thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# 최신 N개를 제외한 checkpoint 삭제 (checkpoint_id는 시간순 정렬되는 uuid6)
+_PRUNE_CHECKPOINTS = (
+    "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN ("
+    "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+    "ORDER BY checkpoint_id DESC LIMIT ?)"
+)
+_PRUNE_WRITES = (
+    "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ("
+    "SELECT MIN(checkpoint_id) FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?)"
+)
+
+_SELECT_CHECKPOINT = (
+    "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+    "FROM checkpoints"
+)
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver):
+    """
+    SQLite 파일 기반 LangGraph 체크포인터
+    - WAL 모드 + synchronous=NORMAL: 쓰기가 읽기를 막지 않고, fsync는 WAL checkpoint 때만
+    - 배치 쓰기: put/put_writes는 열린 트랜잭션에 쌓고, batch_size개 또는 flush_interval초마다 한 번에 commit
+      (같은 연결에서 읽으므로 commit 전 데이터도 바로 조회됨, 비정상 종료 시 최대 flush_interval초 분량 유실)
+    - 보관 정책: thread_id(+namespace)별로 최신 keep_last개의 checkpoint와 그 pending writes만 유지
+    - 백그라운드 vacuum: WAL 파일 truncate + auto_vacuum=INCREMENTAL로 삭제된 페이지 반환
+    """
+
+    def __init__(
+        self,
+        path: str = CHECKPOINT_DB,
+        keep_last: int = CHECKPOINT_KEEP_LAST,
+        batch_size: int = CHECKPOINT_BATCH_SIZE,
+        flush_interval: float = CHECKPOINT_FLUSH_INTERVAL,
+        vacuum_interval: float = CHECKPOINT_VACUUM_INTERVAL,
+        serde=None,
+    ):
+        super().__init__(serde=serde)
+        self.path = str(path)
+        self.keep_last = keep_last
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.vacuum_interval = vacuum_interval
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # isolation_level=None: 트랜잭션(BEGIN/COMMIT)을 직접 관리
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._stats = {"commits": 0, "pruned": 0, "vacuums": 0}
+        self._setup()
+
+        self._stop = threading.Event()
+        self._worker = threading.Thread(target=self._background, name="checkpoint-flusher", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def _setup(self):
+        with self._lock:
+            # auto_vacuum은 테이블 생성 전(새 DB)에만 적용됨
+            self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            for ddl in _SCHEMA:
+                self._conn.execute(ddl)
+
+    # -----------------------------
+    # 배치 쓰기 / 백그라운드 작업
+    # -----------------------------
+    def _write(self, statements: Sequence[Tuple[str, Sequence[Any]]]) -> List[int]:
+        # 반환값: 문장별 변경된 row 수
+        with self._lock:
+            if not self._conn.in_transaction:
+                self._conn.execute("BEGIN")
+            counts = [self._conn.execute(sql, params).rowcount for sql, params in statements]
+            self._pending += 1
+            if self._pending >= self.batch_size:
+                self._commit()
+        return counts
+
+    def _commit(self):
+        # self._lock을 잡은 상태에서 호출
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+            self._stats["commits"] += 1
+        self._pending = 0
+
+    def flush(self):
+        """쌓여 있는 쓰기를 즉시 commit"""
+        with self._lock:
+            self._commit()
+
+    def vacuum(self):
+        """WAL을 DB에 반영 후 truncate하고, 삭제된 페이지를 파일 시스템에 반환"""
+        with self._lock:
+            self._commit()
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("PRAGMA incremental_vacuum")
+            self._stats["vacuums"] += 1
+
+    def _background(self):
+        last_vacuum = time.monotonic()
+        while not self._stop.wait(self.flush_interval):
+            try:
+                if self._pending:
+                    self.flush()
+                if self.vacuum_interval and time.monotonic() - last_vacuum >= self.vacuum_interval:
+                    self.vacuum()
+                    last_vacuum = time.monotonic()
+            except sqlite3.Error as e:
+                print(f"[Checkpointer] 백그라운드 작업 오류: {e}")
+
+    def close(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        with self._lock:
+            try:
+                self._commit()
+                self._conn.close()
+            except sqlite3.Error as e:
+                print(f"[Checkpointer] 종료 중 오류: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """commit/prune/vacuum 횟수, 미반영 쓰기 수, DB/WAL 파일 크기(bytes)"""
+        sizes = {}
+        for key, suffix in (("db_bytes", ""), ("wal_bytes", "-wal")):
+            try:
+                sizes[key] = os.path.getsize(self.path + suffix)
+            except OSError:
+                sizes[key] = 0
+        return {**self._stats, "pending": self._pending, **sizes}
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def _load_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> List[Tuple[str, str, Any]]:
+        rows = self._conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return [(task_id, channel, self.serde.loads_typed((type_, value))) for task_id, channel, type_, value in rows]
+
+    def _to_tuple(self, row: Tuple, writes: List[Tuple[str, str, Any]]) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, type_, checkpoint, metadata_type, metadata = row
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}},
+            checkpoint=self.serde.loads_typed((type_, checkpoint)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id}}
+                if parent_id else None
+            ),
+            pending_writes=writes,
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        with self._lock:
+            if checkpoint_id:
+                row = self._conn.execute(
+                    _SELECT_CHECKPOINT + " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    _SELECT_CHECKPOINT + " WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            writes = self._load_writes(row[0], row[1], row[2])
+        return self._to_tuple(row, writes)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        where, params = [], []
+        if config:
+            where.append("thread_id = ?")
+            params.append(str(config["configurable"]["thread_id"]))
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                where.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            checkpoint_id = get_checkpoint_id(config)
+            if checkpoint_id:
+                where.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and get_checkpoint_id(before):
+            where.append("checkpoint_id < ?")
+            params.append(get_checkpoint_id(before))
+
+        query = _SELECT_CHECKPOINT
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        count = 0
+        for row in rows:
+            if limit is not None and count >= limit:
+                break
+            with self._lock:
+                writes = self._load_writes(row[0], row[1], row[2])
+            item = self._to_tuple(row, writes)
+            # metadata는 직렬화된 BLOB이므로 filter는 로드 후 비교
+            if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            count += 1
+            yield item
+
+    # -----------------------------
+    # 쓰기
+    # -----------------------------
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        parent_id = config["configurable"].get("checkpoint_id")
+        with tracing.span("checkpoint.put", kind="checkpoint", saver="sqlite", thread_id=thread_id) as span:
+            type_, blob = self.serde.dumps_typed(checkpoint)
+            metadata_type, metadata_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+
+            statements = [(
+                _UPSERT_CHECKPOINT,
+                (thread_id, checkpoint_ns, checkpoint["id"], parent_id, type_, blob, metadata_type, metadata_blob),
+            )]
+            if self.keep_last > 0:
+                statements.append((_PRUNE_CHECKPOINTS, (thread_id, checkpoint_ns, thread_id, checkpoint_ns, self.keep_last)))
+                statements.append((_PRUNE_WRITES, (thread_id, checkpoint_ns, thread_id, checkpoint_ns)))
+            counts = self._write(statements)
+            if span is not None:
+                span.set(bytes=len(blob))
+        if self.keep_last > 0:
+            self._stats["pruned"] += counts[1]
+
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        # 특수 채널(에러/인터럽트 등)은 같은 idx로 덮어쓰고, 일반 채널은 최초 기록만 유지
+        verb = "INSERT OR REPLACE" if all(channel in WRITES_IDX_MAP for channel, _ in writes) else "INSERT OR IGNORE"
+        sql = (
+            f"{verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+        with tracing.span("checkpoint.put_writes", kind="checkpoint", saver="sqlite", thread_id=thread_id, writes=len(writes)):
+            statements = []
+            for idx, (channel, value) in enumerate(writes):
+                type_, blob = self.serde.dumps_typed(value)
+                statements.append((sql, (
+                    thread_id, checkpoint_ns, checkpoint_id, task_id,
+                    WRITES_IDX_MAP.get(channel, idx), channel, type_, blob,
+                )))
+            self._write(statements)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._write([
+            ("DELETE FROM checkpoints WHERE thread_id = ?", (str(thread_id),)),
+            ("DELETE FROM writes WHERE thread_id = ?", (str(thread_id),)),
+        ])
+
+    # -----------------------------
+    # async (graph.ainvoke / astream용): SQLite 호출은 짧으므로 스레드에서 실행
+    # -----------------------------
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def _deep_bytes(value: Any) -> int:
+    # MemorySaver 저장소(직렬화된 bytes를 담은 dict/tuple 중첩 구조)의 대략적인 크기
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_deep_bytes(k) + _deep_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_deep_bytes(v) for v in value)
+    return 8
+
+
+def replay_thread(source: BaseCheckpointSaver, target: BaseCheckpointSaver, thread_id: str) -> int:
+    """
+    source에 있는 thread_id의 checkpoint와 pending writes를 오래된 순서대로 target에 다시 기록
+    Returns: 옮긴 checkpoint 수
+    """
+    tuples = list(source.list({"configurable": {"thread_id": thread_id}}))
+    for tup in reversed(tuples):
+        configurable = tup.config["configurable"]
+        parent = tup.parent_config or {
+            "configurable": {"thread_id": thread_id, "checkpoint_ns": configurable.get("checkpoint_ns", "")}
+        }
+        # 모든 채널을 새 버전으로 넘겨야 MemorySaver가 채널 값을 전부 저장함
+        saved = target.put(parent, tup.checkpoint, tup.metadata, dict(tup.checkpoint.get("channel_versions", {})))
+        by_task: Dict[str, List[Tuple[str, Any]]] = defaultdict(list)
+        for task_id, channel, value in tup.pending_writes or []:
+            by_task[task_id].append((channel, value))
+        for task_id, writes in by_task.items():
+            target.put_writes(saved, writes, task_id)
+    return len(tuples)
+
+
+class BoundedMemorySaver(BaseCheckpointSaver):
+    """
+    세션(thread_id) 수 / 메모리 사용량이 제한된 MemorySaver
+    - thread_id마다 별도의 MemorySaver를 두고, 마지막 접근 순서(LRU)로 관리
+    - ttl초 이상 접근이 없는 세션, 또는 전체 크기가 budget_bytes를 넘을 때 오래된 세션부터 퇴출
+    - spill이 있으면 퇴출 세션을 spill 저장소(SQLite)에 옮겨 두고, 다음 get_state/invoke 때 투명하게 다시 로드
+    - 상주 세션 수 / 바이트, 퇴출 / 재로드 횟수는 api.metrics 게이지로 노출
+    """
+
+    def __init__(
+        self,
+        ttl: float = SESSION_TTL,
+        budget_bytes: int = int(SESSION_MEMORY_BUDGET_MB * 1024 * 1024),
+        spill: Optional[BaseCheckpointSaver] = None,
+        sweep_interval: float = 30.0,
+        serde=None,
+    ):
+        super().__init__(serde=serde)
+        self.ttl = ttl
+        self.budget_bytes = budget_bytes
+        self.spill = spill
+        self.sweep_interval = sweep_interval
+        # thread_id -> [MemorySaver, 마지막 접근 시각, 크기(bytes)] (앞쪽일수록 오래 전에 접근)
+        self._threads: "OrderedDict[str, list]" = OrderedDict()
+        self._bytes = 0
+        self._last_sweep = time.monotonic()
+        self._lock = threading.RLock()
+
+    # -----------------------------
+    # 세션 관리
+    # -----------------------------
+    def _saver(self, thread_id: str, create: bool = False) -> Optional[MemorySaver]:
+        with self._lock:
+            entry = self._threads.get(thread_id)
+            if entry is None and self._reload(thread_id):
+                entry = self._threads[thread_id]
+            if entry is None:
+                if not create:
+                    return None
+                entry = self._threads[thread_id] = [MemorySaver(serde=self.serde), 0.0, 0]
+            entry[1] = time.monotonic()
+            self._threads.move_to_end(thread_id)
+            return entry[0]
+
+    def _reload(self, thread_id: str) -> bool:
+        # spill 저장소에 퇴출된 세션이 있으면 메모리로 되돌림
+        if self.spill is None or self.spill.get_tuple({"configurable": {"thread_id": thread_id}}) is None:
+            return False
+        saver = MemorySaver(serde=self.serde)
+        replay_thread(self.spill, saver, thread_id)
+        self.spill.delete_thread(thread_id)
+        self._threads[thread_id] = [saver, time.monotonic(), 0]
+        self._resize(thread_id)
+        CHECKPOINT_RELOADS.inc()
+        return True
+
+    def _resize(self, thread_id: str):
+        entry = self._threads.get(thread_id)
+        if entry is None:
+            return
+        saver = entry[0]
+        size = sum(_deep_bytes(getattr(saver, name, None) or {}) for name in ("storage", "writes", "blobs"))
+        self._bytes += size - entry[2]
+        entry[2] = size
+
+    def _evict(self, thread_id: str, reason: str):
+        entry = self._threads.pop(thread_id, None)
+        if entry is None:
+            return
+        self._bytes -= entry[2]
+        if self.spill is not None:
+            try:
+                replay_thread(entry[0], self.spill, thread_id)
+            except Exception as e:
+                print(f"[Checkpointer] 세션 spill 실패 (thread_id={thread_id}): {e}")
+        CHECKPOINT_EVICTIONS.inc(reason=reason)
+
+    def _enforce_limits(self, keep: Optional[str] = None):
+        now = time.monotonic()
+        if self.ttl and now - self._last_sweep >= self.sweep_interval:
+            self._last_sweep = now
+            for thread_id in [t for t, e in self._threads.items() if now - e[1] > self.ttl and t != keep]:
+                self._evict(thread_id, "ttl")
+        while self.budget_bytes and self._bytes > self.budget_bytes:
+            victim = next((t for t in self._threads if t != keep), None)
+            if victim is None:
+                break
+            self._evict(victim, "budget")
+        CHECKPOINT_SESSIONS.set(len(self._threads))
+        CHECKPOINT_RESIDENT_BYTES.set(self._bytes)
+
+    def sweep(self):
+        """TTL이 지난 세션을 즉시 퇴출 (주기와 관계없이)"""
+        with self._lock:
+            self._last_sweep = 0.0
+            self._enforce_limits()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"sessions": len(self._threads), "bytes": self._bytes, "budget_bytes": self.budget_bytes}
+
+    # -----------------------------
+    # BaseCheckpointSaver 구현 (thread_id별 MemorySaver로 위임)
+    # -----------------------------
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with self._lock:
+            saver = self._saver(str(config["configurable"]["thread_id"]))
+            return saver.get_tuple(config) if saver else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        with self._lock:
+            if config:
+                saver = self._saver(str(config["configurable"]["thread_id"]))
+                savers = [saver] if saver else []
+            else:
+                savers = [entry[0] for entry in self._threads.values()]
+        for saver in savers:
+            for item in saver.list(config, filter=filter, before=before, limit=limit):
+                yield item
+                if limit is not None:
+                    limit -= 1
+                    if limit <= 0:
+                        return
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = str(config["configurable"]["thread_id"])
+        with tracing.span("checkpoint.put", kind="checkpoint", saver="memory", thread_id=thread_id), self._lock:
+            result = self._saver(thread_id, create=True).put(config, checkpoint, metadata, new_versions)
+            self._resize(thread_id)
+            self._enforce_limits(keep=thread_id)
+            return result
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = str(config["configurable"]["thread_id"])
+        with tracing.span("checkpoint.put_writes", kind="checkpoint", saver="memory", thread_id=thread_id, writes=len(writes)), self._lock:
+            self._saver(thread_id, create=True).put_writes(config, writes, task_id, task_path)
+            self._resize(thread_id)
+            self._enforce_limits(keep=thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            entry = self._threads.pop(str(thread_id), None)
+            if entry is not None:
+                self._bytes -= entry[2]
+            if self.spill is not None:
+                self.spill.delete_thread(str(thread_id))
+            self._enforce_limits()
+
+    def get_next_version(self, current, channel):
+        # 버전 형식은 내부 MemorySaver와 동일하게 유지
+        return MemorySaver.get_next_version(self, current, channel)
+
+    # 메모리 조작이므로 async 버전도 그대로 호출 (MemorySaver와 동일)
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self.delete_thread(thread_id)
+
+
+def create_checkpointer(path: str = CHECKPOINT_DB) -> BaseCheckpointSaver:
+    """
+    GRAPH_CHECKPOINT_DB 설정에 따라 체크포인터 생성
+    - "memory": BoundedMemorySaver (유휴 세션 TTL + 메모리 상한, GRAPH_SESSION_SPILL_DB가 있으면 디스크로 퇴출)
+    - 그 외: SqliteCheckpointSaver
+    """
+    if path == "memory":
+        spill = SqliteCheckpointSaver(SESSION_SPILL_DB, keep_last=0) if SESSION_SPILL_DB else None
+        return BoundedMemorySaver(spill=spill)
+    return SqliteCheckpointSaver(path)
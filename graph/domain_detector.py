@@ -0,0 +1,103 @@
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from api.metrics import DOMAIN_DETECTIONS
+from api.rag_service import embed_documents, embed_query
+from frontend.prompt_registry import STAGE_FILES, get_prompt_registry
+
+# -----------------------------
+# Intake 도메인 감지 (로컬 임베딩)
+# - context_stage1_domains.json의 13개 도메인 설명(이름 + 키워드 + follow_up_guide)을 한 번 임베딩해
+#   정규화된 행렬로 보관하고, 사용자 발화마다 쿼리 임베딩과의 내적 한 번으로 점수를 낸다.
+# - 최고 점수가 INTAKE_DOMAIN_THRESHOLD 이상이고 2위와 INTAKE_DOMAIN_MARGIN 이상 차이 나면 감지
+# - 감지 결과로 current_domain / domain_questions_active를 직접 설정하므로,
+#   Intake 프롬프트에는 도메인 목록 전체 대신 진행 중인 도메인의 가이드만 넣는다.
+# - 도메인 파일이 바뀌면(레지스트리 재로드) 행렬을 다시 만든다.
+# -----------------------------
+
+INTAKE_DOMAIN_DETECTOR = os.getenv("INTAKE_DOMAIN_DETECTOR", "1") != "0"
+INTAKE_DOMAIN_THRESHOLD = float(os.getenv("INTAKE_DOMAIN_THRESHOLD", "0.35"))
+INTAKE_DOMAIN_MARGIN = float(os.getenv("INTAKE_DOMAIN_MARGIN", "0.02"))
+
+DOMAINS_FILE = STAGE_FILES["intake"][1]["domains_info"]
+
+_lock = threading.Lock()
+_source: Any = None
+_names: List[str] = []
+_entries: List[Mapping[str, Any]] = []
+_matrix: Optional[np.ndarray] = None
+
+
+def _domain_text(domain: Mapping[str, Any]) -> str:
+    keywords = ", ".join(domain.get("keywords", ()))
+    return f"{domain['domain_name']}\n{keywords}\n{domain.get('follow_up_guide', '')}"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def _domain_matrix() -> Tuple[List[str], Optional[np.ndarray]]:
+    """(도메인명 리스트, 정규화된 도메인 임베딩 행렬) — 파일이 바뀌지 않으면 재사용"""
+    global _source, _names, _entries, _matrix
+    data = get_prompt_registry().context_json(DOMAINS_FILE)
+    if data is _source:
+        return _names, _matrix
+    with _lock:
+        if data is not _source:
+            entries = list((data or {}).get("domains") or ())
+            matrix = None
+            if entries:
+                matrix = _normalize(np.asarray(embed_documents([_domain_text(d) for d in entries]), dtype=np.float32))
+            _names = [d["domain_name"] for d in entries]
+            _entries, _matrix, _source = entries, matrix, data
+    return _names, _matrix
+
+
+def score_domains(text: str) -> Dict[str, float]:
+    """발화 -> {도메인명: 코사인 유사도}"""
+    names, matrix = _domain_matrix()
+    if matrix is None or not (text or "").strip():
+        return {}
+    query = _normalize(np.asarray(embed_query(text), dtype=np.float32))
+    scores = matrix @ query
+    return {name: round(float(s), 4) for name, s in zip(names, scores)}
+
+
+def detect_domain(text: str, exclude: Iterable[str] = ()) -> Optional[Tuple[str, float]]:
+    """
+    발화에서 가장 가까운 도메인 (기준 점수 미달 / 2위와 차이가 작으면 None)
+    exclude: 이미 심화 질문을 마친 도메인 (다시 감지하지 않음)
+    """
+    excluded = set(exclude)
+    ranked = sorted(
+        ((name, score) for name, score in score_domains(text).items() if name not in excluded),
+        key=lambda kv: kv[1],
+        reverse=True,
+    )
+    if not ranked:
+        return None
+    name, score = ranked[0]
+    runner_up = ranked[1][1] if len(ranked) > 1 else -1.0
+    detected = score >= INTAKE_DOMAIN_THRESHOLD and score - runner_up >= INTAKE_DOMAIN_MARGIN
+    DOMAIN_DETECTIONS.inc(domain=name if detected else "none")
+    return (name, score) if detected else None
+
+
+def domain_guide(name: Optional[str]) -> Optional[Dict[str, Any]]:
+    """도메인명 -> 프롬프트에 넣을 해당 도메인 항목 (없으면 None)"""
+    if not name:
+        return None
+    _domain_matrix()
+    for entry in _entries:
+        if entry["domain_name"] == name:
+            return {
+                "domain_name": entry["domain_name"],
+                "keywords": list(entry.get("keywords", ())),
+                "follow_up_guide": entry.get("follow_up_guide", ""),
+            }
+    return None
@@ -1,6 +1,23 @@
 from typing import Literal
 from graph.state import CounselingState
 
+def route_turn(state: CounselingState) -> Literal["intake", "validation", "severity"]:
+    """
+    사용자 입력(턴)마다 진행 중인 단계로 바로 진입
+    - 요약 리포트가 없거나 재탐색(Re-Intake) 중이면 -> Intake
+    - 심각도 평가 대상 질환이 정해졌으면 -> Severity
+    - 의심 질환 후보가 있으면 -> Validation (이번 입력은 직전 검증 질문의 답변)
+    - 요약은 있지만 후보가 없으면 (Hypothesis 검색 실패 등) -> Intake (-> Hypothesis 재시도)
+    매 턴 Intake부터 다시 실행하면 Intake의 응답이 마지막 메시지가 되어 Validation / Severity가 사용자 답변을 읽지 못함
+    """
+    if not state.get("intake_summary_report") or state.get("is_re_intake"):
+        return "intake"
+    if state.get("severity_diagnosis"):
+        return "severity"
+    if state.get("hypothesis_candidates"):
+        return "validation"
+    return "intake"
+
 def check_intake_complete(state: CounselingState) -> Literal["hypothesis", "__end__"]:
     """
     Intake 단계 완료 여부 확인
@@ -1,15 +1,48 @@
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langgraph.graph import StateGraph, END
 from graph.state import CounselingState
-from graph.nodes.intake import intake_node
-from graph.nodes.hypothesis import hypothesis_node
-from graph.nodes.validation import validation_node
-from graph.nodes.severity import severity_node
-from graph.nodes.solution import solution_node
+from graph.nodes.intake import intake_node, aintake_node
+from graph.nodes.hypothesis import hypothesis_node, ahypothesis_node
+from graph.nodes.validation import validation_node, avalidation_node
+from graph.nodes.severity import severity_node, aseverity_node
+from graph.nodes.solution import solution_node, asolution_node
 from graph.edges import (
+    route_turn,
     check_intake_complete,
     check_validation_outcome,
     check_severity_complete
 )
+from api import tracing
+
+# 노드 이름 -> 상담 단계 번호 (span 속성)
+NODE_STAGES = {"intake": 1, "hypothesis": 2, "validation": 3, "severity": 4, "solution": 5}
+
+
+def _traced_node(name: str, func, afunc) -> RunnableLambda:
+    """
+    sync/async 노드 함수를 span(node.<이름>)으로 감싼 RunnableLambda 생성
+    노드 안의 LLM / RAG 호출 시간은 api.tracing.add()로 이 span에 누적된다. (GRAPH_TRACE=1일 때만 기록)
+    """
+    def _attributes(state, config: RunnableConfig):
+        configurable = (config or {}).get("configurable") or {}
+        return {
+            "kind": "node",
+            "node": name,
+            "stage": NODE_STAGES.get(name),
+            "thread_id": configurable.get("thread_id"),
+            "messages": len(state.get("messages") or ()),
+        }
+
+    def run(state, config: RunnableConfig = None):
+        with tracing.span(f"node.{name}", **_attributes(state, config)):
+            return func(state)
+
+    async def arun(state, config: RunnableConfig = None):
+        with tracing.span(f"node.{name}", **_attributes(state, config)):
+            return await afunc(state)
+
+    return RunnableLambda(run, afunc=arun, name=name)
+
 
 def build_graph(checkpointer=None):
     """
@@ -22,22 +55,32 @@ def build_graph(checkpointer=None):
                         -> (확률 높음) -> Severity
     4. Severity (반복) -> (완료 시) -> Solution
     5. Solution (자동) -> END
+    각 턴은 진행 중인 단계(Intake / Validation / Severity)에서 시작 (edges.route_turn)
     """
     
     # 1. 그래프 초기화
     workflow = StateGraph(CounselingState)
     
     # 2. 노드 추가
-    workflow.add_node("intake", intake_node)
-    workflow.add_node("hypothesis", hypothesis_node)
-    workflow.add_node("validation", validation_node)
-    workflow.add_node("severity", severity_node)
-    workflow.add_node("solution", solution_node)
+    # sync/async 구현을 함께 등록: invoke/stream은 sync 함수, ainvoke/astream은 async 함수를 사용
+    # 각 노드는 추적 span으로 감쌈 (api.tracing, GRAPH_TRACE=1일 때만 기록)
+    workflow.add_node("intake", _traced_node("intake", intake_node, aintake_node))
+    workflow.add_node("hypothesis", _traced_node("hypothesis", hypothesis_node, ahypothesis_node))
+    workflow.add_node("validation", _traced_node("validation", validation_node, avalidation_node))
+    workflow.add_node("severity", _traced_node("severity", severity_node, aseverity_node))
+    workflow.add_node("solution", _traced_node("solution", solution_node, asolution_node))
     
     # 3. 엣지 연결
     
-    # 시작점 -> Intake
-    workflow.set_entry_point("intake")
+    # 시작점 -> 진행 중인 단계 (첫 턴 / 정보 수집 중이면 Intake)
+    workflow.set_conditional_entry_point(
+        route_turn,
+        {
+            "intake": "intake",
+            "validation": "validation",
+            "severity": "severity"
+        }
+    )
     
     # Intake -> (조건부) -> Hypothesis or END(대기)
     workflow.add_conditional_edges(
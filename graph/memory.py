@@ -0,0 +1,93 @@
+from typing import Any, Dict, List
+
+from langchain_core.messages import HumanMessage
+from graph.state import CounselingState
+from frontend.gemini_api import ask_gemini, ask_gemini_async
+from frontend.prompt_registry import get_prompt_registry
+
+# -----------------------------
+# 대화 메모리: 롤링 요약 + 최근 메시지 창
+# - 프롬프트에는 최근 RECENT_WINDOW개의 메시지를 원문으로 넣고,
+#   그보다 오래된 메시지는 State의 conversation_summary에 누적 요약해 둔다.
+# - 요약되지 않은 오래된 메시지가 SUMMARY_REFRESH_MESSAGES개 이상 쌓이면 요약을 갱신
+#   (매 턴이 아니라 몇 턴에 한 번만 LLM 호출)
+# - 창 밖으로 밀려났지만 아직 요약되지 않은 메시지는 요약될 때까지 원문으로 함께 전달 (누락 없음)
+# -----------------------------
+RECENT_WINDOW = 5               # 원문으로 넣는 최근 메시지 수 (요약 전 메시지는 추가로 포함)
+SUMMARY_REFRESH_MESSAGES = 6    # 3턴(사용자 + 상담사) 분량
+
+
+def to_history(messages: List[Any]) -> List[Dict[str, str]]:
+    """LangChain 메시지를 ask_gemini용 히스토리({"role", "content"})로 변환"""
+    return [
+        {"role": "user" if isinstance(m, HumanMessage) else "model", "content": m.content}
+        for m in messages
+    ]
+
+
+def recent_history(
+    messages: List[Any], summarized_count: int = 0, include_last: bool = False, window: int = RECENT_WINDOW,
+) -> List[Dict[str, str]]:
+    """
+    요약에 반영되지 않은 메시지를 히스토리로 변환 (최소 최근 window개, 최대 window + SUMMARY_REFRESH_MESSAGES - 1개)
+    summarized_count: State의 summarized_message_count (앞에서부터 요약된 메시지 수)
+    include_last=False면 마지막 메시지(현재 사용자 입력)는 제외
+    """
+    previous = messages if include_last else messages[:-1]
+    if not window:
+        return to_history(previous)
+    start = min(summarized_count or 0, max(len(previous) - window, 0))
+    return to_history(previous[start:])
+
+
+def _pending(state: CounselingState):
+    # 최근 창 밖으로 밀려났지만 아직 요약에 반영되지 않은 메시지 구간
+    previous = (state.get("messages") or [])[:-1]
+    start = state.get("summarized_message_count") or 0
+    end = max(len(previous) - RECENT_WINDOW, 0)
+    return previous[start:end], end
+
+
+def _summary_prompt(previous_summary: str, new_messages: List[Any]) -> str:
+    instructions = get_prompt_registry().prompt("conversation_summary") or "이전 요약과 새 대화를 합쳐 한국어 글머리표로 요약하세요."
+    lines = "\n".join(
+        f"{'사용자' if h['role'] == 'user' else '상담사'}: {h['content']}" for h in to_history(new_messages)
+    )
+    return f"""{instructions}
+
+## Previous Summary
+{previous_summary or "(없음)"}
+
+## New Messages
+{lines}
+"""
+
+
+def _summary_update(text: str, end: int) -> Dict[str, Any]:
+    # ask_gemini는 실패 시 오류 문구를 반환하므로, 그 경우 기존 요약을 유지하고 다음 턴에 다시 시도
+    text = (text or "").strip()
+    if not text or text.startswith("오류가 발생했습니다"):
+        print(f"[Memory] 요약 갱신 실패, 기존 요약 유지: {text[:100]}")
+        return {}
+    return {"conversation_summary": text, "summarized_message_count": end}
+
+
+def refresh_summary(state: CounselingState) -> Dict[str, Any]:
+    """
+    요약 갱신이 필요하면 LLM으로 요약을 갱신하고 State 업데이트를 반환 (필요 없으면 빈 dict)
+    """
+    pending, end = _pending(state)
+    if len(pending) < SUMMARY_REFRESH_MESSAGES:
+        return {}
+    prompt = _summary_prompt(state.get("conversation_summary") or "", pending)
+    # context="" : 기본 context 파일을 붙이지 않고 프롬프트만 전달
+    return _summary_update(ask_gemini(prompt, context=""), end)
+
+
+async def arefresh_summary(state: CounselingState) -> Dict[str, Any]:
+    """refresh_summary의 async 버전"""
+    pending, end = _pending(state)
+    if len(pending) < SUMMARY_REFRESH_MESSAGES:
+        return {}
+    prompt = _summary_prompt(state.get("conversation_summary") or "", pending)
+    return _summary_update(await ask_gemini_async(prompt, context=""), end)
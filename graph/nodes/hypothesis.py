@@ -1,8 +1,10 @@
 from typing import Dict, Any, List
+import asyncio
 import json
 from langchain_core.messages import AIMessage
 from graph.state import CounselingState
 from api.rag_service import retrieve_candidates
+from graph.prefetch import GRAPH_SPECULATIVE_HYPOTHESIS, prefetch_solutions, reconcile_candidates
 
 def hypothesis_node(state: CounselingState) -> Dict[str, Any]:
     """
@@ -29,12 +31,16 @@ def hypothesis_node(state: CounselingState) -> Dict[str, Any]:
     # 2. RAG 검색 수행
     # api.rag_service.retrieve_candidates 함수 사용
     # top_k=12 (검색 문서 수), diag_top_n=3 (최종 후보 질환 수)
+    # 점진 검색 모드면 Intake 중 미리 조회한 criteria를 재사용하고 나머지만 조회
     try:
-        rag_result = retrieve_candidates(
-            symptom_text=intake_summary,
-            top_k=12,
-            diag_top_n=3
-        )
+        if GRAPH_SPECULATIVE_HYPOTHESIS:
+            rag_result = reconcile_candidates(state, intake_summary, top_k=12, diag_top_n=3)
+        else:
+            rag_result = retrieve_candidates(
+                symptom_text=intake_summary,
+                top_k=12,
+                diag_top_n=3
+            )
     except Exception as e:
         print(f"RAG 검색 중 오류 발생: {e}")
         return {
@@ -82,16 +88,40 @@ def hypothesis_node(state: CounselingState) -> Dict[str, Any]:
     
     # 사용자에게 보여줄 메시지 구성 (선택 사항, 보통 이 단계는 내부 처리 후 바로 넘어감)
     # 하지만 LangGraph 흐름상 메시지를 추가하는 것이 자연스러움
+    # Validation / Severity 턴이 진행되는 동안 후보별 Solution 검색을 미리 시작
+    prefetch_solutions(candidates, intake_summary)
+
     report_text = "\n".join(formatted_report_parts)
     result_message = f"증상 분석 결과, 다음 {len(candidates)}가지 질환이 의심됩니다:\n\n{report_text}\n\n이제 각 질환에 대한 정밀 검증을 시작합니다."
 
     # 4. 결과 반환
+    # 점진 검색 후보는 최종 후보와 한 번 비교(reconcile_candidates)한 뒤 비움 (일치율 메트릭은 세션당 한 번)
+    speculative = {"speculative_candidates": None, "speculative_pending": None} if GRAPH_SPECULATIVE_HYPOTHESIS else {}
+
+    # Hypothesis가 실행되면 (Re-)Intake는 끝난 것이므로 재탐색 모드 해제
+    # Re-Intake 후 후보가 이전과 같으면 안내 메시지 / 검증 진행 상황을 그대로 둠
+    if candidates == (state.get("hypothesis_candidates") or None):
+        return {"hypothesis_criteria": criteria_list, "hypothesis_candidates": candidates, "is_re_intake": False, **speculative}
+
     return {
+        **speculative,
         "messages": [AIMessage(content=result_message)],
         "hypothesis_criteria": criteria_list,
+        "hypothesis_candidates": candidates,
+        "is_re_intake": False,
+        # 후보가 바뀌면 새 후보로 검증을 처음부터 다시 진행
+        "validation_plan": None,
+        "validation_answers": None,
         # 다음 단계를 위해 의심 질환 리스트도 어딘가에 저장하면 좋겠지만, 
         # 현재 State 정의에는 명시적인 'candidate_diseases' 필드가 없음.
         # 필요하다면 criteria_list에서 파싱하거나 state.py를 수정해야 함.
         # 일단은 criteria_list에 질환명이 포함되어 있으므로 이를 활용.
     }
 
+
+async def ahypothesis_node(state: CounselingState) -> Dict[str, Any]:
+    """
+    hypothesis_node의 async 버전
+    - RAG 검색(임베딩 + 벡터 검색)은 블로킹 작업이므로 스레드에서 실행하여 이벤트 루프를 막지 않음
+    """
+    return await asyncio.to_thread(hypothesis_node, state)
@@ -1,82 +1,80 @@
 import json
 import os
-from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from langchain_core.messages import HumanMessage, AIMessage
 from graph.state import CounselingState
-from frontend.gemini_api import ask_gemini
-from frontend.context_handler import load_context_from_file
+from graph.memory import recent_history, refresh_summary, arefresh_summary
+from frontend.gemini_api import ask_gemini_streaming, ask_gemini_streaming_async
+from frontend.prompt_registry import get_prompt_registry, STAGE_FILES
+from graph.structured import IntakeOutput, format_instructions, resolve, aresolve
+from graph.prefetch import speculate_hypothesis
+from graph.domain_detector import INTAKE_DOMAIN_DETECTOR, detect_domain, domain_guide
 
-def intake_node(state: CounselingState) -> Dict[str, Any]:
+# INTERNAL_DATA 출력 형식 (IntakeOutput 스키마)
+INTAKE_OUTPUT_FORMAT = format_instructions(IntakeOutput)
+START_TRIGGER = "상담을 시작합니다."
+
+def _prepare_intake(state: CounselingState) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
-    Intake Stage (1단계) 처리 노드
-    - 필수 정보 수집
-    - 도메인 심화 질문
-    - Re-Intake 처리
+    Intake 프롬프트 구성 (Intake는 매 턴 LLM 응답이 필요하므로 요청 인자는 항상 반환)
+    Returns: (LLM 요청 인자, 부분 결과)
     """
     
     # 1. 메시지 히스토리 준비
     messages = state['messages']
+    from_user = False
     if not messages:
         # 초기 진입 시 (메시지가 없을 경우)
-        user_input = "상담을 시작합니다." #내부 트리거, 사용자가 입력하는건 아님.
+        user_input = START_TRIGGER #내부 트리거, 사용자가 입력하는건 아님.
     else:
         last_message = messages[-1] #마지막 사용자 메세지 추출
         if isinstance(last_message, HumanMessage):
             user_input = last_message.content
+            from_user = True
         else:
             # 시스템이나 AI 메시지가 마지막인 경우 (드물지만 방어 코드)
             user_input = "계속 진행해주세요."
             
-    # Gemini API용 히스토리 변환
-    history = []
-    for msg in messages:
-        role = "user" if isinstance(msg, HumanMessage) else "model"
-        history.append({"role": role, "content": msg.content})
+    # Gemini API용 히스토리 변환 (요약되지 않은 최근 대화만 변환, 그 이전은 conversation_summary로 전달)
+    previous_history = recent_history(messages, state.get("summarized_message_count"))
     
     # 2. 현재 상태 확인
     domain_active = state.get('domain_questions_active', False)
     current_domain = state.get('current_domain', None)
     is_re_intake = state.get('is_re_intake', False)
-    
-    # 3. 프롬프트 및 컨텍스트 로드
-    # 프롬프트 파일 경로 (프로젝트 루트 기준)
-    prompt_path = Path("prompts/stage1_intake.md")
-    try:
-        if prompt_path.exists():
-            with open(prompt_path, "r", encoding="utf-8") as f:
-                base_prompt = f.read()
-        else:
-            base_prompt = "기본 프롬프트 로드 실패: 파일을 찾을 수 없습니다."
-    except Exception as e:
-        base_prompt = f"기본 프롬프트 로드 중 오류 발생: {e}"
 
-    context_data = {}
-    
-    # (1) 필수 정보 Context
-    intake_context = load_context_from_file("stage_specific/context_stage1_intake.json")
-    if intake_context:
+    # 로컬 도메인 감지 (graph.domain_detector): 심화 질문 중이 아니면 발화를 도메인 임베딩과 비교
+    updates: Dict[str, Any] = {}
+    local_domain = INTAKE_DOMAIN_DETECTOR
+    if local_domain and from_user and not domain_active:
         try:
-            context_data["mandatory_fields"] = json.loads(intake_context)
-        except json.JSONDecodeError:
-            context_data["mandatory_fields"] = intake_context
+            detected = detect_domain(user_input, exclude=state.get("explored_domains") or ())
+        except Exception as e:
+            # 임베딩 모델을 쓸 수 없으면 기존처럼 LLM이 도메인을 감지
+            print(f"도메인 감지 오류 (LLM 감지로 대체): {e}")
+            local_domain = False
+            detected = None
+        if detected:
+            domain_active, current_domain = True, detected[0]
+            updates = {"domain_questions_active": True, "current_domain": current_domain}
     
-    # (2) 도메인 정보 Context
-    domains_context = load_context_from_file("stage_specific/context_stage1_domains.json")
-    if domains_context:
-        try:
-            context_data["domains_info"] = json.loads(domains_context)
-        except json.JSONDecodeError:
-            context_data["domains_info"] = domains_context
-    
-    # (3) Re-Intake Context
+    # 3. 프롬프트 및 컨텍스트 로드 (레지스트리에 preload된 값 사용)
+    registry = get_prompt_registry()
+    base_prompt = registry.prompt("stage1_intake")
+    if base_prompt is None:
+        base_prompt = "기본 프롬프트 로드 실패: 파일을 찾을 수 없습니다."
+
+    # (1) 필수 정보 Context / (2) 도메인 정보 Context / (3) Re-Intake Context
+    _, stage_contexts = STAGE_FILES["intake"]
+    # 로컬 감지를 쓰면 13개 도메인 목록 대신 진행 중인 도메인의 가이드만 전달
+    context_keys = ["mandatory_fields"] if local_domain else ["mandatory_fields", "domains_info"]
     if is_re_intake:
-        re_intake_context = load_context_from_file("stage_specific/context_stage1_re_intake.json")
-        if re_intake_context:
-            try:
-                context_data["re_intake_guide"] = json.loads(re_intake_context)
-            except json.JSONDecodeError:
-                context_data["re_intake_guide"] = re_intake_context
+        context_keys.append("re_intake_guide")
+
+    if local_domain:
+        detection_instruction = "**도메인 감지**: 도메인 감지는 시스템이 수행합니다. `domain_detected`는 출력하지 마세요. 심화 질문 모드일 때는 아래 '현재 도메인 가이드'를 참고해 질문하세요."
+    else:
+        detection_instruction = "**도메인 감지**: 사용자의 발언에서 '13개 도메인' 중 하나와 관련된 강력한 징후가 발견되면, `domain_detected`에 도메인명을 출력하세요."
 
     # 4. System Prompt 구성 (LLM 지시사항)
     system_instructions = f"""
@@ -88,72 +86,67 @@ def intake_node(state: CounselingState) -> Dict[str, Any]:
 - **현재 탐색 중인 도메인**: {current_domain if current_domain else "없음"}
 
 ## 동적 지시사항
-1. **도메인 감지**: 사용자의 발언에서 '13개 도메인' 중 하나와 관련된 강력한 징후가 발견되면, `---INTERNAL_DATA---` 섹션에 `DOMAIN_DETECTED: [도메인명]`을 출력하세요.
-2. **도메인 질문 완료**: 도메인 심화 질문이 충분히 이루어졌다고 판단되면, `DOMAIN_COMPLETED: True`를 출력하여 일반 필수 정보 수집으로 복귀하세요.
-3. **필수 정보 수집 완료**: 5가지 필수 정보가 모두 충분히 수집되었다면, `Summary String:` 태그 뒤에 요약 리포트를 작성하세요.
+1. {detection_instruction}
+2. **도메인 질문 완료**: 도메인 심화 질문이 충분히 이루어졌다고 판단되면, `domain_completed`를 true로 출력하여 일반 필수 정보 수집으로 복귀하세요.
+3. **필수 정보 수집 완료**: 5가지 필수 정보가 모두 충분히 수집되었다면, `summary_string`에 요약 리포트를 작성하세요.
 
 ## 출력 형식 (엄격 준수)
-먼저 사용자에게 보낼 공감적이고 자연스러운 응답을 작성하세요. 그 후, 시스템 처리를 위한 데이터는 반드시 `---INTERNAL_DATA---` 구분선 아래에 작성하세요.
+먼저 사용자에게 보낼 공감적이고 자연스러운 응답을 작성하세요.
 
-[사용자에게 보낼 응답 메시지]
-
----INTERNAL_DATA---
-DOMAIN_DETECTED: [도메인명] (선택사항)
-DOMAIN_COMPLETED: [True] (선택사항)
-Summary String:
-[요약 리포트 내용]
+{INTAKE_OUTPUT_FORMAT}
 """
 
-    # Context 문자열 변환
-    context_str = json.dumps(context_data, ensure_ascii=False, indent=2)
+    # Context 문자열 변환 (파일이 바뀌지 않았다면 캐시된 직렬화 결과 재사용)
+    context_str = registry.compose_json({k: stage_contexts[k] for k in context_keys})
+    guide = domain_guide(current_domain) if local_domain and domain_active else None
+    if guide:
+        context_str += f"\n\n## 현재 도메인 가이드\n{json.dumps(guide, ensure_ascii=False, indent=2)}"
     
     # 5. LLM 호출
     # ask_gemini에 system_instructions와 context_str을 합쳐서 전달
     full_context = f"{system_instructions}\n\n## 참고할 Context Data\n{context_str}"
     
-    # 히스토리에서 마지막 사용자 메시지 제거 (ask_gemini 내부 로직과의 중복 방지 및 명확성 위해)
-    # ask_gemini는 user_input을 prompt에 포함시키므로 history에는 이전 대화만 남기는 게 좋음
-    previous_history = history[:-1] if history else []
-    
-    response_text = ask_gemini(
-        user_input=user_input,
-        context=full_context,
-        conversation_history=previous_history
-    )
-    
-    # 6. 응답 파싱 및 State 업데이트
-    user_message = response_text
-    internal_data = ""
-    new_state = {}
-    
-    if "---INTERNAL_DATA---" in response_text:
-        parts = response_text.split("---INTERNAL_DATA---")
-        user_message = parts[0].strip()
-        internal_data = parts[1].strip()
+    request = {
+        "user_input": user_input,
+        "context": full_context,
+        "conversation_history": previous_history,
+        "conversation_summary": state.get("conversation_summary"),
+        # 응답 캐시는 디스크에 남고 세션 / 사용자 간에 공유되므로 사용자 발화로 만든 프롬프트는 저장하지 않음
+        # 고정된 시작 트리거("상담을 시작합니다.")로 여는 첫 턴(히스토리 없음)만 허용
+        "cache": user_input == START_TRIGGER and not previous_history and not state.get("conversation_summary"),
+    }
+    return request, {
+        "updates": updates,
+        # Re-Intake로 넘어온 턴(마지막 메시지가 Validation 안내)은 추가 질문만 하고, 요약은 사용자가 답한 뒤에 받음
+        "accept_summary": from_user or not is_re_intake,
+        "local_domain": local_domain,
+        "current_domain": current_domain,
+        "explored_domains": list(state.get("explored_domains") or []),
+    }
+
+
+def _finish_intake(user_message: str, output: Optional[IntakeOutput], partial: Dict[str, Any]) -> Dict[str, Any]:
+    """검증된 IntakeOutput으로 State 업데이트 생성"""
+    # 6. State 업데이트
+    new_state = dict(partial.get("updates") or {})
     
-    # (1) 도메인 감지 처리
-    if "DOMAIN_DETECTED:" in internal_data:
-        for line in internal_data.split('\n'):
-            if "DOMAIN_DETECTED:" in line:
-                detected_domain = line.replace("DOMAIN_DETECTED:", "").strip()
-                if detected_domain and detected_domain.lower() != "none":
-                    new_state["domain_questions_active"] = True
-                    new_state["current_domain"] = detected_domain
-                    # 도메인 감지됨 로그 (선택사항)
-                    # print(f"도메인 감지됨: {detected_domain}")
-                    break
+    if output is not None:
+        # (1) 도메인 감지 처리 (로컬 감지를 쓰면 LLM 출력은 무시)
+        detected_domain = (output.domain_detected or "").strip()
+        if not partial.get("local_domain") and detected_domain and detected_domain.lower() != "none":
+            new_state["domain_questions_active"] = True
+            new_state["current_domain"] = detected_domain
                     
-    # (2) 도메인 질문 완료 처리
-    if "DOMAIN_COMPLETED: True" in internal_data:
-        new_state["domain_questions_active"] = False
-        new_state["current_domain"] = None
-        
-    # (3) Summary String (필수 정보 수집 완료) 처리
-    if "Summary String:" in internal_data:
-        summary_parts = internal_data.split("Summary String:")
-        if len(summary_parts) > 1:
-            summary_content = summary_parts[1].strip()
-            new_state["intake_summary_report"] = summary_content
+        # (2) 도메인 질문 완료 처리 (마친 도메인은 다시 감지하지 않음)
+        if output.domain_completed:
+            if partial.get("current_domain"):
+                new_state["explored_domains"] = [*partial.get("explored_domains", ()), partial["current_domain"]]
+            new_state["domain_questions_active"] = False
+            new_state["current_domain"] = None
+            
+        # (3) Summary String (필수 정보 수집 완료) 처리
+        if partial.get("accept_summary", True) and output.summary_string and output.summary_string.strip():
+            new_state["intake_summary_report"] = output.summary_string.strip()
     
     # 7. 결과 반환
     return {
@@ -161,3 +154,28 @@ Summary String:
         **new_state
     }
 
+
+def intake_node(state: CounselingState) -> Dict[str, Any]:
+    """
+    Intake Stage (1단계) 처리 노드
+    - 필수 정보 수집
+    - 도메인 심화 질문
+    - Re-Intake 처리
+    """
+    memory = refresh_summary(state)
+    request, partial = _prepare_intake({**state, **memory})
+    user_message, output = resolve(IntakeOutput, "intake", ask_gemini_streaming(**request))
+    result = _finish_intake(user_message, output, partial)
+    # (선택) 진행 중인 대화로 Hypothesis 후보를 백그라운드에서 미리 검색
+    return {**memory, **result, **speculate_hypothesis(state, result)}
+
+
+async def aintake_node(state: CounselingState) -> Dict[str, Any]:
+    """
+    intake_node의 async 버전 (Gemini 비동기 API 사용, 이벤트 루프를 막지 않음)
+    """
+    memory = await arefresh_summary(state)
+    request, partial = _prepare_intake({**state, **memory})
+    user_message, output = await aresolve(IntakeOutput, "intake", await ask_gemini_streaming_async(**request))
+    result = _finish_intake(user_message, output, partial)
+    return {**memory, **result, **speculate_hypothesis(state, result)}
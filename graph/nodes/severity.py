@@ -1,18 +1,23 @@
 import json
-from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from langchain_core.messages import HumanMessage, AIMessage
 from graph.state import CounselingState
-from frontend.gemini_api import ask_gemini
-from frontend.context_handler import load_context_from_file
+from graph.memory import recent_history, refresh_summary, arefresh_summary
+from frontend.gemini_api import ask_gemini_streaming, ask_gemini_streaming_async
+from frontend.prompt_registry import get_prompt_registry
+from rag.taxonomy import severity_context_file
+from graph.structured import SeverityOutput, format_instructions, resolve, aresolve
+from graph.prefetch import attach_prefetched
+from graph.severity_scale import SEVERITY_LLM_WRAP, load_scale, question_message, result_string
+from graph.validation_bank import question_context
 
-def severity_node(state: CounselingState) -> Dict[str, Any]:
+# INTERNAL_DATA 출력 형식 (SeverityOutput 스키마)
+SEVERITY_OUTPUT_FORMAT = format_instructions(SeverityOutput)
+
+def _prepare_severity(state: CounselingState) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
     """
-    Severity Stage (4단계) 처리 노드
-    - 확정된 1개 질환에 대한 심각도 평가 수행
-    - 질환별 특화된 심각도 컨텍스트 로드 (있는 경우)
-    - 질문 생성 및 응답 수집 루프
-    - 최종 심각도 평가 결과 생성
+    Severity 프롬프트 구성
+    Returns: (LLM 요청 인자, 부분 결과) — 요청 인자가 None이면 부분 결과를 그대로 반환
     """
     
     messages = state['messages']
@@ -22,44 +27,25 @@ def severity_node(state: CounselingState) -> Dict[str, Any]:
     # 1. 확정된 질환명 확인
     target_diagnosis = state.get("severity_diagnosis")
     if not target_diagnosis:
-        return {"messages": [AIMessage(content="오류: 심각도 평가 대상 질환이 설정되지 않았습니다.")]}
+        return None, {"messages": [AIMessage(content="오류: 심각도 평가 대상 질환이 설정되지 않았습니다.")]}
+
+    # 채점 정의가 있는 척도는 문항을 순서대로 묻고 로컬에서 채점
+    scale_turn = _prepare_scale_turn(state, target_diagnosis, user_input)
+    if scale_turn is not None:
+        return scale_turn
     
-    # 2. 질환별 심각도 Context 동적 로드 시도
-    # 예: "Depression" -> "contexts/diseases/depression.json"
-    # 파일명이 일치하지 않을 수 있으므로 키워드 매칭 시도하거나, 
-    # 단순히 기본 심각도 가이드라인만 사용할 수도 있음.
-    # 여기서는 간단한 매핑 로직 예시 적용
+    # 2. 질환별 심각도 Context 로드
+    # 예: "Major Depressive Disorder" -> "contexts/diseases/depression.json"
+    # 질환명 → 파일 매핑은 rag/taxonomy.py에 컴파일된 dict에서 조회
     
     disease_context = ""
     try:
-        # 질환명에서 핵심 단어 추출 (간단히 소문자화하여 파일 찾기 시도)
-        # 실제로는 더 정교한 매핑이 필요할 수 있음 (Mapping DB 등)
-        # 여기서는 contexts/diseases/ 폴더를 검색
-        disease_key = target_diagnosis.split()[0].lower() # 첫 단어 사용 (예: "Depressive" -> "depressive")
-        
-        # 매핑 테이블 (예시)
-        mapping = {
-            "depressive": "depression.json",
-            "depression": "depression.json",
-            "anxiety": "anxiety.json",
-            "bipolar": "bipolar.json",
-            "schizophrenia": "schizophrenia.json",
-            "adhd": "adhd.json",
-            "ocd": "ocd.json",
-            "panic": "anxiety.json", # 예시
-            "substance": "substance.json"
-        }
-        
-        filename = mapping.get(disease_key)
-        if not filename:
-            # 파일명 직접 매칭 시도
-            filename = f"{disease_key}.json"
-            
-        loaded_context = load_context_from_file(f"diseases/{filename}")
+        filename = severity_context_file(target_diagnosis)
+        loaded_context = get_prompt_registry().context_text(f"diseases/{filename}") if filename else ""
         if loaded_context:
             disease_context = loaded_context
         else:
-            # 파일을 못 찾은 경우: 일반적인 심각도 평가 가이드 사용
+            # 해당 질환의 척도 파일이 없는 경우: 일반적인 심각도 평가 가이드 사용
             disease_context = "(해당 질환의 특화된 심각도 척도 파일이 없어, 일반적인 증상 강도와 빈도를 기준으로 평가합니다.)"
             
     except Exception as e:
@@ -67,18 +53,12 @@ def severity_node(state: CounselingState) -> Dict[str, Any]:
         disease_context = "(심각도 컨텍스트 로드 실패)"
 
     # 3. 프롬프트 로드
-    prompt_path = Path("prompts/stage4_severity.md")
-    try:
-        if prompt_path.exists():
-            with open(prompt_path, "r", encoding="utf-8") as f:
-                base_prompt = f.read()
-        else:
-            base_prompt = "기본 프롬프트 로드 실패"
-    except Exception as e:
-        base_prompt = f"프롬프트 로드 오류: {e}"
+    base_prompt = get_prompt_registry().prompt("stage4_severity")
+    if base_prompt is None:
+        base_prompt = "기본 프롬프트 로드 실패"
         
     # 4. 공통 Severity Context 로드
-    common_severity_context = load_context_from_file("stage_specific/context_stage4_severity.json")
+    common_severity_context = get_prompt_registry().context_text("stage_specific/context_stage4_severity.json")
 
     # 5. 시스템 지시사항 구성
     system_instructions = f"""
@@ -97,44 +77,127 @@ def severity_node(state: CounselingState) -> Dict[str, Any]:
 2. **평가 완료 단계**: 충분한 정보가 모였다면, 심각도 평가 결과를 도출하고 아래 형식으로 출력하세요.
 
 ## 출력 제어
-- 질문 진행 중일 때는 사용자에게 자연스럽게 대화하세요.
-- 평가가 완료되면, 반드시 `---INTERNAL_DATA---` 섹션에 결과를 출력하세요.
+- 질문 진행 중일 때는 사용자에게 자연스럽게 대화하세요. 이때는 내부 데이터를 출력하지 마세요.
+- 평가가 완료되면, 반드시 내부 데이터에 결과를 출력하세요. (`diagnosis`는 "{target_diagnosis}")
 
----INTERNAL_DATA---
-Severity Result String: [심각도 평가 결과 텍스트 요약]
-Severity JSON: {{"diagnosis": "{target_diagnosis}", "level": "...", "score": "..."}}
-"""
+{SEVERITY_OUTPUT_FORMAT}"""
 
     # 6. LLM 호출
     # ask_gemini 사용 (히스토리 포함)
-    history = [{"role": "user" if isinstance(m, HumanMessage) else "model", "content": m.content} for m in messages]
-    previous_history = history[:-1] if history else []
-    
-    response_text = ask_gemini(
-        user_input=user_input if user_input else f"{target_diagnosis}에 대한 심각도 평가를 시작합니다.",
-        context=system_instructions, # context 인자에 시스템 프롬프트 전체를 넘김
-        conversation_history=previous_history
-    )
+    previous_history = recent_history(messages, state.get("summarized_message_count"))
     
-    # 7. 응답 파싱 및 State 업데이트
-    user_message = response_text
-    internal_data = ""
-    new_state = {}
-    
-    if "---INTERNAL_DATA---" in response_text:
-        parts = response_text.split("---INTERNAL_DATA---")
-        user_message = parts[0].strip()
-        internal_data = parts[1].strip()
-        
-    if "Severity Result String:" in internal_data:
-        result_string = internal_data.split("Severity Result String:")[1].split("Severity JSON:")[0].strip()
-        new_state["severity_result_string"] = result_string
+    request = {
+        "user_input": user_input if user_input else f"{target_diagnosis}에 대한 심각도 평가를 시작합니다.",
+        "context": system_instructions, # context 인자에 시스템 프롬프트 전체를 넘김
+        "conversation_history": previous_history,
+        "conversation_summary": state.get("conversation_summary"),
+    }
+    return request, {}
+
+
+def _prepare_scale_turn(state: CounselingState, target_diagnosis: str, user_input: str) -> Optional[Tuple[Optional[Dict[str, Any]], Dict[str, Any]]]:
+    """
+    척도 경로: 직전 문항의 답을 기록하고 다음 문항 전달 (또는 채점 결과) 구성
+    질환 척도에 채점 정의가 없으면 None (기존 LLM 평가 경로)
+    """
+    scale = load_scale(target_diagnosis)
+    if scale is None:
+        return None
+    answers = state.get("severity_answers")
+    unclear = False
+    if answers is None:
+        # 척도 시작 턴: 직전 입력은 Validation 단계의 답변이므로 무시
+        answers, user_input = [], ""
+    else:
+        answers = list(answers)
+        score = scale.parse(user_input)
+        if score is None:
+            unclear = True
+        else:
+            answers.append(score)
+    updates: Dict[str, Any] = {"severity_answers": answers}
+
+    if len(answers) >= len(scale.questions):
+        # 모든 문항 완료: 척도 기준으로 채점 (LLM 호출 없음)
+        assessment = scale.score(answers)
+        message = (
+            f"{scale.name} 문항에 모두 답해 주셔서 감사합니다. "
+            f"총점은 {assessment['score']}점({assessment['max_score']}점 만점)으로, '{assessment['level']}' 수준에 해당합니다.\n\n"
+            f"{assessment['implication']}"
+        )
+        if assessment["flags"]:
+            message += "\n\n" + "\n".join(assessment["flags"])
+        updates["severity_assessment"] = {**assessment, "answers": answers}
+        updates["severity_result_string"] = result_string(target_diagnosis, assessment)
+        return None, {"messages": [AIMessage(content=message)], **updates}
+
+    if not SEVERITY_LLM_WRAP:
+        return None, {"messages": [AIMessage(content=question_message(scale, len(answers), unclear))], **updates}
+
+    number = len(answers) + 1
+    request = {
+        "user_input": user_input or f"{target_diagnosis}에 대한 심각도 평가를 시작합니다. 첫 번째 문항을 전달해 주세요.",
+        "context": question_context(scale.questions[len(answers)], number, len(scale.questions), unclear, scale.option_lines()),
+        "conversation_history": recent_history(state['messages'], state.get("summarized_message_count")) if user_input else [],
+        "conversation_summary": state.get("conversation_summary") if user_input else None,
+        # 첫 문항 전달은 같은 척도에 대해 프롬프트가 같으므로 응답 캐시 허용
+        "cache": not user_input,
+    }
+    return request, {"updates": updates, "structured": False}
+
+
+def _resolve(response_text: str, partial: Dict[str, Any]):
+    # 척도 문항 전달 턴은 INTERNAL_DATA가 없으므로 구조화 파싱 생략
+    if partial.get("structured", True):
+        return resolve(SeverityOutput, "severity", response_text)
+    return response_text.strip(), None
+
+
+async def _aresolve(response_text: str, partial: Dict[str, Any]):
+    if partial.get("structured", True):
+        return await aresolve(SeverityOutput, "severity", response_text)
+    return response_text.strip(), None
+
+
+def _finish_severity(user_message: str, output: Optional[SeverityOutput], partial: Dict[str, Any]) -> Dict[str, Any]:
+    """검증된 SeverityOutput으로 State 업데이트 생성"""
+    # 7. State 업데이트
+    new_state = dict(partial.get("updates") or {})
         
-        # JSON 파싱은 선택 사항 (State에 구조화된 데이터 저장 시)
-        # if "Severity JSON:" in internal_data: ...
+    if output is not None and output.result_string and output.result_string.strip():
+        new_state["severity_result_string"] = output.result_string.strip()
         
     return {
         "messages": [AIMessage(content=user_message)],
         **new_state
     }
 
+
+def severity_node(state: CounselingState) -> Dict[str, Any]:
+    """
+    Severity Stage (4단계) 처리 노드
+    - 확정된 1개 질환에 대한 심각도 평가 수행
+    - 질환별 특화된 심각도 컨텍스트 로드 (있는 경우)
+    - 척도에 채점 정의가 있으면 문항을 순서대로 묻고 로컬 채점 (graph.severity_scale)
+    - 질문 생성 및 응답 수집 루프
+    - 최종 심각도 평가 결과 생성
+    """
+    memory = refresh_summary(state)
+    request, partial = _prepare_severity({**state, **memory})
+    if request is None:
+        return {**memory, **attach_prefetched(state), **partial}
+    user_message, output = _resolve(ask_gemini_streaming(**request), partial)
+    # 확정 질환의 Solution 선행 조회가 끝났으면 State에 붙여 둠
+    return {**memory, **attach_prefetched(state), **_finish_severity(user_message, output, partial)}
+
+
+async def aseverity_node(state: CounselingState) -> Dict[str, Any]:
+    """
+    severity_node의 async 버전 (Gemini 비동기 API 사용, 이벤트 루프를 막지 않음)
+    """
+    memory = await arefresh_summary(state)
+    request, partial = _prepare_severity({**state, **memory})
+    if request is None:
+        return {**memory, **attach_prefetched(state), **partial}
+    user_message, output = await _aresolve(await ask_gemini_streaming_async(**request), partial)
+    return {**memory, **attach_prefetched(state), **_finish_severity(user_message, output, partial)}
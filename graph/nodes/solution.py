@@ -1,24 +1,24 @@
+import asyncio
 import json
-from pathlib import Path
-from typing import Dict, Any, List
-from langchain_core.messages import HumanMessage, AIMessage
+from typing import Dict, Any, List, Optional, Tuple
+from langchain_core.messages import AIMessage
 from graph.state import CounselingState
-from frontend.gemini_api import ask_gemini
-from frontend.context_handler import load_context_from_file
+from graph.memory import recent_history, refresh_summary, arefresh_summary
+from frontend.gemini_api import ask_gemini_streaming, ask_gemini_streaming_async
+from frontend.prompt_registry import get_prompt_registry
 from api.rag_service import retrieve_solution
+from graph.prefetch import take_solution
 
-def solution_node(state: CounselingState) -> Dict[str, Any]:
+def _prepare_solution(state: CounselingState) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
     """
-    Solution Stage (5단계) 처리 노드
-    - Intake, Validation, Severity 단계의 결과 통합 요약
-    - RAG 검색을 통한 맞춤형 솔루션 도출
-    - 최종 사용자 응답 생성
+    Solution 프롬프트 구성 (RAG 솔루션 검색 포함)
+    Returns: (LLM 요청 인자, 부분 결과) — 요청 인자가 None이면 부분 결과를 그대로 반환
     """
     
     # 1. 필수 데이터 확인
     diagnosis = state.get("severity_diagnosis")
     if not diagnosis:
-        return {"messages": [AIMessage(content="오류: 최종 진단명이 없습니다.")]}
+        return None, {"messages": [AIMessage(content="오류: 최종 진단명이 없습니다.")]}
         
     intake_summary = state.get("intake_summary_report", "")
     severity_result = state.get("severity_result_string", "")
@@ -33,9 +33,9 @@ def solution_node(state: CounselingState) -> Dict[str, Any]:
     final_summary_string = "\n\n".join(final_summary_parts)
     
     # 2. RAG 솔루션 검색
-    # api.rag_service.retrieve_solution 사용
+    # Validation / Severity 동안 선행 조회한 결과가 있으면 사용, 없으면 api.rag_service.retrieve_solution 직접 호출
     try:
-        rag_result = retrieve_solution(
+        rag_result = take_solution(state) or retrieve_solution(
             diagnosis=diagnosis,
             symptom_text=intake_summary # 증상 텍스트도 함께 제공하여 검색 정확도 향상
         )
@@ -56,17 +56,11 @@ def solution_node(state: CounselingState) -> Dict[str, Any]:
         rag_solution_context = "(관련 솔루션 자료를 찾지 못했습니다. 일반적인 정신 건강 지침을 제공해주세요.)"
 
     # 3. 프롬프트 및 컨텍스트 로드
-    prompt_path = Path("prompts/stage5_solution.md")
-    try:
-        if prompt_path.exists():
-            with open(prompt_path, "r", encoding="utf-8") as f:
-                base_prompt = f.read()
-        else:
-            base_prompt = "기본 프롬프트 로드 실패"
-    except Exception as e:
-        base_prompt = f"프롬프트 로드 오류: {e}"
+    base_prompt = get_prompt_registry().prompt("stage5_solution")
+    if base_prompt is None:
+        base_prompt = "기본 프롬프트 로드 실패"
         
-    solution_context_guide = load_context_from_file("stage_specific/context_stage5_solution.json")
+    solution_context_guide = get_prompt_registry().context_text("stage_specific/context_stage5_solution.json")
 
     # 4. 시스템 지시사항 구성
     system_instructions = f"""
@@ -99,18 +93,48 @@ def solution_node(state: CounselingState) -> Dict[str, Any]:
     # ask_gemini 호출 시 user_input을 빈 문자열이나 지시어로 대체 가능.
     
     messages = state['messages']
-    history = [{"role": "user" if isinstance(m, HumanMessage) else "model", "content": m.content} for m in messages]
-    
-    response_text = ask_gemini(
-        user_input="최종 솔루션 리포트를 작성해주세요.",
-        context=system_instructions,
-        conversation_history=history
-    )
+    history = recent_history(messages, state.get("summarized_message_count"), include_last=True)
     
+    request = {
+        "user_input": "최종 솔루션 리포트를 작성해주세요.",
+        "context": system_instructions,
+        "conversation_history": history,
+        "conversation_summary": state.get("conversation_summary"),
+    }
+    return request, {"final_summary_string": final_summary_string}
+
+
+def _finish_solution(response_text: str, partial: Dict[str, Any]) -> Dict[str, Any]:
+    """LLM 응답 텍스트를 파싱하여 State 업데이트 생성"""
     # 6. 결과 반환
     return {
         "messages": [AIMessage(content=response_text)],
-        "final_summary_string": final_summary_string,
+        "final_summary_string": partial["final_summary_string"],
         "solution_content": response_text
     }
 
+
+def solution_node(state: CounselingState) -> Dict[str, Any]:
+    """
+    Solution Stage (5단계) 처리 노드
+    - Intake, Validation, Severity 단계의 결과 통합 요약
+    - RAG 검색을 통한 맞춤형 솔루션 도출
+    - 최종 사용자 응답 생성
+    """
+    memory = refresh_summary(state)
+    request, partial = _prepare_solution({**state, **memory})
+    if request is None:
+        return {**memory, **partial}
+    return {**memory, **_finish_solution(ask_gemini_streaming(**request), partial)}
+
+
+async def asolution_node(state: CounselingState) -> Dict[str, Any]:
+    """
+    solution_node의 async 버전 (Gemini 비동기 API 사용, 이벤트 루프를 막지 않음)
+    - RAG 솔루션 검색(임베딩 + 벡터 검색)은 블로킹 작업이므로 스레드에서 실행
+    """
+    memory = await arefresh_summary(state)
+    request, partial = await asyncio.to_thread(_prepare_solution, {**state, **memory})
+    if request is None:
+        return {**memory, **partial}
+    return {**memory, **_finish_solution(await ask_gemini_streaming_async(**request), partial)}
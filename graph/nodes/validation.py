@@ -1,19 +1,23 @@
 import json
 import re
-from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from langchain_core.messages import HumanMessage, AIMessage
 from graph.state import CounselingState
-from frontend.gemini_api import ask_gemini
-from frontend.context_handler import load_context_from_file
+from graph.memory import recent_history, refresh_summary, arefresh_summary
+from frontend.gemini_api import ask_gemini_streaming, ask_gemini_streaming_async
+from frontend.prompt_registry import get_prompt_registry
+from graph.structured import DisorderProbability, ValidationOutput, format_instructions, resolve, aresolve
+from graph.prefetch import prefetch_solutions
+from graph.validation_bank import build_plan, parse_answer, question_context
+from graph.validation_scoring import score_disorders, top_disorder
 
-def validation_node(state: CounselingState) -> Dict[str, Any]:
+# INTERNAL_DATA 출력 형식 (ValidationOutput 스키마)
+VALIDATION_OUTPUT_FORMAT = format_instructions(ValidationOutput)
+
+def _prepare_validation(state: CounselingState) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
     """
-    Validation Stage (3단계) 처리 노드
-    - 의심 질환 검증을 위한 5지선다 질문 생성 및 응답 수집
-    - 1턴: 질문 생성 (질환 기준 기반)
-    - 2턴~: 사용자 응답 수집 및 진행
-    - 마지막: 모든 답변 수집 후 확률 계산 및 결과 도출
+    Validation 프롬프트 구성
+    Returns: (LLM 요청 인자, 부분 결과) — 요청 인자가 None이면 부분 결과를 그대로 반환
     """
     
     messages = state['messages']
@@ -23,7 +27,12 @@ def validation_node(state: CounselingState) -> Dict[str, Any]:
     # 상태 정보 가져오기
     hypothesis_criteria = state.get("hypothesis_criteria", [])
     if not hypothesis_criteria:
-         return {"messages": [AIMessage(content="오류: 가설 검증을 위한 기준 데이터가 없습니다. 상담을 초기화해주세요.")]}
+         return None, {"messages": [AIMessage(content="오류: 가설 검증을 위한 기준 데이터가 없습니다. 상담을 초기화해주세요.")]}
+
+    # 질문 은행에 후보 질환이 모두 있으면 은행 질문으로 진행 (LLM은 질문 전달 문장만 생성)
+    bank_turn = _prepare_bank_turn(state, user_input)
+    if bank_turn is not None:
+        return bank_turn
 
     # 질문 리스트가 없으면 새로 생성해야 함 (첫 진입)
     # LangGraph State에는 질문 리스트를 저장할 명시적 필드가 없으므로, 
@@ -41,18 +50,12 @@ def validation_node(state: CounselingState) -> Dict[str, Any]:
     #    (State에 저장하지 않고 대화 맥락으로 유지)
     
     # 프롬프트 로드
-    prompt_path = Path("prompts/stage3_validation.md")
-    try:
-        if prompt_path.exists():
-            with open(prompt_path, "r", encoding="utf-8") as f:
-                base_prompt = f.read()
-        else:
-            base_prompt = "기본 프롬프트 로드 실패"
-    except Exception as e:
-        base_prompt = f"프롬프트 로드 오류: {e}"
+    base_prompt = get_prompt_registry().prompt("stage3_validation")
+    if base_prompt is None:
+        base_prompt = "기본 프롬프트 로드 실패"
 
     # Context 로드
-    validation_context = load_context_from_file("stage_specific/context_stage3_validation.json")
+    validation_context = get_prompt_registry().context_text("stage_specific/context_stage3_validation.json")
     
     # 시스템 지시사항 구성
     # 상황에 따라 프롬프트를 다르게 구성 (질문 생성 vs 결과 분석)
@@ -74,76 +77,172 @@ def validation_node(state: CounselingState) -> Dict[str, Any]:
 3. **(결과 분석)**: 모든 질문에 대한 답변이 수집되었다면, 각 질환별 확률을 계산하고 결과를 도출하세요.
 
 ## 출력 제어
-- **질문 진행 중**: 사용자에게는 한 번에 하나의 질문만 하세요. (5지선다 옵션 포함)
+- **질문 진행 중**: 사용자에게는 한 번에 하나의 질문만 하세요. (5지선다 옵션 포함) 이때는 내부 데이터를 출력하지 마세요.
 - **완료 시**: 
-    - `Validated String:` 태그 뒤에 최종 확정된 질환명(Top 1)을 적으세요. (확률 50% 미만이면 "None" 표기)
-    - `Validation JSON:` 태그 뒤에 각 질환별 계산된 확률 정보를 JSON으로 출력하세요.
+    - `validated`에 최종 확정된 질환명(Top 1)을 적으세요. (확률 50% 미만이면 null)
+    - `probabilities`에 각 질환별 계산된 확률(0.0 ~ 1.0)을 출력하세요.
     
-## Internal Data Format
----INTERNAL_DATA---
-Validated String: [질환명 or None]
-Validation JSON: {"질환A": 0.7, "질환B": 0.4, ...}
-"""
+{VALIDATION_OUTPUT_FORMAT}"""
 
     # LLM 호출
     full_context = f"{system_instructions}\n\n## Context Data\n{validation_context}"
     
     # 히스토리 처리 (ask_gemini 사용)
     # 이전 대화 맥락이 있어야 질문 순서를 기억함
-    history = [{"role": "user" if isinstance(m, HumanMessage) else "model", "content": m.content} for m in messages]
-    previous_history = history[:-1] if history else [] # 현재 user_input 제외
-    
-    response_text = ask_gemini(
-        user_input=user_input if user_input else "Validation 단계를 시작합니다. 질문을 생성해주세요.",
-        context=full_context,
-        conversation_history=previous_history
-    )
+    # 요약되지 않은 최근 대화만 원문으로 전달하고 그 이전 대화는 conversation_summary로 전달 (현재 user_input 제외)
+    previous_history = recent_history(messages, state.get("summarized_message_count"))
     
-    # 응답 파싱
-    user_message = response_text
-    internal_data = ""
-    new_state = {}
-    
-    if "---INTERNAL_DATA---" in response_text:
-        parts = response_text.split("---INTERNAL_DATA---")
-        user_message = parts[0].strip()
-        internal_data = parts[1].strip()
+    request = {
+        "user_input": user_input if user_input else "Validation 단계를 시작합니다. 질문을 생성해주세요.",
+        "context": full_context,
+        "conversation_history": previous_history,
+        "conversation_summary": state.get("conversation_summary"),
+        # 질문 생성 프롬프트에도 대화 히스토리 / 요약이 들어가므로 (공유 디스크) 응답 캐시는 쓰지 않음
+    }
+    return request, {}
+
+
+def _prepare_bank_turn(state: CounselingState, user_input: str) -> Optional[Tuple[Optional[Dict[str, Any]], Dict[str, Any]]]:
+    """
+    질문 은행 경로: 직전 질문의 답을 기록하고 다음 질문 전달 요청을 구성
+    은행을 쓸 수 없으면 None (기존 LLM 질문 생성 경로)
+    """
+    plan = state.get("validation_plan")
+    answers = dict(state.get("validation_answers") or {})
+    updates: Dict[str, Any] = {}
+    unclear = False
+
+    if not plan:
+        plan = build_plan(state.get("hypothesis_candidates") or [])
+        if plan is None:
+            return None
+        answers = {}
+        updates = {"validation_plan": plan, "validation_answers": answers}
+        user_input = ""
+    elif len(answers) < len(plan):
+        score = parse_answer(user_input)
+        if score is None:
+            unclear = True
+        else:
+            answers[plan[len(answers)]["id"]] = score
+            updates["validation_answers"] = answers
+
+    messages = state['messages']
+    if len(answers) >= len(plan):
+        # 모든 질문 완료: 응답 점수로 질환별 확률을 로컬에서 계산 (LLM 호출 없음)
+        probabilities = score_disorders(plan, answers)
+        validated, probability = top_disorder(probabilities)
+        output = ValidationOutput(
+            validated=validated,
+            probabilities=[DisorderProbability(disorder=d, probability=p) for d, p in probabilities.items()],
+        )
+        if validated:
+            message = f"모든 질문에 답해 주셔서 감사합니다. 응답을 바탕으로 '{validated}' 가능성({probability:.0%})을 중심으로 이어서 살펴보겠습니다."
+        else:
+            message = "모든 질문에 답해 주셔서 감사합니다. 아직 한 가지로 좁히기에는 정보가 부족해서, 조금 더 이야기를 나눠 보겠습니다."
+            # Re-Intake 후에는 (후보가 같더라도) 새 질문 순서로 다시 검증
+            updates = {**updates, "validation_plan": None, "validation_answers": None}
+        return None, _finish_validation(message, output, {"updates": updates})
+
+    number = len(answers) + 1
+    request = {
+        "user_input": user_input or "Validation 단계를 시작합니다. 첫 번째 질문을 해주세요.",
+        "context": question_context(plan[len(answers)]["text"], number, len(plan), unclear),
+        "conversation_history": recent_history(messages, state.get("summarized_message_count")) if user_input else [],
+        "conversation_summary": None if not user_input else state.get("conversation_summary"),
+        # 첫 질문 전달은 같은 질문에 대해 프롬프트가 같으므로 응답 캐시 허용
+        "cache": not user_input,
+    }
+    return request, {"updates": updates, "structured": False}
+
+
+def _resolve(response_text: str, partial: Dict[str, Any]):
+    # 질문 전달 턴은 INTERNAL_DATA가 없으므로 구조화 파싱 생략
+    if partial.get("structured", True):
+        return resolve(ValidationOutput, "validation", response_text)
+    return response_text.strip(), None
+
+
+async def _aresolve(response_text: str, partial: Dict[str, Any]):
+    if partial.get("structured", True):
+        return await aresolve(ValidationOutput, "validation", response_text)
+    return response_text.strip(), None
+
+
+def _finish_validation(user_message: str, output: Optional[ValidationOutput], partial: Dict[str, Any]) -> Dict[str, Any]:
+    """검증된 ValidationOutput으로 State 업데이트 생성"""
+    new_state = dict(partial.get("updates") or {})
+    if output is None:
+        return {"messages": [AIMessage(content=user_message)], **new_state}
         
     # 결과 분석 (확률 및 재탐색 여부)
-    if "Validation JSON:" in internal_data:
-        try:
-            json_str = internal_data.split("Validation JSON:")[1].strip()
-            probabilities = json.loads(json_str)
-            new_state["validation_probabilities"] = probabilities
-            
-            # 확률 체크 (모든 질환이 50% 이하인지)
-            # 확률은 0.0 ~ 1.0 범위로 가정 (또는 백분율)
-            # 여기서는 LLM이 어떻게 줄지 모르므로 0.5 또는 50 기준으로 유연하게 판단 필요하지만
-            # 보통 0.0~1.0 스케일을 권장.
-            
-            max_prob = 0.0
-            for prob in probabilities.values():
-                if prob > max_prob:
-                    max_prob = prob
-            
-            # 0.5 이하면 재탐색 (Re-Intake)
-            if max_prob <= 0.5:
-                new_state["is_re_intake"] = True
-                new_state["severity_diagnosis"] = None # 진단 유보
-            else:
-                new_state["is_re_intake"] = False
-                
-        except Exception as e:
-            print(f"Validation JSON 파싱 오류: {e}")
+    if output.probabilities:
+        probabilities = {p.disorder: p.probability for p in output.probabilities}
+        new_state["validation_probabilities"] = probabilities
+        
+        # 확률 체크 (모든 질환이 50% 이하인지)
+        # 확률은 0.0 ~ 1.0 범위 (스키마에 명시)
+        max_prob = max(probabilities.values())
+        
+        # 0.5 이하면 재탐색 (Re-Intake)
+        if max_prob <= 0.5:
+            new_state["is_re_intake"] = True
+            new_state["severity_diagnosis"] = None # 진단 유보
+            # 요약을 비워야 Intake가 새 정보를 받은 뒤에 요약을 다시 만들고, 그때 Hypothesis가 실행됨
+            # (요약이 남아 있으면 같은 턴에 Hypothesis -> 같은 후보 -> 같은 질문으로 돌아감)
+            new_state["intake_summary_report"] = None
+        else:
+            new_state["is_re_intake"] = False
             
-    if "Validated String:" in internal_data:
-        diagnosis = internal_data.split("Validated String:")[1].strip()
-        # "None"이 아니고 재탐색 모드가 아니면 진단명 설정
-        if diagnosis.lower() != "none" and not new_state.get("is_re_intake", False):
-             new_state["severity_diagnosis"] = diagnosis
+    diagnosis = (output.validated or "").strip()
+    # "None"이 아니고 재탐색 모드가 아니면 진단명 설정
+    if diagnosis and diagnosis.lower() != "none" and not new_state.get("is_re_intake", False):
+        new_state["severity_diagnosis"] = diagnosis
+        new_state["severity_answers"] = None  # 새 대상 질환의 척도는 처음부터
         
     return {
         "messages": [AIMessage(content=user_message)],
         **new_state
     }
 
+
+def _prefetch(state: CounselingState, result: Dict[str, Any]):
+    # 후보별 Solution 선행 조회 유지 (재시작 등으로 없어졌으면 다시 시작) + 후보 밖의 확정 질환 추가
+    diagnoses = list(state.get("hypothesis_candidates") or [])
+    if result.get("severity_diagnosis"):
+        diagnoses.append(result["severity_diagnosis"])
+    prefetch_solutions(diagnoses, state.get("intake_summary_report"))
+
+
+def validation_node(state: CounselingState) -> Dict[str, Any]:
+    """
+    Validation Stage (3단계) 처리 노드
+    - 의심 질환 검증을 위한 5지선다 질문 생성 및 응답 수집
+    - 1턴: 질문 생성 (질환 기준 기반)
+    - 2턴~: 사용자 응답 수집 및 진행
+    - 마지막: 모든 답변 수집 후 확률 계산 및 결과 도출
+    """
+    memory = refresh_summary(state)
+    request, partial = _prepare_validation({**state, **memory})
+    if request is None:
+        _prefetch(state, partial)
+        return {**memory, **partial}
+    user_message, output = _resolve(ask_gemini_streaming(**request), partial)
+    result = _finish_validation(user_message, output, partial)
+    _prefetch(state, result)
+    return {**memory, **result}
+
+
+async def avalidation_node(state: CounselingState) -> Dict[str, Any]:
+    """
+    validation_node의 async 버전 (Gemini 비동기 API 사용, 이벤트 루프를 막지 않음)
+    """
+    memory = await arefresh_summary(state)
+    request, partial = _prepare_validation({**state, **memory})
+    if request is None:
+        _prefetch(state, partial)
+        return {**memory, **partial}
+    user_message, output = await _aresolve(await ask_gemini_streaming_async(**request), partial)
+    result = _finish_validation(user_message, output, partial)
+    _prefetch(state, result)
+    return {**memory, **result}
@@ -0,0 +1,247 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from langchain_core.messages import HumanMessage
+from api.metrics import SPECULATIVE_HYPOTHESIS, SPECULATIVE_OVERLAP, record_cache
+from api.rag_service import lookup_criteria, retrieve_solution, vote_candidates
+from frontend.prompt_registry import get_prompt_registry
+
+# -----------------------------
+# Solution RAG 선행 조회 (speculative prefetch)
+# - Hypothesis가 후보 질환을 정하면, Validation / Severity 턴이 진행되는 동안
+#   후보별 retrieve_solution을 백그라운드 스레드에서 미리 실행해 둔다.
+# - Severity 턴에서 확정 질환의 결과가 준비되어 있으면 State(prefetched_solution)에 붙여
+#   Solution 노드가 검색 대기 없이 바로 리포트 생성을 시작하게 한다.
+# - 프로세스 재시작 등으로 결과가 없으면 Solution 노드가 기존처럼 직접 검색한다.
+# -----------------------------
+
+GRAPH_PREFETCH = os.getenv("GRAPH_PREFETCH", "1") != "0"
+GRAPH_PREFETCH_WAIT = float(os.getenv("GRAPH_PREFETCH_WAIT", "10"))  # Solution 노드가 진행 중인 선행 조회를 기다리는 최대 시간 (초)
+_MAX_ENTRIES = 256
+
+CACHE_NAME = "solution_prefetch"  # api.metrics 캐시 라벨
+
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="solution-prefetch")
+_futures: "OrderedDict[Tuple[str, str], Future]" = OrderedDict()
+_lock = threading.Lock()
+_prompts_warmed = False
+
+
+def symptom_digest(symptom_text: Optional[str]) -> str:
+    return hashlib.sha1((symptom_text or "").encode("utf-8")).hexdigest()[:16]
+
+
+def _warm_solution_prompts():
+    # Solution 프롬프트 / 컨텍스트 파일을 레지스트리 캐시에 미리 올려 둠
+    registry = get_prompt_registry()
+    registry.prompt("stage5_solution")
+    registry.context_text("stage_specific/context_stage5_solution.json")
+
+
+def prefetch_solutions(diagnoses: Iterable[str], symptom_text: Optional[str]) -> None:
+    """아직 조회 중/완료되지 않은 (질환, 증상) 조합의 retrieve_solution을 백그라운드로 시작"""
+    global _prompts_warmed
+    if not GRAPH_PREFETCH:
+        return
+    with _lock:
+        if not _prompts_warmed:
+            _prompts_warmed = True
+            _pool.submit(_warm_solution_prompts)
+        for diagnosis in diagnoses:
+            if not diagnosis:
+                continue
+            key = (diagnosis, symptom_text or "")
+            future = _futures.get(key)
+            # 실패한 조회는 다시 시도
+            if future is not None and not (future.done() and future.exception() is not None):
+                _futures.move_to_end(key)
+                continue
+            _futures[key] = _pool.submit(retrieve_solution, diagnosis=diagnosis, symptom_text=symptom_text)
+            while len(_futures) > _MAX_ENTRIES:
+                _futures.popitem(last=False)
+
+
+def ready_solution(diagnosis: str, symptom_text: Optional[str]) -> Optional[Dict[str, Any]]:
+    """완료된 선행 조회 결과 (없거나 아직 진행 중이면 None, 기다리지 않음)"""
+    with _lock:
+        future = _futures.get((diagnosis, symptom_text or ""))
+    if future is None or not future.done() or future.exception() is not None:
+        return None
+    return future.result()
+
+
+def attach_prefetched(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    확정 질환(severity_diagnosis)의 선행 조회가 끝났으면 State 업데이트로 반환
+    (State에 저장해 두면 체크포인터를 통해 다른 워커 / 재시작 후에도 재사용 가능)
+    """
+    diagnosis = state.get("severity_diagnosis")
+    symptom_text = state.get("intake_summary_report")
+    if not diagnosis:
+        return {}
+    attached = state.get("prefetched_solution") or {}
+    if attached.get("diagnosis") == diagnosis and attached.get("symptom_digest") == symptom_digest(symptom_text):
+        return {}
+    prefetch_solutions([diagnosis], symptom_text)
+    result = ready_solution(diagnosis, symptom_text)
+    if result is None:
+        return {}
+    return {"prefetched_solution": {"diagnosis": diagnosis, "symptom_digest": symptom_digest(symptom_text), "result": result}}
+
+
+def take_solution(state: Dict[str, Any], timeout: float = GRAPH_PREFETCH_WAIT) -> Optional[Dict[str, Any]]:
+    """
+    Solution 노드용: State에 붙은 결과 -> 진행 중인 선행 조회(최대 timeout초 대기) 순으로 조회
+    둘 다 없으면 None (호출 측에서 직접 검색)
+    """
+    diagnosis = state.get("severity_diagnosis")
+    symptom_text = state.get("intake_summary_report")
+    attached = state.get("prefetched_solution") or {}
+    if attached.get("diagnosis") == diagnosis and attached.get("symptom_digest") == symptom_digest(symptom_text):
+        record_cache(CACHE_NAME, True)
+        return attached.get("result")
+
+    with _lock:
+        future = _futures.get((diagnosis, symptom_text or ""))
+    result = None
+    if future is not None:
+        try:
+            result = future.result(timeout=timeout)
+        except FuturesTimeout:
+            print(f"[Prefetch] Solution 선행 조회 대기 시간 초과 ({diagnosis})")
+        except Exception as e:
+            print(f"[Prefetch] Solution 선행 조회 오류 ({diagnosis}): {e}")
+    record_cache(CACHE_NAME, result is not None)
+    return result
+
+
+# -----------------------------
+# Hypothesis 후보 점진 검색 (speculative, 선택 기능)
+# - Intake가 진행되는 동안 GRAPH_SPECULATIVE_EVERY 턴마다 지금까지의 사용자 발화로 후보 투표를 백그라운드 실행하고,
+#   결과를 State(speculative_candidates: {질환명: 점수})에 지수 이동 평균으로 누적한다.
+# - 후보 질환의 진단 기준(criteria)도 같이 조회해 두어, Intake 완료 후 Hypothesis는 최종 요약으로 투표 1번 +
+#   아직 조회하지 않은 질환의 criteria만 조회하면 된다.
+# - 최종 후보와 추정 후보의 일치 정도는 graph_speculative_hypothesis_* 메트릭으로 집계
+# -----------------------------
+
+GRAPH_SPECULATIVE_HYPOTHESIS = os.getenv("GRAPH_SPECULATIVE_HYPOTHESIS", "0") == "1"
+GRAPH_SPECULATIVE_EVERY = int(os.getenv("GRAPH_SPECULATIVE_EVERY", "2"))  # 사용자 발화 N개마다 재검색
+_SPECULATIVE_DECAY = 0.4   # 새 결과와 합칠 때 이전 점수를 남기는 비율
+_SPECULATIVE_MIN_SCORE = 0.05
+
+_speculative: "OrderedDict[str, Future]" = OrderedDict()
+_criteria: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+
+
+def _remember_criteria(diagnosis: str, criteria: List[Dict[str, Any]]):
+    with _lock:
+        _criteria[diagnosis] = criteria
+        _criteria.move_to_end(diagnosis)
+        while len(_criteria) > _MAX_ENTRIES:
+            _criteria.popitem(last=False)
+
+
+def _speculate(transcript: str, top_k: int = 12, diag_top_n: int = 3) -> Dict[str, float]:
+    # 투표 점수 = top_k 검색 결과 중 해당 질환 chunk 비율
+    hits, top_diags = vote_candidates(transcript, top_k, diag_top_n)
+    votes = [h.metadata.get("disorder") for h in hits if h.metadata.get("disorder")]
+    scores = {d: votes.count(d) / max(len(hits), 1) for d in top_diags}
+    for diagnosis in top_diags:
+        with _lock:
+            known = diagnosis in _criteria
+        if not known:
+            _remember_criteria(diagnosis, lookup_criteria(diagnosis))
+    return scores
+
+
+def _merge_scores(old: Dict[str, float], fresh: Dict[str, float]) -> Dict[str, float]:
+    merged = {}
+    for diagnosis in set(old) | set(fresh):
+        score = _SPECULATIVE_DECAY * old.get(diagnosis, 0.0) + (1 - _SPECULATIVE_DECAY) * fresh.get(diagnosis, 0.0)
+        if score >= _SPECULATIVE_MIN_SCORE:
+            merged[diagnosis] = round(score, 4)
+    return dict(sorted(merged.items(), key=lambda kv: kv[1], reverse=True))
+
+
+def _collect_speculative(state: Dict[str, Any]) -> Tuple[Dict[str, float], bool]:
+    # (현재까지의 후보 점수, 진행 중인 검색이 끝났는지)
+    scores = dict(state.get("speculative_candidates") or {})
+    pending = state.get("speculative_pending")
+    if not pending:
+        return scores, True
+    with _lock:
+        future = _speculative.get(pending)
+    if future is None:
+        # 재시작 등으로 결과가 사라짐
+        return scores, True
+    if not future.done():
+        return scores, False
+    try:
+        return _merge_scores(scores, future.result()), True
+    except Exception as e:
+        print(f"[Prefetch] Hypothesis 점진 검색 오류: {e}")
+        return scores, True
+
+
+def speculate_hypothesis(state: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Intake 노드용: 끝난 점진 검색 결과를 후보 점수에 반영하고, 필요하면 다음 검색을 백그라운드로 시작
+    Returns: State 업데이트 (speculative_candidates / speculative_pending)
+    """
+    if not GRAPH_SPECULATIVE_HYPOTHESIS or result.get("intake_summary_report"):
+        return {}
+    update: Dict[str, Any] = {}
+    scores, finished = _collect_speculative(state)
+    if finished and state.get("speculative_pending"):
+        update["speculative_candidates"] = scores
+        update["speculative_pending"] = None
+
+    user_turns = [m.content for m in state.get("messages") or [] if isinstance(m, HumanMessage)]
+    if finished and user_turns and len(user_turns) % max(GRAPH_SPECULATIVE_EVERY, 1) == 0:
+        transcript = "\n".join(user_turns)
+        digest = symptom_digest(transcript)
+        with _lock:
+            _speculative[digest] = _pool.submit(_speculate, transcript)
+            while len(_speculative) > _MAX_ENTRIES:
+                _speculative.popitem(last=False)
+        update["speculative_pending"] = digest
+    return update
+
+
+def reconcile_candidates(state: Dict[str, Any], symptom_text: str, top_k: int = 12, diag_top_n: int = 3) -> Dict[str, Any]:
+    """
+    Hypothesis 노드용 retrieve_candidates 대체 (반환 형식 동일)
+    최종 요약으로 후보 투표는 다시 하되, criteria는 점진 검색에서 조회해 둔 질환을 재사용하고 나머지만 조회
+    추정 후보(상위 diag_top_n)와 최종 후보의 일치 정도를 메트릭에 기록
+    (Hypothesis 노드가 비교 후 speculative_candidates를 비우므로 점진 검색 한 번에 한 번만 기록)
+    """
+    hits, top_diags = vote_candidates(symptom_text, top_k, diag_top_n)
+
+    scores, _ = _collect_speculative(state)
+    if scores:
+        speculative_top = list(scores)[:diag_top_n]
+        overlap = len(set(speculative_top) & set(top_diags)) / max(len(top_diags), 1)
+        result = "exact" if overlap == 1.0 else "partial" if overlap > 0 else "miss"
+        SPECULATIVE_HYPOTHESIS.inc(result=result)
+        SPECULATIVE_OVERLAP.inc(overlap)
+        print(f"[Prefetch] Hypothesis 추정 후보 {speculative_top} / 최종 {top_diags} ({result})")
+
+    result: Dict[str, Any] = {
+        "input_symptom": symptom_text,
+        "diagnosis_candidates": top_diags,
+        "by_diagnosis": {},
+        "raw_hits": [{"text": h.page_content, "metadata": h.metadata} for h in hits],
+    }
+    for diagnosis in top_diags:
+        with _lock:
+            criteria = _criteria.get(diagnosis)
+        record_cache("speculative_criteria", criteria is not None)
+        if criteria is None:
+            criteria = lookup_criteria(diagnosis)
+            _remember_criteria(diagnosis, criteria)
+        result["by_diagnosis"][diagnosis] = criteria
+    return result
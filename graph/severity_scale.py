@@ -0,0 +1,141 @@
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from frontend.prompt_registry import get_prompt_registry
+from rag.taxonomy import severity_context_file
+from graph.validation_bank import option_number
+
+# -----------------------------
+# 심각도 척도 엔진 (contexts/diseases/*.json의 severity_scale)
+# - 척도 문항을 순서대로 묻고, 응답을 보기 점수로 바꿔 로컬에서 채점한다.
+# - 채점 방식 / 보기 / 등급 구간은 각 JSON의 severity_scale.scoring에 정의
+#   (PHQ-9, GAD-7, ASRS Part A, MDQ 수정판, OCI-R 수정판, PQ-B 간이판, CAGE-AID)
+# - scoring 정의가 없는 척도 파일은 None을 반환해 기존 LLM 평가 경로를 사용
+# -----------------------------
+
+SEVERITY_LLM_WRAP = os.getenv("SEVERITY_LLM_WRAP", "0") == "1"  # 1이면 문항 전달 문장을 LLM이 공감 표현과 함께 작성
+
+_DAYS = re.compile(r"(\d+)\s*일")
+
+
+@dataclass
+class Option:
+    label: str
+    score: int
+    aliases: Tuple[str, ...] = ()
+    days: Optional[Tuple[int, int]] = None  # 빈도 보기의 일수 범위 (예: 며칠 동안 = 1~6일)
+
+
+@dataclass
+class Scale:
+    name: str
+    questions: List[str]
+    options: List[Option]
+    method: str                                  # sum: 점수 합 / count: 기준 이상 응답 문항 수
+    bands: List[Mapping[str, Any]]
+    max_score: int
+    item_thresholds: Optional[List[int]] = None  # count 방식의 문항별 기준 점수
+    score_items: Optional[List[int]] = None      # 합산할 문항 번호 (1부터, 없으면 전체)
+    flags: List[Mapping[str, Any]] = field(default_factory=list)
+    note: str = ""
+
+    def option_lines(self) -> List[str]:
+        return [f"{i}. {o.label}" for i, o in enumerate(self.options, 1)]
+
+    def parse(self, text: str) -> Optional[int]:
+        """
+        사용자 답변 -> 보기 점수 (알아볼 수 없으면 None)
+        답변 전체가 보기 번호일 때만 번호로 보고, 그 외에는 일수("3일 정도") -> 보기 문구/별칭 순으로 비교
+        """
+        text = (text or "").strip()
+        number = option_number(text, len(self.options))
+        if number is not None:
+            return self.options[number - 1].score
+        m = _DAYS.search(text)
+        if m:
+            days = int(m.group(1))
+            for option in self.options:
+                if option.days and option.days[0] <= days <= option.days[1]:
+                    return option.score
+        # 긴 표현부터 비교 ("매우 자주"가 "자주"보다 먼저)
+        candidates = [(alias, o.score) for o in self.options for alias in (o.label, *o.aliases)]
+        for alias, score in sorted(candidates, key=lambda c: len(c[0]), reverse=True):
+            if alias and alias in text:
+                return score
+        return None
+
+    def score(self, answers: List[int]) -> Dict[str, Any]:
+        """응답 점수 리스트 -> {"scale", "score", "max_score", "level", "implication", "flags"}"""
+        items = self.score_items or list(range(1, len(answers) + 1))
+        if self.method == "count":
+            thresholds = self.item_thresholds or [1] * len(answers)
+            total = sum(1 for i in items if answers[i - 1] >= thresholds[i - 1])
+        else:
+            total = sum(answers[i - 1] for i in items)
+        band = next((b for b in self.bands if b["min"] <= total <= b["max"]), self.bands[-1])
+        flags = [f["message"] for f in self.flags if answers[f["item"] - 1] >= f["min"]]
+        return {
+            "scale": self.name,
+            "score": total,
+            "max_score": self.max_score,
+            "level": band["level"],
+            "implication": band["implication"],
+            "flags": flags,
+        }
+
+
+_scales: Dict[str, Tuple[Any, Scale]] = {}
+
+
+def load_scale(diagnosis: Optional[str]) -> Optional[Scale]:
+    """질환명 -> Scale (척도 파일 또는 scoring 정의가 없으면 None, 파일이 바뀌지 않으면 파싱 결과 재사용)"""
+    filename = severity_context_file(diagnosis)
+    if not filename:
+        return None
+    data = get_prompt_registry().context_json(f"diseases/{filename}")
+    cached = _scales.get(filename)
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    spec = (data or {}).get("severity_scale") or {}
+    scoring = spec.get("scoring")
+    if not scoring or not spec.get("questions"):
+        return None
+    scale = Scale(
+        name=spec.get("scale_name", filename),
+        questions=list(spec["questions"]),
+        options=[
+            Option(o["label"], int(o["score"]), tuple(o.get("aliases", ())), tuple(o["days"]) if o.get("days") else None)
+            for o in scoring["options"]
+        ],
+        method=scoring.get("method", "sum"),
+        bands=list(scoring["bands"]),
+        max_score=int(scoring["max_score"]),
+        item_thresholds=list(scoring["item_thresholds"]) if scoring.get("item_thresholds") else None,
+        score_items=list(scoring["score_items"]) if scoring.get("score_items") else None,
+        flags=list(scoring.get("flags", ())),
+        note=scoring.get("note", ""),
+    )
+    _scales[filename] = (data, scale)
+    return scale
+
+
+def question_message(scale: Scale, index: int, unclear: bool = False) -> str:
+    """LLM 없이 문항 전달 메시지 구성 (index: 0부터)"""
+    lead = "답변을 보기에서 골라 주시면 정확하게 반영할 수 있어요. 1~{} 중 하나로 답해 주세요.\n\n".format(len(scale.options)) if unclear else ""
+    options = "\n".join(scale.option_lines())
+    return f"{lead}**{scale.name}** ({index + 1}/{len(scale.questions)})\n{scale.questions[index]}\n\n{options}"
+
+
+def result_string(diagnosis: str, assessment: Dict[str, Any]) -> str:
+    """Solution 단계로 넘길 심각도 평가 결과 요약"""
+    lines = [
+        f"평가 대상: {diagnosis}",
+        f"척도: {assessment['scale']}",
+        f"점수: {assessment['score']}/{assessment['max_score']}",
+        f"심각도: {assessment['level']}",
+        f"임상적 의미: {assessment['implication']}",
+    ]
+    lines.extend(f"주의: {flag}" for flag in assessment["flags"])
+    return "\n".join(lines)
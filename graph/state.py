@@ -7,48 +7,70 @@ class CounselingState(TypedDict):
     
     Attributes:
         messages: 대화 기록 (LangGraph 표준)
+        conversation_summary: 최근 창 밖으로 밀려난 대화의 롤링 요약
+        summarized_message_count: 요약에 반영된 메시지 수 (messages 앞에서부터)
         
         # Intake Stage (1단계)
         intake_summary_report: 1단계 요약 리포트
         domain_questions_active: 도메인 심화 질문 모드 활성화 여부
         current_domain: 현재 탐색 중인 도메인 정보
+        explored_domains: 심화 질문을 마친 도메인 목록
         
         # Hypothesis Stage (2단계)
         hypothesis_criteria: RAG 검색 결과로 얻은 의심 질환별 판단 기준 리스트
+        hypothesis_candidates: 의심 질환명 리스트 (Solution 선행 조회 대상)
+        speculative_candidates: Intake 중 점진 검색으로 추정한 후보 질환별 점수
+        speculative_pending: 진행 중인 점진 검색 키
         
         # Validation Stage (3단계)
         validation_probabilities: 각 의심 질환별 계산된 확률값
+        validation_plan: 질문 은행에서 고른 검증 질문 순서
+        validation_answers: 질문 ID별 사용자 응답 점수 (1~5)
         is_re_intake: 확률 50% 이하로 인한 재탐색 모드 여부
         
         # Severity Stage (4단계)
         severity_diagnosis: 심각도 평가 대상 질환명 (Top 1)
         severity_result_string: 심각도 평가 결과 문자열
+        severity_answers: 척도 문항별 응답 점수
+        severity_assessment: 척도 채점 결과 (점수, 등급, 주의 문항)
         
         # Solution Stage (5단계)
         final_summary_string: 1, 3, 4단계 통합 요약문
         solution_content: 최종 제공할 솔루션 내용
+        prefetched_solution: 확정 질환의 Solution RAG 선행 조회 결과 (graph.prefetch)
     """
     
     # Base
     messages: Annotated[List[Any], add_messages]  # 대화 기록 (HumanMessage, AIMessage 등)
+    conversation_summary: Optional[str]           # 오래된 대화의 롤링 요약 (graph.memory에서 갱신)
+    summarized_message_count: int                 # 요약에 반영된 메시지 수
     
     # Intake Stage (1단계: 초기 면담)
     intake_summary_report: Optional[str]  # 수집된 필수 정보 요약 리포트
     domain_questions_active: bool         # 도메인 심화 질문 모드 활성화 여부 (True: 활성, False: 비활성)
     current_domain: Optional[str]         # 현재 심화 질문 진행 중인 도메인 (예: "Depressive Disorders")
+    explored_domains: Optional[List[str]] # 심화 질문을 마친 도메인 (로컬 도메인 감지에서 제외)
     
     # Hypothesis Stage (2단계: 가설 설정)
     hypothesis_criteria: Optional[List[str]]  # RAG 검색으로 도출된 의심 질환별 판단 기준 리스트
+    hypothesis_candidates: Optional[List[str]]  # 의심 질환명 리스트 (예: ["Major Depressive Disorder", ...])
+    speculative_candidates: Optional[Dict[str, float]]  # Intake 중 추정 후보 점수 (GRAPH_SPECULATIVE_HYPOTHESIS=1일 때)
+    speculative_pending: Optional[str]                  # 백그라운드에서 진행 중인 점진 검색 키 (graph.prefetch)
     
     # Validation Stage (3단계: 검증)
     validation_probabilities: Optional[Dict[str, float]]  # 각 의심 질환에 대한 검증 확률 (예: {"우울증": 0.8})
     is_re_intake: bool                                    # 확률이 낮아(50% 이하) 재탐색이 필요한지 여부
+    validation_plan: Optional[List[Dict[str, Any]]]       # 질문 은행 경로의 질문 순서 [{"id", "disorder", "criterion", "text", "weight"}]
+    validation_answers: Optional[Dict[str, int]]          # 질문 ID -> 응답 점수 (1~5)
     
     # Severity Stage (4단계: 심각도 평가)
     severity_diagnosis: Optional[str]      # 심각도 평가 대상으로 선정된 질환명 (Top 1)
     severity_result_string: Optional[str]  # 심각도 평가 결과 텍스트
+    severity_answers: Optional[List[int]]  # 척도 문항 순서대로의 응답 점수 (graph.severity_scale)
+    severity_assessment: Optional[Dict[str, Any]]  # {"scale", "score", "max_score", "level", "implication", "flags", "answers"}
     
     # Solution Stage (5단계: 솔루션)
     final_summary_string: Optional[str]  # 전체 상담 과정(1, 3, 4단계) 요약문
     solution_content: Optional[str]      # 사용자에게 제공할 최종 솔루션 내용
+    prefetched_solution: Optional[Dict[str, Any]]  # {"diagnosis", "symptom_digest", "result": retrieve_solution 결과}
 
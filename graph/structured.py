@@ -0,0 +1,249 @@
+import dataclasses
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Union, get_args, get_origin, get_type_hints
+
+from frontend.gemini_api import INTERNAL_DATA_MARKER, ask_gemini_json, ask_gemini_json_async
+from api.metrics import STRUCTURED_OUTPUTS
+
+# -----------------------------
+# 노드별 구조화 출력 (INTERNAL_DATA 섹션)
+# - 사용자 메시지는 지금처럼 스트리밍하고, `---INTERNAL_DATA---` 아래에는 노드가 선언한
+#   dataclass 스키마의 JSON 객체 하나만 출력하게 한다.
+# - JSON이 스키마와 맞지 않으면 Gemini JSON 모드(response_schema)로 한 번만 다시 요청해 복구한다.
+#   (사용자 메시지를 다시 생성하지 않고 INTERNAL_DATA만 변환)
+# - 결과(ok / repaired / failed / absent)는 api.metrics의 graph_structured_output_total로 집계
+# -----------------------------
+
+
+@dataclass
+class IntakeOutput:
+    domain_detected: Optional[str] = field(default=None, metadata={"description": "13개 도메인 중 강한 징후가 감지된 도메인명 (없으면 null)"})
+    domain_completed: bool = field(default=False, metadata={"description": "도메인 심화 질문이 충분히 끝났으면 true"})
+    summary_string: Optional[str] = field(default=None, metadata={"description": "5가지 필수 정보가 모두 수집되었을 때의 요약 리포트 (아니면 null)"})
+
+
+@dataclass
+class DisorderProbability:
+    disorder: str = field(metadata={"description": "의심 질환명"})
+    probability: float = field(metadata={"description": "0.0 ~ 1.0 사이의 확률"})
+
+
+@dataclass
+class ValidationOutput:
+    validated: Optional[str] = field(default=None, metadata={"description": "최종 확정 질환명 Top 1 (확률 50% 미만이면 null)"})
+    probabilities: List[DisorderProbability] = field(default_factory=list, metadata={"description": "질환별 계산된 확률 (모든 질문이 끝났을 때만)"})
+
+
+@dataclass
+class SeverityOutput:
+    result_string: Optional[str] = field(default=None, metadata={"description": "심각도 평가 결과 텍스트 요약 (평가 완료 시)"})
+    diagnosis: Optional[str] = field(default=None, metadata={"description": "평가 대상 질환명"})
+    level: Optional[str] = field(default=None, metadata={"description": "심각도 수준 (예: 경도 / 중등도 / 중증)"})
+    score: Optional[str] = field(default=None, metadata={"description": "척도 점수 (있는 경우)"})
+
+
+class StructuredOutputError(ValueError):
+    """INTERNAL_DATA가 노드 스키마와 맞지 않을 때"""
+
+
+T = TypeVar("T")
+
+
+def _unwrap_optional(tp: Any) -> Tuple[Any, bool]:
+    if get_origin(tp) is Union:
+        args = [a for a in get_args(tp) if a is not type(None)]
+        if len(args) == 1:
+            return args[0], True
+    return tp, False
+
+
+def _schema_for_type(tp: Any) -> Dict[str, Any]:
+    tp, nullable = _unwrap_optional(tp)
+    if dataclasses.is_dataclass(tp):
+        schema = response_schema(tp)
+    elif get_origin(tp) in (list, List):
+        schema = {"type": "array", "items": _schema_for_type(get_args(tp)[0])}
+    elif tp is bool:
+        schema = {"type": "boolean"}
+    elif tp is int:
+        schema = {"type": "integer"}
+    elif tp is float:
+        schema = {"type": "number"}
+    else:
+        schema = {"type": "string"}
+    if nullable:
+        schema["nullable"] = True
+    return schema
+
+
+def response_schema(cls: type) -> Dict[str, Any]:
+    """dataclass -> Gemini response_schema (OpenAPI subset) dict"""
+    hints = get_type_hints(cls)
+    properties, required = {}, []
+    for f in dataclasses.fields(cls):
+        prop = _schema_for_type(hints[f.name])
+        if f.metadata.get("description"):
+            prop["description"] = f.metadata["description"]
+        properties[f.name] = prop
+        if f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING:
+            required.append(f.name)
+    schema = {"type": "object", "properties": properties}
+    if required:
+        schema["required"] = required
+    return schema
+
+
+def _convert(tp: Any, value: Any, path: str) -> Any:
+    tp, nullable = _unwrap_optional(tp)
+    if value is None:
+        if nullable:
+            return None
+        raise StructuredOutputError(f"{path}: null 불가")
+    if dataclasses.is_dataclass(tp):
+        return from_dict(tp, value, path)
+    if get_origin(tp) in (list, List):
+        if not isinstance(value, list):
+            raise StructuredOutputError(f"{path}: 배열이어야 함")
+        item_type = get_args(tp)[0]
+        return [_convert(item_type, v, f"{path}[{i}]") for i, v in enumerate(value)]
+    if tp is bool:
+        if not isinstance(value, bool):
+            raise StructuredOutputError(f"{path}: boolean이어야 함")
+        return value
+    if tp in (int, float):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise StructuredOutputError(f"{path}: 숫자여야 함")
+        return tp(value)
+    if isinstance(value, (dict, list)):
+        raise StructuredOutputError(f"{path}: 문자열이어야 함")
+    return str(value)
+
+
+def from_dict(cls: Type[T], data: Any, path: str = "$") -> T:
+    """JSON dict를 dataclass로 검증/변환 (알 수 없는 키는 무시, 누락된 키는 기본값)"""
+    if not isinstance(data, dict):
+        raise StructuredOutputError(f"{path}: 객체여야 함")
+    hints = get_type_hints(cls)
+    kwargs = {}
+    for f in dataclasses.fields(cls):
+        if f.name in data:
+            kwargs[f.name] = _convert(hints[f.name], data[f.name], f"{path}.{f.name}")
+        elif f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING:
+            raise StructuredOutputError(f"{path}.{f.name}: 필수 필드 누락")
+    return cls(**kwargs)
+
+
+def _example(cls: type) -> Dict[str, Any]:
+    hints = get_type_hints(cls)
+    out = {}
+    for f in dataclasses.fields(cls):
+        tp, _ = _unwrap_optional(hints[f.name])
+        if get_origin(tp) in (list, List) and dataclasses.is_dataclass(get_args(tp)[0]):
+            out[f.name] = [_example(get_args(tp)[0])]
+        elif tp is bool:
+            out[f.name] = False
+        elif tp in (int, float):
+            out[f.name] = tp(0)
+        else:
+            out[f.name] = f"<{f.metadata.get('description', f.name)}>"
+    return out
+
+
+def format_instructions(cls: type) -> str:
+    """시스템 프롬프트에 넣을 INTERNAL_DATA 출력 형식 안내"""
+    example = json.dumps(_example(cls), ensure_ascii=False, indent=2)
+    schema = json.dumps(response_schema(cls), ensure_ascii=False)
+    return f"""## Internal Data Format (엄격 준수)
+사용자에게 보낼 메시지를 먼저 작성한 뒤, 시스템 처리용 데이터가 있을 때만 `{INTERNAL_DATA_MARKER}` 구분선을 쓰고
+그 아래에 아래 JSON 스키마를 따르는 JSON 객체 하나만 출력하세요. (코드 블록, 설명 문장 금지, 해당 없는 값은 null)
+
+{INTERNAL_DATA_MARKER}
+{example}
+
+JSON Schema: {schema}
+"""
+
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+
+
+def split_response(response_text: str) -> Tuple[str, Optional[str]]:
+    """(사용자 메시지, INTERNAL_DATA 원문 or None)"""
+    if INTERNAL_DATA_MARKER not in response_text:
+        return response_text, None
+    user_message, internal = response_text.split(INTERNAL_DATA_MARKER, 1)
+    return user_message.strip(), internal.strip()
+
+
+def parse_internal(cls: Type[T], internal: str) -> T:
+    """INTERNAL_DATA 원문(JSON, 코드 블록 허용)을 dataclass로 파싱"""
+    text = _FENCE.sub("", internal.strip())
+    # JSON 뒤에 설명이 붙은 경우를 대비해 첫 객체만 사용
+    start = text.find("{")
+    if start < 0:
+        raise StructuredOutputError("$: JSON 객체 없음")
+    try:
+        data, _ = json.JSONDecoder().raw_decode(text[start:])
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"$: JSON 파싱 오류 ({e})")
+    return from_dict(cls, data)
+
+
+def _repair_prompt(internal: str, error: Exception) -> str:
+    return f"""다음은 상담 시스템 내부 데이터입니다. 형식 오류({error})가 있습니다.
+내용은 바꾸지 말고, 주어진 JSON 스키마에 맞는 JSON 객체로만 다시 작성하세요.
+
+## 원본 내부 데이터
+{internal}
+"""
+
+
+def _record(node: str, result: str):
+    STRUCTURED_OUTPUTS.inc(node=node, result=result)
+
+
+def _start(cls: Type[T], node: str, response_text: str):
+    # 복구 요청이 필요 없으면 (user_message, output, None), 필요하면 (user_message, None, repair_prompt)
+    user_message, internal = split_response(response_text)
+    if internal is None:
+        _record(node, "absent")
+        return user_message, None, None
+    try:
+        output = parse_internal(cls, internal)
+        _record(node, "ok")
+        return user_message, output, None
+    except StructuredOutputError as e:
+        print(f"[Structured] {node} 출력 형식 오류, 복구 요청: {e}")
+        return user_message, None, _repair_prompt(internal, e)
+
+
+def _finish_repair(cls: Type[T], node: str, repaired: str) -> Optional[T]:
+    try:
+        output = parse_internal(cls, repaired)
+        _record(node, "repaired")
+        return output
+    except StructuredOutputError as e:
+        print(f"[Structured] {node} 복구 실패: {e}")
+        _record(node, "failed")
+        return None
+
+
+def resolve(cls: Type[T], node: str, response_text: str) -> Tuple[str, Optional[T]]:
+    """
+    LLM 응답을 (사용자 메시지, 검증된 출력 or None)으로 변환
+    INTERNAL_DATA가 스키마와 맞지 않으면 JSON 모드로 한 번만 복구 요청
+    """
+    user_message, output, repair_prompt = _start(cls, node, response_text)
+    if repair_prompt is None:
+        return user_message, output
+    return user_message, _finish_repair(cls, node, ask_gemini_json(repair_prompt, response_schema(cls)))
+
+
+async def aresolve(cls: Type[T], node: str, response_text: str) -> Tuple[str, Optional[T]]:
+    """resolve의 async 버전"""
+    user_message, output, repair_prompt = _start(cls, node, response_text)
+    if repair_prompt is None:
+        return user_message, output
+    return user_message, _finish_repair(cls, node, await ask_gemini_json_async(repair_prompt, response_schema(cls)))
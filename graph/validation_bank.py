@@ -0,0 +1,156 @@
+import os
+import re
+from typing import Any, Dict, List, Mapping, Optional
+
+from frontend.prompt_registry import get_prompt_registry
+from rag.config import VALIDATION_BANK_FILE
+from rag.taxonomy import lookup, normalize_name
+
+# -----------------------------
+# Validation 질문 은행 (rag/build_question_bank.py로 미리 생성한 질환별 5점 척도 질문)
+# - Hypothesis 후보가 모두 은행에 있으면 질문 순서(validation_plan)를 코드에서 정하고,
+#   LLM은 공감 한두 문장 + 다음 질문 전달에만 사용한다.
+# - 후보 중 하나라도 은행에 없으면 기존처럼 LLM이 질문을 만드는 방식으로 진행
+# - 사람이 검토를 마친("reviewed": true) 질환만 사용 (VALIDATION_BANK_UNREVIEWED=1이면 전체)
+# -----------------------------
+
+VALIDATION_BANK = os.getenv("VALIDATION_BANK", "1") != "0"
+VALIDATION_QUESTIONS_PER_DISORDER = int(os.getenv("VALIDATION_QUESTIONS_PER_DISORDER", "5"))
+VALIDATION_BANK_UNREVIEWED = os.getenv("VALIDATION_BANK_UNREVIEWED", "0") == "1"  # 1이면 검토 전("reviewed": false) 질환도 사용 (검토용)
+
+ANSWER_OPTIONS = [
+    "1. 전혀 그렇지 않다",
+    "2. 거의 그렇지 않다",
+    "3. 가끔 그렇다",
+    "4. 자주 그렇다",
+    "5. 매우 자주/항상 그렇다",
+]
+
+# 숫자 없이 보기 문구 / 빈도 표현으로 답한 경우 (긴 표현부터 검사)
+_ANSWER_KEYWORDS = [
+    ("매우 자주", 5), ("항상", 5), ("거의 매일", 5), ("매일", 5), ("계속", 5),
+    ("전혀", 1), ("조금도", 1), ("거의 그렇지", 2), ("거의 없", 2), ("별로", 2),
+    ("가끔", 3), ("때때로", 3), ("종종", 3), ("조금", 3), ("약간", 3), ("때도 있", 3), ("때가 있", 3),
+    ("자주", 4), ("자꾸", 4), ("많이", 4),
+]
+# 부정 표현: 빈도 표현을 부정하면("자주 그렇지 않다", "항상은 아니에요") 키워드 점수보다 먼저 검사
+_NEGATION = r"(?:그렇지|그러지)\s*(?:는|은)?\s*않|아니|않았|않아|없어|없었|없다|안\s*그"
+_NEGATED_FREQUENT = re.compile(rf"(?:매우 자주|자주|항상|거의 매일|매일|계속|많이)\s*(?:은|는)?\s*(?:{_NEGATION})")
+_NEGATED = re.compile(_NEGATION)
+# 빈도 없이 긍정만 한 경우 ("네 그래요", "맞아요") -> 해당 기준 충족(4: 자주 그렇다)으로 봄
+_AFFIRMATIVE = re.compile(r"(?:^|\s)(?:네|넵|예|응|맞아요|맞아|맞습니다)(?=$|[\s.,!~])|그래요|그랬어요|그렇습니다|그랬습니다|그런 편|있어요|있었어요|있습니다")
+# 답변 전체가 보기 번호인 경우만 ("3", "3번", "3번이요.") — "지난 2주 동안", "3일 정도"의 숫자는 보기 번호가 아님
+_OPTION_NUMBER = re.compile(r"^\s*(\d)\s*(?:번)?\s*(?:이요|요|이에요|예요|입니다)?\s*[.!]?\s*$")
+
+_index_source: Any = None
+_index: Dict[str, Mapping[str, Any]] = {}
+
+
+def _bank_index() -> Dict[str, Mapping[str, Any]]:
+    # 정규화된 질환명(canonical + aliases) -> 은행 항목 (레지스트리가 파일을 다시 읽으면 재구성)
+    global _index_source, _index
+    data = get_prompt_registry().context_json(VALIDATION_BANK_FILE)
+    if data is _index_source:
+        return _index
+    index = {}
+    for name, entry in ((data or {}).get("disorders") or {}).items():
+        if not entry.get("questions"):
+            continue
+        if not (entry.get("reviewed") or VALIDATION_BANK_UNREVIEWED):
+            continue
+        for key in (name, *entry.get("aliases", ())):
+            index.setdefault(normalize_name(key), entry)
+    _index_source, _index = data, index
+    return index
+
+
+def bank_entry(disorder: str) -> Optional[Mapping[str, Any]]:
+    """질환명(원문 / canonical 어느 쪽이든) -> 은행 항목, 없으면 None"""
+    index = _bank_index()
+    entry = index.get(normalize_name(disorder))
+    if entry is None:
+        info = lookup(disorder)
+        entry = index.get(normalize_name(info.name)) if info else None
+    return entry
+
+
+def build_plan(candidates: List[str], per_disorder: int = VALIDATION_QUESTIONS_PER_DISORDER) -> Optional[List[Dict[str, Any]]]:
+    """
+    후보 질환별 질문을 per_disorder개씩 골라 번갈아 묻는 순서로 배치
+    후보 중 하나라도 은행에 없으면 None
+    """
+    if not VALIDATION_BANK or not candidates:
+        return None
+    per_candidate = []
+    for disorder in candidates:
+        entry = bank_entry(disorder)
+        if entry is None:
+            return None
+        per_candidate.append([
+            {
+                "id": q["id"],
+                "disorder": disorder,
+                "criterion": q.get("criterion", ""),
+                "text": q["text"],
+                "weight": q.get("weight", 1.0),
+            }
+            for q in entry["questions"][:per_disorder]
+        ])
+    plan = []
+    for round_ in range(max(len(qs) for qs in per_candidate)):
+        for qs in per_candidate:
+            if round_ < len(qs):
+                plan.append(qs[round_])
+    return plan
+
+
+def option_number(text: str, count: int) -> Optional[int]:
+    """답변 전체가 보기 번호(1..count)이면 그 번호, 아니면 None"""
+    m = _OPTION_NUMBER.match(text or "")
+    if m and 1 <= int(m.group(1)) <= count:
+        return int(m.group(1))
+    return None
+
+
+def parse_answer(text: str) -> Optional[int]:
+    """
+    사용자 답변 -> 1~5 점수 (알아볼 수 없으면 None)
+    답변 전체가 보기 번호이면 번호, 그 외에는 부정 표현 -> 보기 문구 / 빈도 표현 -> 긍정 답변 순으로 검사
+    """
+    text = (text or "").strip()
+    number = option_number(text, len(ANSWER_OPTIONS))
+    if number is not None:
+        return number
+    negated = _NEGATED_FREQUENT.search(text)
+    if negated:
+        # 부정된 부분을 빼고 다른 빈도 표현이 있으면 그 점수 ("자주는 아니고 가끔"), 없으면 "거의 그렇지 않다"
+        text = text[:negated.start()] + " " + text[negated.end():]
+    for keyword, score in _ANSWER_KEYWORDS:
+        if keyword in text:
+            return score
+    if negated:
+        return 2
+    if _NEGATED.search(text):
+        # 빈도 표현 없이 부정만 한 경우 ("그렇지 않아요", "그런 적 없어요")
+        return 1
+    if _AFFIRMATIVE.search(text):
+        return 4
+    return None
+
+
+def question_context(question_text: str, number: int, total: int, unclear: bool, options: List[str] = ANSWER_OPTIONS) -> str:
+    """다음 질문 전달용 (짧은) 시스템 지시사항 (Severity 척도 문항 전달에도 사용)"""
+    base_prompt = get_prompt_registry().prompt("validation_question") or ""
+    note = f"- 직전 답변을 보기 번호로 알아볼 수 없었습니다. 같은 질문을 다시 묻고, 1~{len(options)} 중 하나로 답해 달라고 부드럽게 안내하세요.\n" if unclear else ""
+    options = "\n".join(options)
+    return f"""{base_prompt}
+
+## 이번에 전달할 질문 ({number}/{total})
+{question_text}
+
+## 보기
+{options}
+
+## 참고
+{note}- 질문 문장은 바꾸지 말고 그대로 전달하세요. 내부 데이터는 출력하지 마세요.
+"""
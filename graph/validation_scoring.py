@@ -0,0 +1,57 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# -----------------------------
+# Validation 확률 계산 (로컬, 결정적)
+# 질문 은행 경로에서 모든 질문이 끝나면 LLM 대신 응답 점수(1~5)로 질환별 확률을 계산한다.
+#
+#   e_i   = (answer_i - 1) / 4                      응답 강도 (0 ~ 1)
+#   hit_i = answer_i >= ENDORSE_THRESHOLD            "자주" 이상이면 해당 진단 기준 충족으로 봄
+#   s_d   = MEAN_WEIGHT * 가중평균(e) + (1 - MEAN_WEIGHT) * 가중평균(hit)   (질환 d의 질문들)
+#   p_d   = sigmoid(STEEPNESS * (s_d - 0.5))
+#
+# 같은 응답이면 항상 같은 확률이 나오므로 check_validation_outcome의 0.5 기준이 재현 가능하다.
+# -----------------------------
+
+ENDORSE_THRESHOLD = 4   # 4: 자주 그렇다
+MEAN_WEIGHT = 0.5
+STEEPNESS = 8.0
+
+
+def score_disorders(plan: List[Dict[str, Any]], answers: Dict[str, int]) -> Dict[str, float]:
+    """
+    질문 순서(plan)와 응답(answers: 질문 ID -> 1~5)으로 질환별 확률 계산
+    응답이 없는 질문은 계산에서 제외, 응답이 하나도 없는 질환은 0.0
+    """
+    disorders = list(dict.fromkeys(q["disorder"] for q in plan))
+    if not disorders:
+        return {}
+    index = {d: i for i, d in enumerate(disorders)}
+
+    answered = [q for q in plan if answers.get(q["id"]) is not None]
+    scores = np.array([answers[q["id"]] for q in answered], dtype=float)
+    weights = np.array([float(q.get("weight", 1.0)) for q in answered], dtype=float)
+    # 질환 x 질문 소속 행렬
+    membership = np.zeros((len(disorders), len(answered)))
+    membership[[index[q["disorder"]] for q in answered], np.arange(len(answered))] = 1.0
+
+    intensity = (np.clip(scores, 1, 5) - 1) / 4
+    endorsed = (scores >= ENDORSE_THRESHOLD).astype(float)
+    total_weight = membership @ weights
+    safe_weight = np.where(total_weight > 0, total_weight, 1.0)
+    mean_intensity = (membership @ (weights * intensity)) / safe_weight
+    endorsed_ratio = (membership @ (weights * endorsed)) / safe_weight
+
+    combined = MEAN_WEIGHT * mean_intensity + (1 - MEAN_WEIGHT) * endorsed_ratio
+    probabilities = 1 / (1 + np.exp(-STEEPNESS * (combined - 0.5)))
+    probabilities = np.where(total_weight > 0, probabilities, 0.0)
+    return {d: round(float(p), 4) for d, p in zip(disorders, probabilities)}
+
+
+def top_disorder(probabilities: Dict[str, float], threshold: float = 0.5) -> Tuple[Optional[str], float]:
+    """(확률이 가장 높은 질환, 확률) — threshold 이하이면 질환은 None"""
+    if not probabilities:
+        return None, 0.0
+    disorder, probability = max(probabilities.items(), key=lambda kv: kv[1])
+    return (disorder if probability > threshold else None), probability
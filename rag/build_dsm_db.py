@@ -12,7 +12,8 @@ from langchain_community.vectorstores import Chroma
 from langchain.schema import Document
 
 from rag.embeddings import get_embeddings
-from rag.config import DSM_PDF_PATH, CHROMA_DIR, DSM_COLLECTION_NAME, KNOWN_DISORDERS
+from rag.config import DSM_PDF_PATH, CHROMA_DIR, DSM_COLLECTION_NAME
+from rag.taxonomy import KNOWN_DISORDERS
 
 # -------- 패턴들 --------
 ICD_PATTERN = re.compile(r"^F\d{2}(\.\d+)?$")
@@ -0,0 +1,211 @@
+# rag/build_question_bank.py
+# DSM 인덱스의 진단 기준(criteria) chunk로 Validation 질문 은행을 미리 생성한다.
+#
+#   python rag/build_question_bank.py                 # 전체 질환
+#   python rag/build_question_bank.py --only "Major Depressive Disorder" "Panic Disorder"
+#
+# 결과: contexts/validation/question_bank.json
+# - 질환(canonical_disorder)별로 진단 기준 항목(A1, A2, B ...)마다 5점 척도 질문 1개
+# - 진단 기준이 바뀌지 않은 질환은 (검토 중인 항목 포함) 다시 생성하지 않는다. (--force면 다시 생성)
+# - 사람이 검토를 마친 질환은 "reviewed": true 로 표시해야 상담에서 사용된다. (graph.validation_bank)
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from langchain_community.vectorstores import Chroma
+
+from rag.embeddings import get_embeddings
+from rag.config import CHROMA_DIR, DSM_COLLECTION_NAME, VALIDATION_BANK_FILE, VALIDATION_MAX_QUESTIONS
+from frontend.context_handler import CONTEXT_DIR
+from frontend.gemini_api import ask_gemini_json
+
+BANK_PATH = CONTEXT_DIR / VALIDATION_BANK_FILE
+
+LETTER_PATTERN = re.compile(r"^([A-H])\.\s+(.*)")
+NUMBER_PATTERN = re.compile(r"^(\d{1,2})\.\s+(.*)")
+
+# 자기 보고 질문으로 확인할 수 없는 기준 (배제 / 감별 / 명시자)
+_SKIP_PHRASES = (
+    "not attributable to",
+    "not better explained",
+    "is not better accounted",
+    "there has never been",
+    "specify",
+    "note:",
+    "coding note",
+)
+
+QUESTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "questions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "criterion": {"type": "string", "description": "진단 기준 항목 ID (입력과 동일)"},
+                    "text": {"type": "string", "description": "사용자에게 물어볼 한국어 질문"},
+                },
+                "required": ["criterion", "text"],
+            },
+        }
+    },
+    "required": ["questions"],
+}
+
+
+def split_criteria(text: str):
+    """
+    criteria 박스 원문을 항목 리스트로 분리
+    번호 하위 항목이 있는 기준은 하위 항목(A1, A2 ...)을, 없으면 기준 자체(B, C ...)를 반환
+    Returns: [{"criterion": "A1", "text": "..."}]
+    """
+    letters = []  # [(letter, head_lines, [(number, lines)])]
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        m = LETTER_PATTERN.match(line)
+        if m:
+            letters.append((m.group(1), [m.group(2)], []))
+            continue
+        if not letters:
+            continue
+        m = NUMBER_PATTERN.match(line)
+        if m:
+            letters[-1][2].append((m.group(1), [m.group(2)]))
+        elif letters[-1][2]:
+            letters[-1][2][-1][1].append(line)
+        else:
+            letters[-1][1].append(line)
+
+    items = []
+    for letter, head, subs in letters:
+        if subs:
+            for number, lines in subs:
+                items.append({"criterion": f"{letter}{number}", "text": " ".join(lines)})
+        else:
+            items.append({"criterion": letter, "text": " ".join(head)})
+    return [i for i in items if not any(p in i["text"].lower() for p in _SKIP_PHRASES)]
+
+
+def load_criteria():
+    """DSM 인덱스에서 질환별로 가장 긴 criteria chunk 선택 -> {canonical: {"aliases", "text"}}"""
+    db = Chroma(
+        embedding_function=get_embeddings(),
+        persist_directory=CHROMA_DIR,
+        collection_name=DSM_COLLECTION_NAME,
+    )
+    raw = db.get(where={"section": "criteria"}, include=["documents", "metadatas"])
+    by_disorder = {}
+    for doc, meta in zip(raw["documents"], raw["metadatas"]):
+        name = meta.get("canonical_disorder") or meta.get("disorder")
+        if not name or not doc:
+            continue
+        entry = by_disorder.setdefault(name, {"aliases": set(), "text": ""})
+        if meta.get("disorder"):
+            entry["aliases"].add(meta["disorder"])
+        if len(doc) > len(entry["text"]):
+            entry["text"] = doc
+    return by_disorder
+
+
+def _prompt(disorder: str, items) -> str:
+    listing = "\n".join(f"- {i['criterion']}: {i['text']}" for i in items)
+    return f"""당신은 임상 심리사입니다. 아래 '{disorder}'의 DSM-5-TR 진단 기준 항목마다,
+사용자가 5점 척도(1. 전혀 그렇지 않다 ~ 5. 매우 자주/항상 그렇다)로 답할 수 있는 한국어 질문을 하나씩 작성하세요.
+
+규칙:
+- 의학 용어 대신 일상적인 표현을 사용하고, 유도 질문을 피하세요.
+- 한 질문에는 한 가지 증상만 묻고, 기간 조건이 있으면 "최근 2주 동안"처럼 질문에 포함하세요.
+- criterion 값은 입력과 똑같이 쓰고, 입력 순서를 유지하세요.
+
+## 진단 기준 항목
+{listing}
+"""
+
+
+def generate_questions(disorder: str, items):
+    response = ask_gemini_json(_prompt(disorder, items), QUESTION_SCHEMA)
+    if not response:
+        return []
+    try:
+        generated = {q["criterion"]: q["text"].strip() for q in json.loads(response).get("questions", [])}
+    except (json.JSONDecodeError, KeyError, AttributeError) as e:
+        print(f"  ! {disorder}: 응답 파싱 실패 ({e})")
+        return []
+    slug = re.sub(r"[^a-z0-9]+", "-", disorder.lower()).strip("-")[:40]
+    questions = []
+    for item in items:
+        text = generated.get(item["criterion"])
+        if text:
+            questions.append({
+                "id": f"{slug}-{item['criterion'].lower()}",
+                "criterion": item["criterion"],
+                "criterion_text": item["text"],
+                "text": text,
+                "weight": 1.0,
+            })
+    return questions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the validation question bank from DSM criteria")
+    parser.add_argument("--only", nargs="*", help="생성할 canonical 질환명 (기본: 전체)")
+    parser.add_argument("--max-questions", type=int, default=VALIDATION_MAX_QUESTIONS, help="질환당 최대 질문 수")
+    parser.add_argument("--force", action="store_true", help="진단 기준이 바뀌지 않은 항목도 다시 생성 (검토 내용은 사라짐)")
+    args = parser.parse_args()
+
+    bank = {"version": 1, "disorders": {}}
+    if BANK_PATH.exists():
+        with open(BANK_PATH, "r", encoding="utf-8") as f:
+            bank = json.load(f)
+
+    print("[bank] DSM criteria 로드 중...")
+    criteria = load_criteria()
+    targets = args.only or sorted(criteria)
+    print(f"[bank] 대상 질환 {len(targets)}개")
+
+    for disorder in targets:
+        source = criteria.get(disorder)
+        if source is None:
+            print(f"  ! Skip (criteria 없음): {disorder}")
+            continue
+        digest = hashlib.sha1(source["text"].encode("utf-8")).hexdigest()[:16]
+        existing = bank["disorders"].get(disorder)
+        if existing and existing.get("criteria_digest") == digest and not args.force:
+            # 검토 중인 항목도 유지 (다시 생성하면 수정 중인 질문이 사라짐)
+            print(f"  = {disorder}: 기준 변경 없음, 유지 ({'검토 완료' if existing.get('reviewed') else '검토 전'})")
+            continue
+
+        items = split_criteria(source["text"])[: args.max_questions]
+        if not items:
+            print(f"  ! Skip (기준 항목 분리 실패): {disorder}")
+            continue
+        questions = generate_questions(disorder, items)
+        if not questions:
+            continue
+        bank["disorders"][disorder] = {
+            "aliases": sorted(source["aliases"] - {disorder}),
+            "criteria_digest": digest,
+            "reviewed": False,
+            "questions": questions,
+        }
+        print(f"  + {disorder}: {len(questions)}개 질문")
+
+    bank["generated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    BANK_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(BANK_PATH, "w", encoding="utf-8") as f:
+        json.dump(bank, f, ensure_ascii=False, indent=2)
+    print(f"[bank] ✅ 저장: {BANK_PATH} (질환 {len(bank['disorders'])}개)")
+
+
+if __name__ == "__main__":
+    main()
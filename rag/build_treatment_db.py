@@ -16,6 +16,7 @@ from rag.config import (
     TREATMENT_COLLECTION_NAME,
 )
 from rag.embeddings import get_embeddings
+from rag.taxonomy import TREATMENT_PDF_CATEGORIES
 
 
 def chunk_text(text: str, max_chars: int = 900):
@@ -40,14 +41,8 @@ def chunk_text(text: str, max_chars: int = 900):
 
 # 💡 DSM → Treatment Category 매칭을 위해
 # Treatment DB의 metadata["disorder"] 값을 '상위 카테고리'로 통일한다.
-PDF_TO_DISORDER = {
-    "ocd.pdf": "Obsessive-Compulsive and Related Disorders",
-    "depression.pdf": "Depressive Disorders",
-    "anxietyandpanic.pdf": "Anxiety Disorders",
-    "bipolar.pdf": "Bipolar and Related Disorders",
-    "ptsd.pdf": "Posttraumatic Stress Disorder",
-    "adhd.pdf": "Attention-Deficit/Hyperactivity Disorder",
-}
+# (매핑은 rag/taxonomy.py에서 classify_disorder와 함께 관리)
+PDF_TO_DISORDER = TREATMENT_PDF_CATEGORIES
 
 
 def main():
@@ -11,10 +11,16 @@ def get_embeddings():
     )
 '''
 
+import os
+
 from langchain_community.embeddings import HuggingFaceEmbeddings
 
-def get_embeddings():
+# 인덱스를 만든 모델과 검색 모델이 같아야 함 (바꾸면 rag/build_*_db.py로 인덱스 재생성)
+EMBEDDING_MODEL = os.getenv("RAG_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+def get_embeddings(model_name: str = None):
+    # model_name: 벤치마크(app/bench_retrieval.py)에서 다른 임베딩 backend를 비교할 때 지정
     return HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2",
+        model_name=model_name or EMBEDDING_MODEL,
         model_kwargs={"device": "cpu"}   # gpu 쓰면 "cuda"
     )
\ No newline at end of file
@@ -0,0 +1,675 @@
+# rag/taxonomy.py
+
+"""
+DSM-5-TR 질환 분류(taxonomy)
+
+질환명 → (챕터, 치료 문서 카테고리, 심각도 척도 context 파일)을 한 곳에서 관리한다.
+import 시점에 정규화된 이름을 key로 하는 dict로 컴파일되므로 조회는 해시 lookup 한 번이다.
+
+사용처:
+- rag/build_dsm_db.py: KNOWN_DISORDERS (병명 타이틀 fuzzy 매칭)
+- rag/build_treatment_db.py: TREATMENT_PDF_CATEGORIES (치료 문서 metadata["disorder"])
+- rag/disorder_classifier.py / api/rag_service.py: treatment_category, metadata_matches_category
+- graph/nodes/severity.py: severity_context_file
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
+
+
+class DisorderInfo(NamedTuple):
+    name: str                          # KNOWN_DISORDERS 기준 canonical 이름
+    chapter: str                       # DSM-5-TR 챕터명
+    treatment_category: Optional[str]  # 치료 문서(Treatment DB) 카테고리
+    severity_context: Optional[str]    # contexts/diseases/ 아래 심각도 척도 파일명
+
+
+# -----------------------------
+# 치료 문서 카테고리
+# -----------------------------
+DEPRESSIVE = "Depressive Disorders"
+ANXIETY = "Anxiety Disorders"
+BIPOLAR = "Bipolar and Related Disorders"
+PSYCHOTIC = "Schizophrenia / Psychotic Disorders"
+OCD = "Obsessive-Compulsive and Related Disorders"
+DISSOCIATIVE = "Dissociative Disorders"
+PERSONALITY = "Personality Disorders"
+ADHD = "Attention-Deficit/Hyperactivity Disorder"
+ADDICTION = "Addiction / Substance Use & Gambling"
+PTSD = "Posttraumatic Stress Disorder"
+
+# Treatment DB의 metadata["disorder"] 값 (PDF 파일 → 카테고리)
+TREATMENT_PDF_CATEGORIES = {
+    "depression.pdf": DEPRESSIVE,
+    "psychosisandschizophrenia.pdf": PSYCHOTIC,
+    "anxietyandpanic.pdf": ANXIETY,
+    "bipolar.pdf": BIPOLAR,
+    "ocd.pdf": OCD,
+    "Dissociative.pdf": DISSOCIATIVE,
+    "personality.pdf": PERSONALITY,
+    "adhd.pdf": ADHD,
+    "addiction.pdf": ADDICTION,
+    "ptsd.pdf": PTSD,
+}
+
+
+# -----------------------------
+# DSM-5-TR 챕터별 질환 목록
+# (챕터명, 심각도 context 파일, 질환 목록)
+# -----------------------------
+DSM_CHAPTERS = [
+    ("Neurodevelopmental Disorders", None, [
+        "Intellectual Developmental Disorder (Intellectual Disability)",
+        "Global Developmental Delay",
+        "Unspecified Intellectual Developmental Disorder (Intellectual Disability)",
+        "Language Disorder",
+        "Speech Sound Disorder",
+        "Childhood-Onset Fluency Disorder (Stuttering)",
+        "Social (Pragmatic) Communication Disorder",
+        "Unspecified Communication Disorder",
+        "Autism Spectrum Disorder",
+        "Attention-Deficit/Hyperactivity Disorder",
+        "Other Specified Attention-Deficit/Hyperactivity Disorder",
+        "Unspecified Attention-Deficit/Hyperactivity Disorder",
+        "Specific Learning Disorder",
+        "Developmental Coordination Disorder",
+        "Stereotypic Movement Disorder",
+        "Tourette's Disorder",
+        "Tic Disorders",
+        "Persistent (Chronic) Motor or Vocal Tic Disorder",
+        "Provisional Tic Disorder",
+        "Other Specified Tic Disorder",
+        "Unspecified Tic Disorder",
+        "Other Specified Neurodevelopmental Disorder",
+        "Unspecified Neurodevelopmental Disorder",
+    ]),
+
+    ("Schizophrenia Spectrum and Other Psychotic Disorders", "schizophrenia.json", [
+        "Schizotypal (Personality) Disorder",
+        "Delusional Disorder",
+        "Brief Psychotic Disorder",
+        "Schizophreniform Disorder",
+        "Schizophrenia",
+        "Schizoaffective Disorder",
+        "Substance/Medication-Induced Psychotic Disorder",
+        "Psychotic Disorder Due to Another Medical Condition",
+        "Catatonia Associated With Another Mental Disorder",
+        "Catatonic Disorder Due to Another Medical Condition",
+        "Unspecified Catatonia",
+        "Other Specified Schizophrenia Spectrum and Other Psychotic Disorder",
+        "Unspecified Schizophrenia Spectrum and Other Psychotic Disorder",
+    ]),
+
+    ("Bipolar and Related Disorders", "bipolar.json", [
+        "Bipolar I Disorder",
+        "Bipolar II Disorder",
+        "Cyclothymic Disorder",
+        "Substance/Medication-Induced Bipolar and Related Disorder",
+        "Bipolar and Related Disorder Due to Another Medical Condition",
+        "Other Specified Bipolar and Related Disorder",
+        "Unspecified Bipolar and Related Disorder",
+        "Unspecified Mood Disorder",
+    ]),
+
+    ("Depressive Disorders", "depression.json", [
+        "Disruptive Mood Dysregulation Disorder",
+        "Major Depressive Disorder",
+        "Persistent Depressive Disorder",
+        "Premenstrual Dysphoric Disorder",
+        "Substance/Medication-Induced Depressive Disorder",
+        "Depressive Disorder Due to Another Medical Condition",
+        "Other Specified Depressive Disorder",
+        "Unspecified Depressive Disorder",
+    ]),
+
+    ("Anxiety Disorders", "anxiety.json", [
+        "Separation Anxiety Disorder",
+        "Selective Mutism",
+        "Specific Phobia",
+        "Social Anxiety Disorder",
+        "Panic Disorder",
+        "Agoraphobia",
+        "Generalized Anxiety Disorder",
+        "Substance/Medication-Induced Anxiety Disorder",
+        "Anxiety Disorder Due to Another Medical Condition",
+        "Other Specified Anxiety Disorder",
+        "Unspecified Anxiety Disorder",
+    ]),
+
+    ("Obsessive-Compulsive and Related Disorders", "ocd.json", [
+        "Obsessive-Compulsive Disorder",
+        "Body Dysmorphic Disorder",
+        "Hoarding Disorder",
+        "Trichotillomania (Hair-Pulling Disorder)",
+        "Excoriation (Skin-Picking) Disorder",
+        "Substance/Medication-Induced Obsessive-Compulsive and Related Disorder",
+        "Obsessive-Compulsive and Related Disorder Due to Another Medical Condition",
+        "Other Specified Obsessive-Compulsive and Related Disorder",
+        "Unspecified Obsessive-Compulsive and Related Disorder",
+    ]),
+
+    ("Trauma- and Stressor-Related Disorders", None, [
+        "Reactive Attachment Disorder",
+        "Disinhibited Social Engagement Disorder",
+        "Posttraumatic Stress Disorder",
+        "Posttraumatic Stress Disorder in Individuals Older Than 6 Years",
+        "Posttraumatic Stress Disorder in Children 6 Years and Younger",
+        "Acute Stress Disorder",
+        "Adjustment Disorders",
+        "Prolonged Grief Disorder",
+        "Other Specified Trauma- and Stressor-Related Disorder",
+        "Unspecified Trauma- and Stressor-Related Disorder",
+    ]),
+
+    ("Dissociative Disorders", None, [
+        "Dissociative Identity Disorder",
+        "Dissociative Amnesia",
+        "Depersonalization/Derealization Disorder",
+        "Other Specified Dissociative Disorder",
+        "Unspecified Dissociative Disorder",
+    ]),
+
+    ("Somatic Symptom and Related Disorders", None, [
+        "Somatic Symptom Disorder",
+        "Illness Anxiety Disorder",
+        "Functional Neurological Symptom Disorder (Conversion Disorder)",
+        "Psychological Factors Affecting Other Medical Conditions",
+        "Factitious Disorder",
+        "Factitious Disorder Imposed on Self",
+        "Factitious Disorder Imposed on Another",
+        "Other Specified Somatic Symptom and Related Disorder",
+        "Unspecified Somatic Symptom and Related Disorder",
+    ]),
+
+    ("Feeding and Eating Disorders", None, [
+        "Pica",
+        "Rumination Disorder",
+        "Avoidant/Restrictive Food Intake Disorder",
+        "Anorexia Nervosa",
+        "Bulimia Nervosa",
+        "Binge-Eating Disorder",
+        "Other Specified Feeding or Eating Disorder",
+        "Unspecified Feeding or Eating Disorder",
+    ]),
+
+    ("Elimination Disorders", None, [
+        "Enuresis",
+        "Encopresis",
+        "Other Specified Elimination Disorder",
+        "Unspecified Elimination Disorder",
+    ]),
+
+    ("Sleep-Wake Disorders", None, [
+        "Insomnia Disorder",
+        "Hypersomnolence Disorder",
+        "Narcolepsy",
+        "Obstructive Sleep Apnea Hypopnea",
+        "Central Sleep Apnea",
+        "Sleep-Related Hypoventilation",
+        "Circadian Rhythm Sleep-Wake Disorder",
+        "Non–Rapid Eye Movement Sleep Arousal Disorders",
+        "Nightmare Disorder",
+        "Rapid Eye Movement Sleep Behavior Disorder",
+        "Restless Legs Syndrome",
+        "Substance/Medication-Induced Sleep Disorder",
+        "Other Specified Insomnia Disorder",
+        "Unspecified Insomnia Disorder",
+        "Other Specified Hypersomnolence Disorder",
+        "Unspecified Hypersomnolence Disorder",
+        "Other Specified Sleep-Wake Disorder",
+        "Unspecified Sleep-Wake Disorder",
+    ]),
+
+    ("Sexual Dysfunctions", None, [
+        "Delayed Ejaculation",
+        "Erectile Disorder",
+        "Female Orgasmic Disorder",
+        "Female Sexual Interest/Arousal Disorder",
+        "Genito-Pelvic Pain/Penetration Disorder",
+        "Male Hypoactive Sexual Desire Disorder",
+        "Premature (Early) Ejaculation",
+        "Substance/Medication-Induced Sexual Dysfunction",
+        "Other Specified Sexual Dysfunction",
+        "Unspecified Sexual Dysfunction",
+    ]),
+
+    ("Gender Dysphoria", None, [
+        "Gender Dysphoria in Children",
+        "Gender Dysphoria in Adolescents and Adults",
+        "Other Specified Gender Dysphoria",
+        "Unspecified Gender Dysphoria",
+    ]),
+
+    ("Disruptive, Impulse-Control, and Conduct Disorders", None, [
+        "Oppositional Defiant Disorder",
+        "Intermittent Explosive Disorder",
+        "Conduct Disorder",
+        "Antisocial Personality Disorder",
+        "Pyromania",
+        "Kleptomania",
+        "Other Specified Disruptive, Impulse-Control, and Conduct Disorder",
+        "Unspecified Disruptive, Impulse-Control, and Conduct Disorder",
+    ]),
+
+    ("Substance-Related and Addictive Disorders", "substance.json", [
+        "Alcohol Use Disorder",
+        "Alcohol Intoxication",
+        "Alcohol Withdrawal",
+        "Alcohol-Induced Psychotic Disorder",
+        "Alcohol-Induced Bipolar and Related Disorder",
+        "Alcohol-Induced Depressive Disorder",
+        "Alcohol-Induced Anxiety Disorder",
+        "Alcohol-Induced Sleep Disorder",
+        "Alcohol-Induced Sexual Dysfunction",
+        "Alcohol Intoxication Delirium",
+        "Alcohol Withdrawal Delirium",
+        "Alcohol-Induced Major Neurocognitive Disorder",
+        "Alcohol-Induced Mild Neurocognitive Disorder",
+        "Unspecified Alcohol-Related Disorder",
+
+        "Caffeine Intoxication",
+        "Caffeine Withdrawal",
+        "Caffeine-Induced Anxiety Disorder",
+        "Caffeine-Induced Sleep Disorder",
+        "Unspecified Caffeine-Related Disorder",
+
+        "Cannabis Use Disorder",
+        "Cannabis Intoxication",
+        "Cannabis Withdrawal",
+        "Cannabis-Induced Psychotic Disorder",
+        "Cannabis-Induced Anxiety Disorder",
+        "Cannabis-Induced Sleep Disorder",
+        "Cannabis Intoxication Delirium",
+        "Unspecified Cannabis-Related Disorder",
+
+        "Phencyclidine Use Disorder",
+        "Other Hallucinogen Use Disorder",
+        "Phencyclidine Intoxication",
+        "Other Hallucinogen Intoxication",
+        "Hallucinogen Persisting Perception Disorder",
+        "Phencyclidine-Induced Psychotic Disorder",
+        "Phencyclidine-Induced Bipolar and Related Disorder",
+        "Phencyclidine-Induced Depressive Disorder",
+        "Phencyclidine-Induced Anxiety Disorder",
+        "Phencyclidine Intoxication Delirium",
+        "Other Hallucinogen–Induced Psychotic Disorder",
+        "Other Hallucinogen–Induced Bipolar and Related Disorder",
+        "Other Hallucinogen–Induced Depressive Disorder",
+        "Other Hallucinogen-Induced Anxiety Disorder",
+        "Other Hallucinogen Intoxication Delirium",
+        "Unspecified Phencyclidine-Related Disorder",
+        "Unspecified Hallucinogen-Related Disorder",
+
+        "Inhalant Use Disorder",
+        "Inhalant Intoxication",
+        "Inhalant-Induced Psychotic Disorder",
+        "Inhalant-Induced Depressive Disorder",
+        "Inhalant-Induced Anxiety Disorder",
+        "Inhalant Intoxication Delirium",
+        "Inhalant-Induced Major Neurocognitive Disorder",
+        "Inhalant-Induced Mild Neurocognitive Disorder",
+        "Unspecified Inhalant-Related Disorder",
+
+        "Opioid Use Disorder",
+        "Opioid Intoxication",
+        "Opioid Withdrawal",
+        "Opioid-Induced Depressive Disorder",
+        "Opioid-Induced Anxiety Disorder",
+        "Opioid-Induced Sleep Disorder",
+        "Opioid-Induced Sexual Dysfunction",
+        "Opioid Intoxication Delirium",
+        "Opioid Withdrawal Delirium",
+        "Opioid-Induced Delirium",
+        "Unspecified Opioid-Related Disorder",
+
+        "Sedative, Hypnotic, or Anxiolytic Use Disorder",
+        "Sedative, Hypnotic, or Anxiolytic Intoxication",
+        "Sedative, Hypnotic, or Anxiolytic Withdrawal",
+        "Sedative, Hypnotic, or Anxiolytic-Induced Psychotic Disorder",
+        "Sedative, Hypnotic, or Anxiolytic-Induced Bipolar and Related Disorder",
+        "Sedative, Hypnotic, or Anxiolytic-Induced Depressive Disorder",
+        "Sedative, Hypnotic, or Anxiolytic-Induced Anxiety Disorder",
+        "Sedative, Hypnotic, or Anxiolytic-Induced Sleep Disorder",
+        "Sedative, Hypnotic, or Anxiolytic-Induced Sexual Dysfunction",
+        "Sedative, Hypnotic, or Anxiolytic Intoxication Delirium",
+        "Sedative, Hypnotic, or Anxiolytic Withdrawal Delirium",
+        "Sedative, Hypnotic, or Anxiolytic-Induced Delirium",
+        "Sedative, Hypnotic, or Anxiolytic-Induced Major Neurocognitive Disorder",
+        "Sedative, Hypnotic, or Anxiolytic-Induced Mild Neurocognitive Disorder",
+        "Unspecified Sedative, Hypnotic, or Anxiolytic-Related Disorder",
+
+        "Stimulant Use Disorder",
+        "Stimulant Intoxication",
+        "Stimulant Withdrawal",
+        "Amphetamine-Type Substance (or Other Stimulant)–Induced Psychotic Disorder",
+        "Cocaine-Induced Psychotic Disorder",
+        "Amphetamine-Type Substance (or Other Stimulant)–Induced Bipolar and Related Disorder",
+        "Cocaine-Induced Bipolar and Related Disorder",
+        "Amphetamine-Type Substance (or Other Stimulant)–Induced Depressive Disorder",
+        "Cocaine-Induced Depressive Disorder",
+        "Amphetamine-Type Substance (or Other Stimulant)–Induced Anxiety Disorder",
+        "Cocaine-Induced Anxiety Disorder",
+        "Amphetamine-Type Substance (or Other Stimulant)–Induced Obsessive-Compulsive and Related Disorder",
+        "Cocaine-Induced Obsessive-Compulsive and Related Disorder",
+        "Amphetamine-Type Substance (or Other Stimulant)–Induced Sleep Disorder",
+        "Cocaine-Induced Sleep Disorder",
+        "Amphetamine-Type Substance (or Other Stimulant)–Induced Sexual Dysfunction",
+        "Cocaine-Induced Sexual Dysfunction",
+        "Amphetamine-Type Substance (or Other Stimulant) Intoxication Delirium",
+        "Cocaine Intoxication Delirium",
+        "Amphetamine-Type Substance (or Other Stimulant)–Induced Mild Neurocognitive Disorder",
+        "Cocaine-Induced Mild Neurocognitive Disorder",
+        "Unspecified Stimulant-Related Disorder",
+
+        "Tobacco Use Disorder",
+        "Tobacco Withdrawal",
+        "Tobacco-Induced Sleep Disorder",
+        "Unspecified Tobacco-Related Disorder",
+
+        "Other (or Unknown) Substance Use Disorder",
+        "Other (or Unknown) Substance Intoxication",
+        "Other (or Unknown) Substance Withdrawal",
+        "Other (or Unknown) Substance–Induced Psychotic Disorder",
+        "Other (or Unknown) Substance–Induced Bipolar and Related Disorder",
+        "Other (or Unknown) Substance–Induced Depressive Disorder",
+        "Other (or Unknown) Substance–Induced Anxiety Disorder",
+        "Other (or Unknown) Substance–Induced Obsessive-Compulsive and Related Disorder",
+        "Other (or Unknown) Substance–Induced Sleep Disorder",
+        "Other (or Unknown) Substance–Induced Sexual Dysfunction",
+        "Other (or Unknown) Substance Intoxication Delirium",
+        "Other (or Unknown) Substance Withdrawal Delirium",
+        "Other (or Unknown) Medication–Induced Delirium",
+        "Other (or Unknown) Substance–Induced Major Neurocognitive Disorder",
+        "Other (or Unknown) Substance–Induced Mild Neurocognitive Disorder",
+        "Unspecified Other (or Unknown) Substance–Related Disorder",
+
+        "Gambling Disorder",
+    ]),
+
+    ("Neurocognitive Disorders", None, [
+        "Delirium",
+        "Other Specified Delirium",
+        "Unspecified Delirium",
+
+        "Major Neurocognitive Disorder Due to Alzheimer’s Disease",
+        "Mild Neurocognitive Disorder Due to Alzheimer’s Disease",
+        "Major Neurocognitive Disorder Due to Frontotemporal Degeneration",
+        "Mild Neurocognitive Disorder Due to Frontotemporal Degeneration",
+        "Major Neurocognitive Disorder With Lewy Bodies",
+        "Mild Neurocognitive Disorder With Lewy Bodies",
+        "Major Neurocognitive Disorder Due to Vascular Disease",
+        "Mild Neurocognitive Disorder Due to Vascular Disease",
+        "Major Neurocognitive Disorder Due to Traumatic Brain Injury",
+        "Mild Neurocognitive Disorder Due to Traumatic Brain Injury",
+        "Substance/Medication-Induced Major Neurocognitive Disorder",
+        "Substance/Medication-Induced Mild Neurocognitive Disorder",
+        "Major Neurocognitive Disorder Due to HIV Infection",
+        "Mild Neurocognitive Disorder Due to HIV Infection",
+        "Major Neurocognitive Disorder Due to Prion Disease",
+        "Mild Neurocognitive Disorder Due to Prion Disease",
+        "Major Neurocognitive Disorder Due to Parkinson’s Disease",
+        "Mild Neurocognitive Disorder Due to Parkinson’s Disease",
+        "Major Neurocognitive Disorder Due to Huntington’s Disease",
+        "Mild Neurocognitive Disorder Due to Huntington’s Disease",
+        "Major Neurocognitive Disorder Due to Another Medical Condition",
+        "Mild Neurocognitive Disorder Due to Another Medical Condition",
+        "Major Neurocognitive Disorder Due to Multiple Etiologies",
+        "Mild Neurocognitive Disorder Due to Multiple Etiologies",
+        "Unspecified Neurocognitive Disorder",
+    ]),
+
+    ("Personality Disorders", None, [
+        "Paranoid Personality Disorder",
+        "Schizoid Personality Disorder",
+        "Schizotypal Personality Disorder",
+        "Borderline Personality Disorder",
+        "Histrionic Personality Disorder",
+        "Narcissistic Personality Disorder",
+        "Avoidant Personality Disorder",
+        "Dependent Personality Disorder",
+        "Obsessive-Compulsive Personality Disorder",
+        "Personality Change Due to Another Medical Condition",
+        "Other Specified Personality Disorder",
+        "Unspecified Personality Disorder",
+    ]),
+
+    ("Paraphilic Disorders", None, [
+        "Voyeuristic Disorder",
+        "Exhibitionistic Disorder",
+        "Frotteuristic Disorder",
+        "Sexual Masochism Disorder",
+        "Sexual Sadism Disorder",
+        "Pedophilic Disorder",
+        "Fetishistic Disorder",
+        "Transvestic Disorder",
+        "Other Specified Paraphilic Disorder",
+        "Unspecified Paraphilic Disorder",
+    ]),
+
+    ("Other Mental Disorders", None, [
+        "Other Specified Mental Disorder Due to Another Medical Condition",
+        "Unspecified Mental Disorder Due to Another Medical Condition",
+        "Other Specified Mental Disorder",
+        "Unspecified Mental Disorder",
+    ]),
+]
+
+# 챕터 기본값과 다른 질환별 심각도 context 파일
+SEVERITY_OVERRIDES = {
+    "Attention-Deficit/Hyperactivity Disorder": "adhd.json",
+    "Other Specified Attention-Deficit/Hyperactivity Disorder": "adhd.json",
+    "Unspecified Attention-Deficit/Hyperactivity Disorder": "adhd.json",
+}
+
+# 치료 카테고리는 챕터 단위가 아니라 질환별로만 지정 (목록 / 규칙에 없는 질환은 None -> Solution 검색 안 함)
+# 같은 챕터라도 치료 문서가 맞지 않는 질환(예: Prolonged Grief Disorder, Reactive Attachment Disorder)이 있으므로
+# 범위를 넓힐 때는 질환 단위로 추가
+TREATMENT_CATEGORIES = {
+    DEPRESSIVE: [
+        "Major Depressive Disorder",
+        "Persistent Depressive Disorder",
+        "Premenstrual Dysphoric Disorder",
+    ],
+    ANXIETY: [
+        "Generalized Anxiety Disorder",
+        "Panic Disorder",
+        "Agoraphobia",
+        "Social Anxiety Disorder",
+        "Specific Phobia",
+        "Separation Anxiety Disorder",
+        "Selective Mutism",
+    ],
+    BIPOLAR: [
+        "Bipolar I Disorder",
+        "Bipolar II Disorder",
+        "Cyclothymic Disorder",
+    ],
+    PSYCHOTIC: [
+        "Schizophrenia",
+        "Schizoaffective Disorder",
+        "Schizophreniform Disorder",
+        "Brief Psychotic Disorder",
+        "Delusional Disorder",
+    ],
+    OCD: [
+        "Obsessive-Compulsive Disorder",
+        "Body Dysmorphic Disorder",
+        "Hoarding Disorder",
+        "Trichotillomania (Hair-Pulling Disorder)",  # 기존 목록의 "Trichotillomania"와 같은 key
+        "Excoriation (Skin-Picking) Disorder",
+    ],
+    DISSOCIATIVE: [
+        "Dissociative Amnesia",
+        "Dissociative Identity Disorder",
+        "Depersonalization/Derealization Disorder",
+    ],
+    ADHD: [
+        "Attention-Deficit/Hyperactivity Disorder",
+        "Oppositional Defiant Disorder",
+        "Conduct Disorder",
+        "Intermittent Explosive Disorder",
+    ],
+    ADDICTION: [
+        "Gambling Disorder",
+    ],
+    PTSD: [
+        "Posttraumatic Stress Disorder",
+        "Acute Stress Disorder",
+        "Adjustment Disorders",
+    ],
+}
+# 목록 외 규칙: "... Personality Disorder" -> Personality, 물질 사용 / 중독 / 금단 -> Addiction
+_PERSONALITY_SUFFIX = "personality disorder"
+
+
+# KNOWN_DISORDERS에 없는 이름(LLM이 변형해 출력한 병명 등)을 위한 단어 → 챕터 대응
+_KEYWORD_CHAPTERS = {
+    "depressive": "Depressive Disorders",
+    "depression": "Depressive Disorders",
+    "anxiety": "Anxiety Disorders",
+    "panic": "Anxiety Disorders",
+    "phobia": "Anxiety Disorders",
+    "bipolar": "Bipolar and Related Disorders",
+    "schizophrenia": "Schizophrenia Spectrum and Other Psychotic Disorders",
+    "psychotic": "Schizophrenia Spectrum and Other Psychotic Disorders",
+    "obsessive-compulsive": "Obsessive-Compulsive and Related Disorders",
+    "ocd": "Obsessive-Compulsive and Related Disorders",
+    "substance": "Substance-Related and Addictive Disorders",
+    "gambling": "Substance-Related and Addictive Disorders",
+    "dissociative": "Dissociative Disorders",
+    "posttraumatic": "Trauma- and Stressor-Related Disorders",
+    "ptsd": "Trauma- and Stressor-Related Disorders",
+}
+_KEYWORD_DISORDERS = {
+    "adhd": "Attention-Deficit/Hyperactivity Disorder",
+}
+_SUBSTANCE_SUFFIXES = ("use disorder", "intoxication", "withdrawal")
+
+
+# -----------------------------
+# 정규화 & 컴파일
+# -----------------------------
+_ICD_PREFIX = re.compile(r"^F\d{2}(\.\d+)?\s+")
+_PARENS = re.compile(r"\s*\([^)]*\)")
+_SPACES = re.compile(r"\s+")
+_DASHES = str.maketrans({"–": "-", "—": "-", "’": "'"})
+
+
+def normalize_name(name: str) -> str:
+    """
+    질환명 비교용 정규화 (ICD 코드 / 괄호 / 대시·따옴표 변형 / 공백 / 대소문자 차이 제거)
+    예: "F32.1 Major Depressive Disorder" -> "major depressive disorder"
+    """
+    t = (name or "").strip().translate(_DASHES)
+    t = _ICD_PREFIX.sub("", t)
+    t = _PARENS.sub("", t)
+    t = _SPACES.sub(" ", t)
+    return t.strip().lower()
+
+
+_CATEGORY_BY_NAME = {name: category for category, names in TREATMENT_CATEGORIES.items() for name in names}
+
+
+def _rule_category(key: str) -> Optional[str]:
+    # key: 소문자 질환명
+    if key.endswith(_PERSONALITY_SUFFIX):
+        return PERSONALITY
+    if any(s in key for s in _SUBSTANCE_SUFFIXES):
+        return ADDICTION
+    return None
+
+
+def _compile():
+    by_name: Dict[str, DisorderInfo] = {}
+    by_key: Dict[str, DisorderInfo] = {}
+    chapters: Dict[str, DisorderInfo] = {}
+    for chapter, severity, names in DSM_CHAPTERS:
+        chapters[chapter] = DisorderInfo(chapter, chapter, None, severity)
+        for name in names:
+            cat = _CATEGORY_BY_NAME.get(name) or _rule_category(name.lower())
+            info = DisorderInfo(name, chapter, cat, SEVERITY_OVERRIDES.get(name, severity))
+            by_name.setdefault(name, info)
+            # 원문 소문자 / 정규화 이름 둘 다 key로 등록 (먼저 나온 항목 우선)
+            by_key.setdefault(name.lower(), info)
+            by_key.setdefault(normalize_name(name), info)
+    return by_name, by_key, chapters
+
+
+DISORDERS, _BY_KEY, _CHAPTER_INFO = _compile()
+
+KNOWN_DISORDERS: List[str] = list(DISORDERS.keys())
+
+# 치료 카테고리별로 허용되는 Treatment DB metadata["disorder"] 값
+# (카테고리명 자체 + 예전 인덱스에 남아 있을 수 있는 PDF 파일명)
+_CATEGORY_METADATA_KEYS: Dict[str, frozenset] = {}
+for _pdf, _cat in TREATMENT_PDF_CATEGORIES.items():
+    _keys = set(_CATEGORY_METADATA_KEYS.get(_cat, ()))
+    _keys.update({_cat.lower(), _pdf.rsplit(".", 1)[0].lower()})
+    _CATEGORY_METADATA_KEYS[_cat] = frozenset(_keys)
+
+
+# -----------------------------
+# 조회 API
+# -----------------------------
+def _guess(key: str) -> Optional[DisorderInfo]:
+    # 1) 단어 단위 키워드 매칭
+    for token in re.split(r"[\s/,]+", key):
+        if token in _KEYWORD_DISORDERS:
+            return DISORDERS[_KEYWORD_DISORDERS[token]]
+        if token in _KEYWORD_CHAPTERS:
+            return _CHAPTER_INFO[_KEYWORD_CHAPTERS[token]]
+    # 2) 접미사 규칙
+    if key.endswith(_PERSONALITY_SUFFIX):
+        return _CHAPTER_INFO["Personality Disorders"]
+    if any(s in key for s in _SUBSTANCE_SUFFIXES):
+        return _CHAPTER_INFO["Substance-Related and Addictive Disorders"]
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _fallback(key: str) -> Optional[DisorderInfo]:
+    # 추정한 챕터 / 질환은 이름 정규화와 심각도 척도에만 쓰고, 치료 카테고리는 이름 규칙으로만 정함
+    info = _guess(key)
+    if info is None:
+        return None
+    return info._replace(treatment_category=_rule_category(key))
+
+
+def lookup(name: Optional[str]) -> Optional[DisorderInfo]:
+    """
+    질환명 → DisorderInfo
+    KNOWN_DISORDERS에 있는 이름은 해시 lookup, 없으면 키워드 규칙으로 챕터를 추정 (결과 캐시)
+    """
+    if not name:
+        return None
+    info = _BY_KEY.get(name.strip().lower())
+    if info is not None:
+        return info
+    key = normalize_name(name)
+    return _BY_KEY.get(key) or _fallback(key)
+
+
+def chapter_of(name: Optional[str]) -> Optional[str]:
+    info = lookup(name)
+    return info.chapter if info else None
+
+
+def treatment_category(name: Optional[str]) -> Optional[str]:
+    info = lookup(name)
+    return info.treatment_category if info else None
+
+
+def severity_context_file(name: Optional[str]) -> Optional[str]:
+    info = lookup(name)
+    return info.severity_context if info else None
+
+
+def metadata_matches_category(meta_disorder: Optional[str], category: Optional[str]) -> bool:
+    """Treatment DB chunk의 metadata["disorder"]가 치료 카테고리에 해당하는지"""
+    if not meta_disorder or not category:
+        return False
+    keys = _CATEGORY_METADATA_KEYS.get(category)
+    if keys is None:
+        return meta_disorder.lower() == category.lower()
+    return meta_disorder.lower() in keys
@@ -0,0 +1,7 @@
+import os, sys
+
+# 프로젝트 루트 경로 잡아주기
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 실제 Gemini 대신 로컬 backend 사용 (각 테스트에서 configure_gateway로 응답기 주입)
+os.environ.setdefault("LLM_BACKEND", "stub")
@@ -0,0 +1,13 @@
+# 프롬프트 구성: 히스토리가 있어도 단계별 시스템 지시사항(context)은 유지
+
+from frontend.gemini_api import _build_prompt
+
+
+def test_context_survives_conversation_history():
+    history = [{"role": "user", "content": "잠을 못 자요."}, {"role": "model", "content": "언제부터 그러셨나요?"}]
+    prompt = _build_prompt("한 달쯤이요.", context="## 출력 형식\n---INTERNAL_DATA---", conversation_history=history, conversation_summary="- 불면 호소")
+
+    assert "## 출력 형식" in prompt
+    assert prompt.index("## 출력 형식") < prompt.index("이전 대화:") < prompt.index("현재 사용자 질문: 한 달쯤이요.")
+    assert "상담사: 언제부터 그러셨나요?" in prompt
+    assert prompt.index("- 불면 호소") < prompt.index("## 출력 형식")
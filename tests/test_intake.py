@@ -0,0 +1,25 @@
+# Intake 요청 구성: 고정된 시작 트리거로 여는 첫 턴만 응답 캐시 허용 (사용자 발화는 공유 캐시에 저장하지 않음)
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import graph.nodes.intake as intake
+
+
+def test_only_the_start_trigger_opts_into_the_response_cache(monkeypatch):
+    monkeypatch.setattr(intake, "INTAKE_DOMAIN_DETECTOR", False)
+
+    request, _ = intake._prepare_intake({"messages": []})
+    assert request["user_input"] == intake.START_TRIGGER
+    assert request["cache"] is True
+
+    request, _ = intake._prepare_intake({"messages": [HumanMessage(content=intake.START_TRIGGER)]})
+    assert request["cache"] is True
+
+    # 첫 실제 발화도 민감한 내용이므로 캐시하지 않음
+    request, _ = intake._prepare_intake({"messages": [HumanMessage(content="요즘 잠을 못 자요.")]})
+    assert request["cache"] is False
+    assert request["conversation_history"] == []
+
+    messages = [HumanMessage(content="요즘 잠을 못 자요."), AIMessage(content="언제부터 그러셨나요?"), HumanMessage(content="한 달쯤이요.")]
+    request, _ = intake._prepare_intake({"messages": messages})
+    assert request["cache"] is False
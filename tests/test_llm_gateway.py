@@ -0,0 +1,116 @@
+# circuit breaker: half-open 시험 요청이 어떻게 끝나든 다음 요청이 다시 시험할 수 있어야 함
+
+import asyncio
+import time
+
+import pytest
+
+from frontend.llm_gateway import CircuitBreaker, CircuitOpenError, LLMGateway, StubBackend
+
+
+class Responder:
+    def __init__(self):
+        self.error = None
+
+    def __call__(self, prompt, generation_config=None):
+        if self.error is not None:
+            raise self.error
+        return "응답입니다"
+
+
+def _half_open_gateway():
+    responder = Responder()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    gateway = LLMGateway(backend=StubBackend(responder=responder), rpm=1e6, tpm=1e9, max_retries=0, hedge=False, breaker=breaker)
+    responder.error = ConnectionError("down")
+    with pytest.raises(ConnectionError):
+        gateway.generate("안녕")
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        gateway.generate("안녕")
+    time.sleep(0.06)
+    return gateway, responder
+
+
+def test_non_transient_trial_error_releases_half_open():
+    gateway, responder = _half_open_gateway()
+    # 안전 필터 차단 등 (response.text의 ValueError)
+    responder.error = ValueError("blocked")
+    with pytest.raises(ValueError):
+        gateway.generate("안녕")
+    responder.error = None
+    assert gateway.generate("안녕") == "응답입니다"
+    assert gateway.breaker.state == "closed"
+
+
+def test_stream_closed_early_releases_half_open():
+    gateway, responder = _half_open_gateway()
+    responder.error = None
+    stream = gateway.stream("안녕")
+    next(stream)
+    stream.close()
+    assert "".join(gateway.stream("안녕")) == "응답입니다"
+    assert gateway.breaker.state == "closed"
+
+
+def test_transient_trial_failure_reopens():
+    gateway, responder = _half_open_gateway()
+    with pytest.raises(ConnectionError):
+        gateway.generate("안녕")
+    assert gateway.breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        gateway.generate("안녕")
+
+
+# hedge: 스트리밍은 첫 chunk까지의 시간으로 판단, 한도가 없으면 보내지 않고 토큰도 차감하지 않음
+
+def _slow_then_fast(first: float):
+    delays = iter([first, 0.0])
+    return lambda rng: next(delays, 0.0)
+
+
+def _hedging_gateway(backend, rpm=1e6):
+    gateway = LLMGateway(backend=backend, rpm=rpm, tpm=1e9, max_retries=0, hedge=True, hedge_min_delay=0.05)
+    for kind in ("generate", "stream"):
+        gateway._latencies[kind].extend([0.01] * 20)
+    return gateway
+
+
+def test_stream_hedges_a_slow_first_chunk():
+    backend = StubBackend(responder=lambda prompt, config=None: "응답입니다", latency_sampler=_slow_then_fast(2.0))
+    gateway = _hedging_gateway(backend)
+    started = time.perf_counter()
+    assert "".join(gateway.stream("안녕")) == "응답입니다"
+    assert time.perf_counter() - started < 1.0
+    assert backend.calls == 2
+    # 첫 chunk 지연이 다음 hedge 기준에 반영됨
+    assert len(gateway._latencies["stream"]) == 21
+
+
+def test_astream_hedges_a_slow_first_chunk():
+    backend = StubBackend(responder=lambda prompt, config=None: "응답입니다", latency_sampler=_slow_then_fast(2.0))
+    gateway = _hedging_gateway(backend)
+
+    async def collect():
+        return "".join([chunk async for chunk in gateway.astream("안녕")])
+
+    started = time.perf_counter()
+    assert asyncio.run(collect()) == "응답입니다"
+    assert time.perf_counter() - started < 1.0
+    assert backend.calls == 2
+
+
+def test_fast_stream_sends_no_hedge():
+    backend = StubBackend(responder=lambda prompt, config=None: "응답입니다")
+    gateway = _hedging_gateway(backend)
+    assert "".join(gateway.stream("안녕")) == "응답입니다"
+    assert backend.calls == 1
+
+
+def test_skipped_hedge_does_not_consume_rate_limit():
+    # 분당 1건: 첫 요청이 한도를 다 쓰면 hedge는 보내지 않고 버킷도 그대로
+    backend = StubBackend(responder=lambda prompt, config=None: "응답입니다", latency_sampler=_slow_then_fast(0.2))
+    gateway = _hedging_gateway(backend, rpm=1)
+    assert gateway.generate("안녕") == "응답입니다"
+    assert backend.calls == 1
+    assert gateway.requests._tokens > -0.5
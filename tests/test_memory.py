@@ -0,0 +1,29 @@
+# 대화 메모리: 요약된 메시지 + 원문 히스토리가 매 턴 이전 대화 전체를 빠짐없이 덮어야 함
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from graph.memory import RECENT_WINDOW, SUMMARY_REFRESH_MESSAGES, _pending, recent_history
+
+
+def test_unsummarized_messages_stay_in_history():
+    messages, summarized = [], 0
+    for turn in range(30):
+        messages = messages + [HumanMessage(content=f"user {turn}")]
+        state = {"messages": messages, "summarized_message_count": summarized}
+        pending, end = _pending(state)
+        if len(pending) >= SUMMARY_REFRESH_MESSAGES:
+            summarized = end  # refresh_summary 성공
+
+        history = recent_history(messages, summarized)
+        previous = messages[:-1]
+        # 요약 범위 바로 다음부터 현재 입력 직전까지 원문으로 전달
+        assert [h["content"] for h in history] == [m.content for m in previous[summarized:]]
+        assert len(history) >= min(len(previous), RECENT_WINDOW)
+        assert len(history) <= RECENT_WINDOW + SUMMARY_REFRESH_MESSAGES - 1
+        messages = messages + [AIMessage(content=f"counselor {turn}")]
+
+
+def test_failed_refresh_keeps_sending_raw_messages():
+    messages = [HumanMessage(content=str(i)) if i % 2 == 0 else AIMessage(content=str(i)) for i in range(21)]
+    history = recent_history(messages, 0)
+    assert len(history) == 20
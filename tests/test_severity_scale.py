@@ -0,0 +1,42 @@
+# 척도 응답 파싱: 문항에 나오는 숫자("지난 2주 동안")나 일수("3일 정도")를 보기 번호로 읽지 않아야 함
+
+import pytest
+
+from graph.severity_scale import load_scale
+
+
+@pytest.fixture(scope="module")
+def phq9():
+    return load_scale("Major Depressive Disorder")
+
+
+@pytest.mark.parametrize(
+    "answer, score",
+    [
+        ("1", 0),
+        ("4", 3),
+        ("3번", 2),
+        ("2번이요.", 1),
+        ("지난 2주 동안 거의 매일 그랬어요", 3),
+        ("3일 정도", 1),
+        ("이틀 정도요", 1),
+        ("10일 넘게요", 2),
+        ("일주일 넘게 그랬어요", 2),
+        ("2주 내내 매일이요", 3),
+        ("전혀 없었어요", 0),
+    ],
+)
+def test_phq9_parse(phq9, answer, score):
+    assert phq9.parse(answer) == score
+
+
+@pytest.mark.parametrize("answer", ["잘 모르겠어요", "", "5", "2주 동안요"])
+def test_phq9_parse_unclear(phq9, answer):
+    assert phq9.parse(answer) is None
+
+
+def test_yes_no_scale_ignores_stray_digits():
+    scale = load_scale("Bipolar I Disorder")
+    assert scale.parse("2") == scale.options[1].score
+    assert scale.parse("2년 전에 그런 적 있어요") == scale.options[1].score
+    assert scale.parse("그런 적 없어요") == scale.options[0].score
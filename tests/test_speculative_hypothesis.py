@@ -0,0 +1,38 @@
+# 점진 검색 후보와 최종 후보의 일치율은 세션당 한 번만 기록
+
+from langchain_core.documents import Document
+
+import graph.nodes.hypothesis as hypothesis
+import graph.prefetch as prefetch
+from api.metrics import SPECULATIVE_HYPOTHESIS, SPECULATIVE_OVERLAP
+
+FINAL = ["Major Depressive Disorder", "Persistent Depressive Disorder", "Insomnia Disorder"]
+
+
+def _compared():
+    return sum(SPECULATIVE_HYPOTHESIS.get(result=r) for r in ("exact", "partial", "miss"))
+
+
+def test_overlap_is_recorded_once_and_candidates_cleared(monkeypatch):
+    monkeypatch.setattr(hypothesis, "GRAPH_SPECULATIVE_HYPOTHESIS", True)
+    monkeypatch.setattr(prefetch, "GRAPH_PREFETCH", False)
+    hits = [Document(page_content="criteria", metadata={"disorder": d}) for d in FINAL]
+    monkeypatch.setattr(prefetch, "vote_candidates", lambda text, top_k, diag_top_n: (hits, list(FINAL)))
+    monkeypatch.setattr(prefetch, "lookup_criteria", lambda diagnosis: [{"text": f"{diagnosis} 기준"}])
+
+    state = {
+        "messages": [],
+        "intake_summary_report": "두 달째 우울감과 불면",
+        "speculative_candidates": {"Major Depressive Disorder": 0.6, "Generalized Anxiety Disorder": 0.3},
+    }
+    compared, overlap = _compared(), SPECULATIVE_OVERLAP.get()
+
+    result = hypothesis.hypothesis_node(state)
+    assert result["hypothesis_candidates"] == FINAL
+    assert result["speculative_candidates"] is None
+    assert _compared() == compared + 1
+    assert SPECULATIVE_OVERLAP.get() == overlap + 1 / 3
+
+    # Re-Intake 등으로 다시 실행돼도 이미 비교한 후보는 다시 기록하지 않음
+    hypothesis.hypothesis_node({**state, **result})
+    assert _compared() == compared + 1
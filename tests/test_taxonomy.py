@@ -0,0 +1,46 @@
+# 치료 카테고리는 질환별 목록 / 이름 규칙으로만 정해지고, 같은 챕터라는 이유로 넓어지지 않아야 함
+
+import pytest
+
+from rag.disorder_classifier import classify_disorder
+from rag.taxonomy import ADDICTION, ANXIETY, DEPRESSIVE, OCD, PERSONALITY, PTSD, severity_context_file
+
+
+@pytest.mark.parametrize(
+    "name, category",
+    [
+        ("Major Depressive Disorder", DEPRESSIVE),
+        ("F32.1 Major Depressive Disorder", DEPRESSIVE),
+        ("Panic Disorder", ANXIETY),
+        ("Posttraumatic Stress Disorder", PTSD),
+        ("Trichotillomania", OCD),
+        ("Borderline Personality Disorder", PERSONALITY),
+        ("Alcohol Use Disorder", ADDICTION),
+        ("Caffeine Withdrawal", ADDICTION),
+        ("Gambling Disorder", ADDICTION),
+    ],
+)
+def test_listed_disorders_map_to_their_category(name, category):
+    assert classify_disorder(name) == category
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "Prolonged Grief Disorder",
+        "Reactive Attachment Disorder",
+        "Unspecified Mood Disorder",
+        "Schizotypal (Personality) Disorder",
+        "Unspecified Depressive Disorder",
+        "Illness Anxiety Disorder",
+        "Depression",
+        "ADHD",
+    ],
+)
+def test_chapter_membership_does_not_assign_a_category(name):
+    assert classify_disorder(name) is None
+
+
+def test_severity_scale_still_follows_the_chapter():
+    assert severity_context_file("Unspecified Depressive Disorder") == "depression.json"
+    assert severity_context_file("ADHD") == "adhd.json"
@@ -0,0 +1,67 @@
+# 질문 은행: 검토 전 항목 제외, 5점 척도 응답 파싱 (부정 / 긍정 표현, 빈도 표현, 문항 속 숫자)
+
+import pytest
+
+import graph.validation_bank as validation_bank
+from graph.validation_bank import bank_entry, parse_answer
+
+
+class Registry:
+    def __init__(self, data):
+        self.data = data
+
+    def context_json(self, filename):
+        return self.data
+
+
+def _bank(reviewed):
+    question = {"id": "mdd-a1", "criterion": "A1", "text": "최근 2주 동안 기분이 가라앉았나요?"}
+    return {"disorders": {"Major Depressive Disorder": {"aliases": [], "reviewed": reviewed, "questions": [question]}}}
+
+
+@pytest.mark.parametrize("reviewed, unreviewed_allowed, expected", [(True, False, True), (False, False, False), (False, True, True)])
+def test_unreviewed_entries_are_gated(monkeypatch, reviewed, unreviewed_allowed, expected):
+    monkeypatch.setattr(validation_bank, "get_prompt_registry", lambda: Registry(_bank(reviewed)))
+    monkeypatch.setattr(validation_bank, "VALIDATION_BANK_UNREVIEWED", unreviewed_allowed)
+    assert (bank_entry("Major Depressive Disorder") is not None) is expected
+
+
+@pytest.mark.parametrize(
+    "answer, score",
+    [
+        ("4", 4),
+        ("2번이요", 2),
+        ("매우 자주 그래요", 5),
+        ("자주 그래요", 4),
+        ("가끔요", 3),
+        ("거의 그렇지 않다", 2),
+        ("전혀 그렇지 않다", 1),
+        ("자주 그렇지 않다", 2),
+        ("항상은 아니에요", 2),
+        ("자주는 아니고 가끔 그래요", 3),
+        ("그런 적 없어요", 1),
+        ("지난 2주 동안 자주 그랬어요", 4),
+        ("네 그래요", 4),
+        ("네", 4),
+        ("맞아요.", 4),
+        ("그런 편이에요", 4),
+        ("많이 그래요", 4),
+        ("자꾸 그래요", 4),
+        ("거의 매일이요", 5),
+        ("매일 그래요", 5),
+        ("요즘 계속 그래요", 5),
+        ("종종 그래요", 3),
+        ("조금 그래요", 3),
+        ("그럴 때도 있어요", 3),
+        ("별로 안 그래요", 2),
+        ("매일은 아니에요", 2),
+        ("많이 그렇지는 않아요", 2),
+        ("조금도 그렇지 않아요", 1),
+        ("아니요", 1),
+        ("네, 그런 적 없어요", 1),
+        ("잘 모르겠어요", None),
+        ("2주 정도요", None),
+    ],
+)
+def test_parse_answer(answer, score):
+    assert parse_answer(answer) == score
@@ -0,0 +1,141 @@
+# 질문 은행 경로 Validation -> Severity -> Solution을 컴파일된 그래프로 여러 턴 진행
+# (LLM은 StubBackend, RAG 검색은 고정 결과로 대체)
+
+import json
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.messages import HumanMessage
+
+import frontend.gemini_api as gemini_api
+import graph.nodes.hypothesis as hypothesis
+import graph.nodes.intake as intake
+import graph.nodes.solution as solution
+import graph.prefetch as prefetch
+import graph.validation_bank as validation_bank
+from frontend.llm_gateway import StubBackend, configure_gateway
+from graph.graph_builder import build_graph
+from graph.severity_scale import load_scale
+from rag.taxonomy import normalize_name
+
+SUMMARY = "주호소: 두 달째 우울감, 흥미 저하, 불면"
+CANDIDATES = ["Major Depressive Disorder", "Generalized Anxiety Disorder"]
+QUESTIONS_PER_DISORDER = 3
+RE_INTAKE_QUESTION = "조금 더 여쭤볼게요. 요즘 하루를 어떻게 보내고 계신가요?"
+
+
+def _bank():
+    index = {}
+    for disorder in CANDIDATES:
+        entry = {
+            "questions": [
+                {"id": f"{disorder[:3]}-{i}", "criterion": f"A{i}", "text": f"{disorder} 질문 {i}", "weight": 1.0}
+                for i in range(1, QUESTIONS_PER_DISORDER + 1)
+            ],
+        }
+        index[normalize_name(disorder)] = entry
+    return index
+
+
+def _responder(prompt, generation_config=None):
+    if "## Previous Summary" in prompt:
+        return "- 요약"
+    if "## 이번에 전달할 질문" in prompt:
+        question = prompt.split("## 이번에 전달할 질문", 1)[1].split("\n## ", 1)[0]
+        return f"다음 질문입니다.{question}"
+    if '"domain_detected"' in prompt:
+        data = {"domain_detected": None, "domain_completed": False, "summary_string": SUMMARY}
+        reply = RE_INTAKE_QUESTION if "Re-Intake 모드**: 예" in prompt else "정리해 볼게요."
+        return f"{reply}\n---INTERNAL_DATA---\n{json.dumps(data, ensure_ascii=False)}"
+    return "솔루션 안내"
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    monkeypatch.setattr(gemini_api, "get_response_cache", lambda: None)
+    monkeypatch.setattr(intake, "INTAKE_DOMAIN_DETECTOR", False)
+    monkeypatch.setattr(prefetch, "GRAPH_PREFETCH", False)
+    monkeypatch.setattr(validation_bank, "VALIDATION_BANK", True)
+    monkeypatch.setattr(validation_bank, "_bank_index", _bank)
+    monkeypatch.setattr(
+        hypothesis,
+        "retrieve_candidates",
+        lambda symptom_text, top_k, diag_top_n: {
+            "diagnosis_candidates": list(CANDIDATES),
+            "by_diagnosis": {d: [{"text": f"{d} 기준"}] for d in CANDIDATES},
+        },
+    )
+    monkeypatch.setattr(solution, "take_solution", lambda state: None)
+    monkeypatch.setattr(solution, "retrieve_solution", lambda diagnosis, symptom_text: {"solutions": []})
+    backend = StubBackend(responder=_responder)
+    configure_gateway(backend, rpm=1e6, tpm=1e9)
+    return build_graph(checkpointer=MemorySaver())
+
+
+def _turn(graph, text, config):
+    return graph.invoke({"messages": [HumanMessage(content=text)]}, config=config)
+
+
+def test_bank_plan_runs_to_solution(graph):
+    config = {"configurable": {"thread_id": "bank-flow"}}
+
+    state = _turn(graph, "요즘 계속 우울하고 잠을 못 자요.", config)
+    plan = state["validation_plan"]
+    assert len(plan) == QUESTIONS_PER_DISORDER * len(CANDIDATES)
+    assert state["validation_answers"] == {}
+    assert "(1/6)" in state["messages"][-1].content
+
+    # 우울 문항은 "자주", 불안 문항은 "전혀"
+    for number, item in enumerate(plan, 1):
+        answer = "4" if item["disorder"] == CANDIDATES[0] else "1"
+        state = _turn(graph, answer, config)
+        assert state["validation_plan"] == plan
+        if number < len(plan):
+            assert len(state["validation_answers"]) == number
+            assert f"({number + 1}/6)" in state["messages"][-1].content
+
+    assert state["validation_probabilities"][CANDIDATES[0]] > 0.5
+    assert state["severity_diagnosis"] == CANDIDATES[0]
+    assert not state.get("is_re_intake")
+    assert state["severity_answers"] == []
+
+    scale = load_scale(CANDIDATES[0])
+    for number in range(1, len(scale.questions) + 1):
+        state = _turn(graph, "2", config)
+        if number < len(scale.questions):
+            assert len(state["severity_answers"]) == number
+            # 이미 끝난 Validation은 다시 채점하지 않음
+            assert state["severity_diagnosis"] == CANDIDATES[0]
+
+    assert state["severity_assessment"]["score"] == len(scale.questions)
+    assert state["severity_result_string"]
+    assert state["solution_content"]
+
+
+def test_low_scores_ask_a_re_intake_question_before_validating_again(graph):
+    config = {"configurable": {"thread_id": "bank-re-intake"}}
+
+    state = _turn(graph, "요즘 계속 우울하고 잠을 못 자요.", config)
+    total = len(state["validation_plan"])
+    for _ in range(total):
+        state = _turn(graph, "1", config)
+
+    # Validation -> Re-Intake: 같은 턴에 Hypothesis / Validation으로 돌아가지 않고 추가 질문 후 사용자 입력을 기다림
+    # (stub은 요약도 함께 내보내지만, 사용자가 답하기 전에는 받지 않음)
+    assert max(state["validation_probabilities"].values()) <= 0.5
+    assert not state.get("severity_diagnosis")
+    assert state["is_re_intake"]
+    assert state["intake_summary_report"] is None
+    assert state["validation_plan"] is None
+    assert RE_INTAKE_QUESTION in state["messages"][-1].content
+
+    # 새 정보를 받으면 요약 -> Hypothesis -> 처음부터 다시 검증
+    state = _turn(graph, "사실 요즘 일이 너무 많아서 계속 긴장돼요.", config)
+    assert not state["is_re_intake"]
+    assert state["intake_summary_report"] == SUMMARY
+    assert state["validation_answers"] == {}
+    assert "(1/6)" in state["messages"][-1].content
+
+    state = _turn(graph, "3", config)
+    assert len(state["validation_answers"]) == 1
+    assert "(2/6)" in state["messages"][-1].content